@@ -20,6 +20,11 @@ class Settings(BaseSettings):
     supabase_url: Optional[str] = None
     supabase_key: Optional[str] = None
 
+    # Blob store for venue files: "supabase" (default) or "local" (offline runs)
+    blob_store: Optional[str] = None
+    blob_dir: str = "/tmp/venue_blobs"
+    blob_public_url: str = "http://localhost:8000/images/blobs"
+
     # Temporal
     temporal_address: Optional[str] = None
     temporal_namespace: Optional[str] = None
@@ -1,7 +1,8 @@
-from .client import get_supabase_client
+from .client import get_blob_store, get_supabase_client
 from .venues import VenuesDB
 from .images import ImagesDB
 from .storage import StorageDB
+from .seat_views import SeatViewsDB
 from .helpers import get_supabase, resolve_venue_id
 
-__all__ = ['get_supabase_client', 'VenuesDB', 'ImagesDB', 'StorageDB', 'get_supabase', 'resolve_venue_id']
+__all__ = ['get_supabase_client', 'get_blob_store', 'VenuesDB', 'ImagesDB', 'StorageDB', 'SeatViewsDB', 'get_supabase', 'resolve_venue_id']
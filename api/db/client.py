@@ -1,11 +1,12 @@
 """
-Supabase client configuration.
+Supabase client and blob store configuration.
 """
 
 from functools import lru_cache
 from supabase import create_client, Client
 
 from api.config import settings
+from blobs.store import BUCKET, BlobStore, LocalBlobStore, SupabaseBlobStore
 
 
 @lru_cache()
@@ -16,3 +17,18 @@ def get_supabase_client() -> Client:
             "SUPABASE_URL and SUPABASE_KEY environment variables must be set"
         )
     return create_client(settings.supabase_url, settings.supabase_key)
+
+
+@lru_cache()
+def get_blob_store() -> BlobStore:
+    """
+    Get cached blob store for venue files.
+
+    Supabase's IMAGES bucket, or a local store under BLOB_DIR only when
+    BLOB_STORE=local (offline runs).
+    """
+    if settings.blob_store == "local":
+        return LocalBlobStore(settings.blob_dir, settings.blob_public_url)
+    if settings.blob_store not in (None, "supabase"):
+        raise ValueError(f"Unknown BLOB_STORE {settings.blob_store!r} (expected 'supabase' or 'local')")
+    return SupabaseBlobStore(get_supabase_client().storage.from_(BUCKET))
@@ -1,5 +1,27 @@
 from typing import Optional
 from .client import get_supabase_client
+from blobs.variants import srcsets
+
+# Rows per request when listing (PostgREST caps responses at 1000 by default)
+LIST_PAGE_SIZE = 1000
+
+
+def _image_from_row(row: dict) -> dict:
+    variants = row.get("variants") or []
+    # Smallest WebP (else any format) for thumbnails
+    smallest = sorted(variants, key=lambda v: (v["format"] != "webp", v["width"]))
+    return {
+        "seat_id": row["seat_id"],
+        "section": row["section"],
+        "row": row["row"],
+        "seat": row["seat"],
+        "tier": row["tier"],
+        "depth_map_url": row.get("depth_map_url"),
+        "final_image_url": row.get("final_image_url"),
+        "thumbnail_url": smallest[0]["url"] if smallest else None,
+        "variants": variants,
+        "srcset": srcsets(variants),
+    }
 
 
 class ImagesDB:
@@ -7,29 +29,24 @@ class ImagesDB:
 
     @staticmethod
     def list(venue_id: str, tier: Optional[str] = None, section: Optional[str] = None):
-        """List all images for a venue with optional filters."""
+        """List all images for a venue with optional filters (paged, so large venues come back whole)."""
         client = get_supabase_client()
 
-        query = client.table("images").select("*").eq("venue_id", venue_id)
-
-        if tier:
-            query = query.eq("tier", tier)
-        if section:
-            query = query.eq("section", section)
+        images = []
+        offset = 0
+        while True:
+            query = client.table("images").select("*").eq("venue_id", venue_id)
 
-        response = query.execute()
+            if tier:
+                query = query.eq("tier", tier)
+            if section:
+                query = query.eq("section", section)
 
-        images = []
-        for row in response.data:
-            images.append({
-                "seat_id": row["seat_id"],
-                "section": row["section"],
-                "row": row["row"],
-                "seat": row["seat"],
-                "tier": row["tier"],
-                "depth_map_url": row.get("depth_map_url"),
-                "final_image_url": row.get("final_image_url"),
-            })
+            response = query.order("seat_id").range(offset, offset + LIST_PAGE_SIZE - 1).execute()
+            images.extend(_image_from_row(row) for row in response.data)
+            offset += len(response.data)
+            if len(response.data) < LIST_PAGE_SIZE:
+                break
 
         return {
             "venue_id": venue_id,
@@ -49,16 +66,7 @@ class ImagesDB:
         if not response.data:
             return None
 
-        row = response.data
-        return {
-            "seat_id": row["seat_id"],
-            "section": row["section"],
-            "row": row["row"],
-            "seat": row["seat"],
-            "tier": row["tier"],
-            "depth_map_url": row.get("depth_map_url"),
-            "final_image_url": row.get("final_image_url"),
-        }
+        return _image_from_row(response.data)
 
     @staticmethod
     def create(
@@ -0,0 +1,128 @@
+"""
+Nearest rendered view lookup for arbitrary seats.
+
+Builds a per-venue KD-tree from the seat manifest and the rendered rows of
+the images table (or, for venues saved before that table was written, the
+final images in storage), and caches it in-process for a short time so
+lookups are a single tree query.
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .client import get_blob_store
+from .images import ImagesDB
+from .storage import StorageDB
+
+# Rebuild the index at most this often so newly generated images show up
+INDEX_TTL_SECONDS = 60.0
+
+VENUES_DIR = Path(__file__).parent.parent.parent / "venues"
+
+_index_cache: Dict[str, Tuple[float, object]] = {}
+
+
+class SeatViewsDB:
+    """Nearest rendered view queries backed by a cached spatial index."""
+
+    @staticmethod
+    def _load_manifest(venue_id: str):
+        from geometry import MANIFEST_FILENAME, read_seat_manifest, seat_arrays_from_manifest
+
+        data = StorageDB.download_seat_manifest(venue_id)
+        if data:
+            return seat_arrays_from_manifest(read_seat_manifest(data))
+
+        # Fallback to local file
+        local_path = VENUES_DIR / venue_id / MANIFEST_FILENAME
+        if local_path.exists():
+            return seat_arrays_from_manifest(read_seat_manifest(local_path))
+
+        return None
+
+    @staticmethod
+    def _rendered_from_storage(venue_id: str, seats) -> list:
+        """Image payloads for the venue's final images in storage (no images rows needed)."""
+        from blobs.manifest import DEPTH_MAP, FINAL_IMAGE
+
+        manifest = StorageDB.get_asset_manifest(venue_id)
+        depth_maps = manifest.of_kind(DEPTH_MAP)
+        store = get_blob_store()
+
+        rendered = []
+        for path in sorted(manifest.of_kind(FINAL_IMAGE)):
+            seat_id = path.rsplit("/", 1)[-1].rsplit("_final.", 1)[0]
+            i = seats.locate(seat_id)
+            if i is None:
+                continue
+            seat = seats.to_dicts([i])[0]
+            depth_path = f"{venue_id}/depth_maps/{seat_id}_depth.png"
+            rendered.append({
+                "seat_id": seat_id,
+                "section": seat["section"],
+                "row": seat["row"],
+                "seat": seat["seat"],
+                "tier": seat["tier"],
+                "depth_map_url": store.get_public_url(depth_path) if depth_path in depth_maps else None,
+                "final_image_url": store.get_public_url(path),
+                "thumbnail_url": None,
+                "variants": [],
+                "srcset": {},
+            })
+        return rendered
+
+    @staticmethod
+    def get_index(venue_id: str, refresh: bool = False):
+        """Get (building if needed) the rendered view index for a venue."""
+        from geometry.spatial import RenderedViewIndex
+
+        cached = _index_cache.get(venue_id)
+        if cached and not refresh and time.monotonic() - cached[0] < INDEX_TTL_SECONDS:
+            return cached[1]
+
+        seats = SeatViewsDB._load_manifest(venue_id)
+        if seats is None:
+            return None
+
+        rendered = [
+            img for img in ImagesDB.list(venue_id)["images"]
+            if img.get("final_image_url")
+        ]
+        if not rendered:
+            rendered = SeatViewsDB._rendered_from_storage(venue_id, seats)
+        index = RenderedViewIndex(
+            seats,
+            rendered_ids=[img["seat_id"] for img in rendered],
+            payloads=rendered,
+        )
+        _index_cache[venue_id] = (time.monotonic(), index)
+        return index
+
+    @staticmethod
+    def nearest(venue_id: str, seat_id: str) -> Optional[dict]:
+        """
+        Find the closest rendered view to a seat.
+
+        Returns None if the venue has no manifest, the seat doesn't exist,
+        or nothing has been rendered yet.
+        """
+        index = SeatViewsDB.get_index(venue_id)
+        if index is None:
+            return None
+
+        match = index.nearest(seat_id)
+        if match is None:
+            return None
+
+        return {
+            "requested_seat_id": seat_id,
+            "exact": match.seat_id == seat_id,
+            "distance": round(match.distance, 3),
+            **match.payload,
+        }
+
+    @staticmethod
+    def invalidate(venue_id: str) -> None:
+        """Drop a venue's cached index (e.g. after images change)."""
+        _index_cache.pop(venue_id, None)
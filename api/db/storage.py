@@ -1,13 +1,24 @@
 """
-Supabase Storage operations for images.
+Blob storage operations for images (Supabase Storage or the local store, see get_blob_store).
+
+Files are recorded in the venue's asset manifest (blobs/manifest.py)
+as they're uploaded or deleted, so lookups read the manifest instead of listing folders.
 """
 
-import os
 from typing import Optional
-from pathlib import Path
-from .client import get_supabase_client
+from .client import get_blob_store
+from blobs.manifest import (
+    DEPTH_MAP,
+    FINAL_IMAGE,
+    SEATMAP,
+    AssetManifest,
+    asset_entry,
+    load_asset_manifest,
+    update_asset_manifest,
+)
 
-BUCKET_NAME = "IMAGES"
+# Paths per remove() call when deleting many files
+REMOVE_BATCH_SIZE = 500
 
 
 class StorageDB:
@@ -21,10 +32,10 @@ class StorageDB:
         image_type: str = "final",  # "final" or "depth"
     ) -> str:
         """
-        Upload an image to Supabase Storage.
+        Upload an image to the blob store.
         Returns the public URL.
         """
-        client = get_supabase_client()
+        store = get_blob_store()
 
         # Determine file extension and content type
         if image_type == "depth":
@@ -37,32 +48,33 @@ class StorageDB:
             file_path = f"{venue_id}/final_images/{seat_id}_final.{file_ext}"
 
         # Upload to storage
-        response = client.storage.from_(BUCKET_NAME).upload(
+        store.upload(
             file_path,
             image_data,
             file_options={"content-type": content_type, "upsert": "true"}
         )
+        StorageDB.record_asset(venue_id, file_path, image_data, content_type)
 
         # Get public URL
-        public_url = client.storage.from_(BUCKET_NAME).get_public_url(file_path)
+        public_url = store.get_public_url(file_path)
         return public_url
 
     @staticmethod
     def get_image_url(venue_id: str, seat_id: str, image_type: str = "final") -> str:
         """Get the public URL for an image."""
-        client = get_supabase_client()
+        store = get_blob_store()
 
         if image_type == "depth":
             file_path = f"{venue_id}/depth_maps/{seat_id}_depth.png"
         else:
             file_path = f"{venue_id}/final_images/{seat_id}_final.jpg"
 
-        return client.storage.from_(BUCKET_NAME).get_public_url(file_path)
+        return store.get_public_url(file_path)
 
     @staticmethod
     def download_image(venue_id: str, seat_id: str, image_type: str = "final") -> Optional[bytes]:
-        """Download an image from Supabase Storage."""
-        client = get_supabase_client()
+        """Download an image from the blob store."""
+        store = get_blob_store()
 
         if image_type == "depth":
             file_path = f"{venue_id}/depth_maps/{seat_id}_depth.png"
@@ -70,15 +82,14 @@ class StorageDB:
             file_path = f"{venue_id}/final_images/{seat_id}_final.jpg"
 
         try:
-            response = client.storage.from_(BUCKET_NAME).download(file_path)
-            return response
-        except Exception:
+            return store.download(file_path)
+        except KeyError:
             return None
 
     @staticmethod
     def delete_image(venue_id: str, seat_id: str, image_type: str = "final") -> bool:
-        """Delete an image from Supabase Storage."""
-        client = get_supabase_client()
+        """Delete an image from the blob store."""
+        store = get_blob_store()
 
         if image_type == "depth":
             file_path = f"{venue_id}/depth_maps/{seat_id}_depth.png"
@@ -86,7 +97,8 @@ class StorageDB:
             file_path = f"{venue_id}/final_images/{seat_id}_final.jpg"
 
         try:
-            client.storage.from_(BUCKET_NAME).remove([file_path])
+            store.remove([file_path])
+            update_asset_manifest(store, venue_id, remove=[file_path])
             return True
         except Exception:
             return False
@@ -94,21 +106,17 @@ class StorageDB:
     @staticmethod
     def delete_venue_images(venue_id: str) -> bool:
         """Delete all images for a venue."""
-        client = get_supabase_client()
+        store = get_blob_store()
 
         try:
-            # List and delete all files in the venue folder
-            depth_files = client.storage.from_(BUCKET_NAME).list(f"{venue_id}/depth_maps")
-            final_files = client.storage.from_(BUCKET_NAME).list(f"{venue_id}/final_images")
-
-            files_to_delete = []
-            for f in depth_files:
-                files_to_delete.append(f"{venue_id}/depth_maps/{f['name']}")
-            for f in final_files:
-                files_to_delete.append(f"{venue_id}/final_images/{f['name']}")
+            # Every depth map and final image, from the asset manifest
+            manifest = load_asset_manifest(store, venue_id)
+            files_to_delete = list(manifest.of_kind(DEPTH_MAP)) + list(manifest.of_kind(FINAL_IMAGE))
 
+            for start in range(0, len(files_to_delete), REMOVE_BATCH_SIZE):
+                store.remove(files_to_delete[start:start + REMOVE_BATCH_SIZE])
             if files_to_delete:
-                client.storage.from_(BUCKET_NAME).remove(files_to_delete)
+                update_asset_manifest(store, venue_id, remove=files_to_delete)
 
             return True
         except Exception:
@@ -117,50 +125,100 @@ class StorageDB:
     @staticmethod
     def upload_preview(venue_id: str, image_data: bytes) -> str:
         """Upload a 3D model preview image."""
-        client = get_supabase_client()
+        store = get_blob_store()
 
         file_path = f"{venue_id}/preview.png"
 
-        client.storage.from_(BUCKET_NAME).upload(
+        store.upload(
             file_path,
             image_data,
             file_options={"content-type": "image/png", "upsert": "true"}
         )
+        StorageDB.record_asset(venue_id, file_path, image_data, "image/png")
 
-        return client.storage.from_(BUCKET_NAME).get_public_url(file_path)
+        return store.get_public_url(file_path)
 
     @staticmethod
     def get_preview_url(venue_id: str) -> Optional[str]:
         """Get the public URL for a venue's 3D model preview."""
-        client = get_supabase_client()
+        store = get_blob_store()
         file_path = f"{venue_id}/preview.png"
-        return client.storage.from_(BUCKET_NAME).get_public_url(file_path)
+        return store.get_public_url(file_path)
 
     @staticmethod
     def get_blend_url(venue_id: str) -> Optional[str]:
         """Get the public URL for a venue's Blender model file."""
-        client = get_supabase_client()
+        store = get_blob_store()
         file_path = f"{venue_id}/venue_model.blend"
-        return client.storage.from_(BUCKET_NAME).get_public_url(file_path)
+        return store.get_public_url(file_path)
+
+    @staticmethod
+    def download_seat_manifest(venue_id: str) -> Optional[bytes]:
+        """Download a venue's columnar seat manifest (seats.arrow)."""
+        store = get_blob_store()
+        file_path = f"{venue_id}/seats.arrow"
+
+        try:
+            return store.download(file_path)
+        except KeyError:
+            return None
 
     @staticmethod
     def upload_seatmap(venue_id: str, event_type: str, image_data: bytes) -> str:
         """Upload a seatmap image."""
-        client = get_supabase_client()
+        store = get_blob_store()
 
         file_path = f"{venue_id}/seatmaps/{event_type}.png"
 
-        client.storage.from_(BUCKET_NAME).upload(
+        store.upload(
             file_path,
             image_data,
             file_options={"content-type": "image/png", "upsert": "true"}
         )
+        StorageDB.record_asset(venue_id, file_path, image_data, "image/png")
 
-        return client.storage.from_(BUCKET_NAME).get_public_url(file_path)
+        return store.get_public_url(file_path)
 
     @staticmethod
     def get_seatmap_url(venue_id: str, event_type: str = "default") -> Optional[str]:
         """Get the public URL for a seatmap."""
-        client = get_supabase_client()
+        store = get_blob_store()
         file_path = f"{venue_id}/seatmaps/{event_type}.png"
-        return client.storage.from_(BUCKET_NAME).get_public_url(file_path)
+        return store.get_public_url(file_path)
+
+    @staticmethod
+    def get_seatmap_path(venue_id: str, event_type: Optional[str] = None) -> Optional[str]:
+        """
+        Path of a venue's seatmap: the event type's (saved by upload_seatmap) if
+        there is one, else the latest upload from the seatmaps route.
+        """
+        seatmaps = StorageDB.get_asset_manifest(venue_id).of_kind(SEATMAP)
+        if event_type and f"{venue_id}/seatmaps/{event_type}.png" in seatmaps:
+            return f"{venue_id}/seatmaps/{event_type}.png"
+
+        uploads = {
+            path: entry for path, entry in seatmaps.items()
+            if path.startswith(f"venues/{venue_id}/seatmaps/seatmap_")
+        }
+        if not uploads:
+            return None
+        return max(uploads, key=lambda path: uploads[path].get("updated_at") or "")
+
+    @staticmethod
+    def get_asset_manifest(venue_id: str) -> AssetManifest:
+        """A venue's asset manifest (one read; built from listings the first time)."""
+        store = get_blob_store()
+        return load_asset_manifest(store, venue_id)
+
+    @staticmethod
+    def record_asset(venue_id: str, file_path: str, data: bytes, content_type: str) -> None:
+        """Record an uploaded file in the venue's asset manifest (best effort)."""
+        store = get_blob_store()
+        try:
+            update_asset_manifest(
+                store,
+                venue_id,
+                put={file_path: asset_entry(file_path, data, content_type)},
+            )
+        except Exception:
+            pass
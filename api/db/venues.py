@@ -198,15 +198,20 @@ class VenuesDB:
 
     @staticmethod
     def update_sections(venue_id: str, sections: dict):
-        """Update sections for a venue (replaces all)."""
-        client = get_supabase_client()
+        """
+        Update sections for a venue (the given sections become the full set).
 
-        # Delete existing sections
-        client.table("sections").delete().eq("venue_id", venue_id).execute()
+        Sections are diffed by content hash: only new or changed sections are
+        written and sections no longer present are deleted, so unchanged
+        sections (and their renders) are left alone.
+        """
+        from geometry import diff_sections, section_hash
+
+        client = get_supabase_client()
 
-        # Insert new sections
+        rows = {}
         for section_id, section_data in sections.items():
-            data = {
+            row = {
                 "venue_id": venue_id,
                 "section_id": section_id,
                 "tier": section_data.get("tier", "Standard"),
@@ -217,6 +222,28 @@ class VenuesDB:
                 "row_rise": section_data.get("row_rise", 0.3),
                 "base_height": section_data.get("base_height", 0),
             }
-            client.table("sections").insert(data).execute()
-
-        return {"sections": sections}
+            row["content_hash"] = section_hash({**section_data, **row})
+            rows[section_id] = row
+
+        existing = client.table("sections").select("section_id, content_hash").eq(
+            "venue_id", venue_id
+        ).execute()
+        # Rows written before content hashes existed count as changed
+        old_hashes = {row["section_id"]: row.get("content_hash") or "" for row in existing.data}
+
+        diff = diff_sections(
+            old_hashes, {section_id: row["content_hash"] for section_id, row in rows.items()}
+        )
+
+        if diff.dirty:
+            client.table("sections").upsert(
+                [rows[section_id] for section_id in diff.dirty],
+                on_conflict="venue_id,section_id",
+            ).execute()
+
+        if diff.removed:
+            client.table("sections").delete().eq("venue_id", venue_id).in_(
+                "section_id", diff.removed
+            ).execute()
+
+        return {"sections": sections, "section_diff": diff.to_dict()}
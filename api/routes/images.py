@@ -1,20 +1,23 @@
 """
 Image serving endpoints.
-Uses Supabase for metadata, filesystem for image files.
+Uses Supabase for metadata, the blob store (see api.db.get_blob_store) for image files.
 """
 
-from pathlib import Path
 from typing import Optional
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, RedirectResponse
 
-from api.db import ImagesDB, VenuesDB
-from api.schemas import SeatImage, ImageGalleryResponse
+from api.db import ImagesDB, SeatViewsDB, StorageDB, VenuesDB, get_blob_store
+from api.schemas import SeatImage, ImageGalleryResponse, NearestViewResponse
 
 router = APIRouter()
 
-# Base path for venues (needed for serving files)
-VENUES_DIR = Path(__file__).parent.parent.parent / "venues"
+
+def _redirect_to_asset(venue_id: str, path: str, not_found: str) -> RedirectResponse:
+    """Redirect to a venue file's public URL, 404 if the asset manifest doesn't have it."""
+    if path not in StorageDB.get_asset_manifest(venue_id).assets:
+        raise HTTPException(status_code=404, detail=not_found)
+    return RedirectResponse(url=get_blob_store().get_public_url(path))
 
 
 @router.get("/{venue_id}")
@@ -38,60 +41,42 @@ async def list_images(venue_id: str, tier: Optional[str] = None, section: Option
 # IMPORTANT: Specific routes must come BEFORE generic /{venue_id}/{seat_id}
 # Otherwise FastAPI will match "preview" as a seat_id
 
-@router.get("/{venue_id}/preview")
-async def get_model_preview(venue_id: str):
-    """Get the 3D model preview URL for a venue (from Supabase Storage)."""
-    from api.db import StorageDB
+@router.get("/blobs/{path:path}")
+async def get_blob(path: str):
+    """Serve a file from the local blob store (its public URLs point here)."""
+    from blobs.store import LocalBlobStore
 
-    # Get the Supabase URL for the preview
-    preview_url = StorageDB.get_preview_url(venue_id)
+    store = get_blob_store()
+    if not isinstance(store, LocalBlobStore):
+        raise HTTPException(status_code=404, detail="Blobs are served by the storage provider")
 
-    if preview_url:
-        # Redirect to Supabase Storage URL
-        from fastapi.responses import RedirectResponse
-        return RedirectResponse(url=preview_url)
+    try:
+        file_path = store.object_file(path)
+        content_type = store.content_type(path)
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=404, detail="Blob not found")
+    if not file_path.exists():
+        raise HTTPException(status_code=404, detail="Blob not found")
 
-    # Fallback to local file
-    venue_dir = VENUES_DIR / venue_id
-    preview_path = venue_dir / "outputs" / "model_preview.png"
-    if preview_path.exists():
-        return FileResponse(
-            preview_path,
-            media_type="image/png",
-            filename=f"{venue_id}_preview.png",
-        )
+    return FileResponse(file_path, media_type=content_type, headers={"ETag": f'"{file_path.name}"'})
 
-    raise HTTPException(status_code=404, detail="Preview not found")
+
+@router.get("/{venue_id}/preview")
+async def get_model_preview(venue_id: str):
+    """Get the 3D model preview for a venue (redirects to the blob store)."""
+    return RedirectResponse(url=StorageDB.get_preview_url(venue_id))
 
 
 @router.get("/{venue_id}/model")
 async def get_venue_model(venue_id: str):
-    """Get the 3D model (.blend file) for a venue from Supabase Storage."""
-    from api.db import StorageDB
-
-    # Try Supabase first
-    blend_url = StorageDB.get_blend_url(venue_id)
-    if blend_url:
-        from fastapi.responses import RedirectResponse
-        return RedirectResponse(url=blend_url)
-
-    # Fallback to local file
-    venue_dir = VENUES_DIR / venue_id
-    blend_path = venue_dir / "venue_model.blend"
-    if blend_path.exists():
-        return FileResponse(
-            blend_path,
-            media_type="application/octet-stream",
-            filename=f"{venue_id}_model.blend",
-        )
-
-    raise HTTPException(status_code=404, detail="Model not found")
+    """Get the 3D model (.blend file) for a venue (redirects to the blob store)."""
+    return RedirectResponse(url=StorageDB.get_blend_url(venue_id))
 
 
 @router.get("/{venue_id}/assets")
 async def get_venue_assets(venue_id: str):
     """Check what assets exist for a venue (for resume capability)."""
-    from api.db.client import get_supabase_client
+    from blobs.manifest import DEPTH_MAP, FINAL_IMAGE, MODEL, PREVIEW
 
     result = {
         "venue_id": venue_id,
@@ -106,39 +91,22 @@ async def get_venue_assets(venue_id: str):
     }
 
     try:
-        client = get_supabase_client()
-        bucket = client.storage.from_("IMAGES")
-
-        # Check root folder for model and preview
-        try:
-            root_files = bucket.list(venue_id)
-            for f in root_files:
-                if f.get("name") == "venue_model.blend":
-                    result["has_model"] = True
-                    result["model_url"] = bucket.get_public_url(f"{venue_id}/venue_model.blend")
-                elif f.get("name") == "preview.png":
-                    result["has_preview"] = True
-                    result["preview_url"] = bucket.get_public_url(f"{venue_id}/preview.png")
-        except Exception:
-            pass
-
-        # Check depth_maps folder
-        try:
-            depth_files = bucket.list(f"{venue_id}/depth_maps")
-            depth_count = sum(1 for f in depth_files if f.get("id") and f.get("name", "").endswith(".png"))
-            result["depth_map_count"] = depth_count
-            result["has_depth_maps"] = depth_count > 0
-        except Exception:
-            pass
-
-        # Check final_images folder
-        try:
-            image_files = bucket.list(f"{venue_id}/final_images")
-            image_count = sum(1 for f in image_files if f.get("id") and f.get("name", "").endswith(".jpg"))
-            result["image_count"] = image_count
-            result["has_images"] = image_count > 0
-        except Exception:
-            pass
+        # One read of the asset manifest instead of a listing per folder
+        manifest = StorageDB.get_asset_manifest(venue_id)
+        store = get_blob_store()
+
+        for path in manifest.of_kind(MODEL):
+            result["has_model"] = True
+            result["model_url"] = store.get_public_url(path)
+        for path in manifest.of_kind(PREVIEW):
+            result["has_preview"] = True
+            result["preview_url"] = store.get_public_url(path)
+
+        result["depth_map_count"] = manifest.count(DEPTH_MAP)
+        result["has_depth_maps"] = result["depth_map_count"] > 0
+        result["image_count"] = manifest.count(FINAL_IMAGE)
+        result["has_images"] = result["image_count"] > 0
+        result["manifest_version"] = manifest.version
 
     except Exception as e:
         result["error"] = str(e)
@@ -148,29 +116,23 @@ async def get_venue_assets(venue_id: str):
 
 @router.get("/{venue_id}/depth-maps")
 async def list_depth_maps(venue_id: str):
-    """List all depth maps for a venue from Supabase Storage."""
-    from api.db.client import get_supabase_client
+    """List all depth maps for a venue from the blob store."""
+    from blobs.manifest import DEPTH_MAP
 
     try:
-        client = get_supabase_client()
-        bucket = client.storage.from_("IMAGES")
+        manifest = StorageDB.get_asset_manifest(venue_id)
+        store = get_blob_store()
 
         depth_maps = []
-        try:
-            depth_files = bucket.list(f"{venue_id}/depth_maps")
-            for f in depth_files:
-                if f.get("id") and f.get("name", "").endswith(".png"):
-                    # Extract seat_id from filename (e.g., "101_Front_1_depth.png" -> "101_Front_1")
-                    seat_id = f["name"].replace("_depth.png", "")
-                    url = bucket.get_public_url(f"{venue_id}/depth_maps/{f['name']}")
-                    depth_maps.append({
-                        "id": seat_id,
-                        "url": url,
-                        "name": f["name"],
-                    })
-        except Exception as e:
-            # Folder may not exist yet
-            pass
+        for path in sorted(manifest.of_kind(DEPTH_MAP)):
+            name = path.rsplit("/", 1)[-1]
+            # Extract seat_id from filename (e.g., "101_Front_1_depth.png" -> "101_Front_1")
+            seat_id = name.replace("_depth.png", "")
+            depth_maps.append({
+                "id": seat_id,
+                "url": store.get_public_url(path),
+                "name": name,
+            })
 
         return {
             "venue_id": venue_id,
@@ -183,56 +145,27 @@ async def list_depth_maps(venue_id: str):
 
 @router.get("/{venue_id}/files")
 async def list_venue_files(venue_id: str):
-    """Debug endpoint: List all files in Supabase Storage for a venue."""
-    from api.db.client import get_supabase_client
+    """Debug endpoint: List all files in the blob store for a venue (from its asset manifest)."""
 
     try:
-        client = get_supabase_client()
-        all_files = []
-
-        # List files in root venue folder
-        root_files = client.storage.from_("IMAGES").list(venue_id)
-        for f in root_files:
-            if f.get("id"):  # Skip folder entries (they have no id)
-                all_files.append({
-                    "path": f"{venue_id}/{f['name']}",
-                    "name": f["name"],
-                    "size": f.get("metadata", {}).get("size"),
-                    "updated_at": f.get("updated_at"),
-                })
-
-        # List files in depth_maps subfolder
-        try:
-            depth_files = client.storage.from_("IMAGES").list(f"{venue_id}/depth_maps")
-            for f in depth_files:
-                if f.get("id"):
-                    all_files.append({
-                        "path": f"{venue_id}/depth_maps/{f['name']}",
-                        "name": f["name"],
-                        "size": f.get("metadata", {}).get("size"),
-                        "updated_at": f.get("updated_at"),
-                    })
-        except Exception:
-            pass  # Folder may not exist
-
-        # List files in final_images subfolder
-        try:
-            image_files = client.storage.from_("IMAGES").list(f"{venue_id}/final_images")
-            for f in image_files:
-                if f.get("id"):
-                    all_files.append({
-                        "path": f"{venue_id}/final_images/{f['name']}",
-                        "name": f["name"],
-                        "size": f.get("metadata", {}).get("size"),
-                        "updated_at": f.get("updated_at"),
-                    })
-        except Exception:
-            pass  # Folder may not exist
+        manifest = StorageDB.get_asset_manifest(venue_id)
+        all_files = [
+            {
+                "path": path,
+                "name": path.rsplit("/", 1)[-1],
+                "kind": entry.get("kind"),
+                "size": entry.get("size"),
+                "sha256": entry.get("sha256"),
+                "updated_at": entry.get("updated_at"),
+            }
+            for path, entry in sorted(manifest.assets.items())
+        ]
 
         return {
             "venue_id": venue_id,
             "files": all_files,
             "count": len(all_files),
+            "manifest_version": manifest.version,
         }
     except Exception as e:
         return {"venue_id": venue_id, "error": str(e), "files": []}
@@ -240,67 +173,48 @@ async def list_venue_files(venue_id: str):
 
 @router.get("/{venue_id}/seatmap/{event_type}")
 async def get_seatmap(venue_id: str, event_type: str = "default"):
-    """Get the seatmap image for a venue."""
-    venue_dir = VENUES_DIR / venue_id
-    if not venue_dir.exists():
+    """Get the seatmap image for a venue (the event type's, else the latest upload)."""
+    venue = VenuesDB.get(venue_id)
+    if not venue:
         raise HTTPException(status_code=404, detail="Venue not found")
 
-    seatmap_path = venue_dir / "seatmaps" / f"{event_type}.png"
-    if not seatmap_path.exists():
-        seatmap_path = venue_dir / "seatmaps" / "default.png"
-    if not seatmap_path.exists():
-        seatmaps_dir = venue_dir / "seatmaps"
-        if seatmaps_dir.exists():
-            pngs = list(seatmaps_dir.glob("*.png"))
-            if pngs:
-                seatmap_path = pngs[0]
-
-    if not seatmap_path.exists():
+    path = StorageDB.get_seatmap_path(venue["venue_id"], event_type)
+    if path is None:
         raise HTTPException(status_code=404, detail="Seatmap not found")
-
-    return FileResponse(
-        seatmap_path,
-        media_type="image/png",
-        filename=f"{venue_id}_seatmap.png",
-    )
+    return RedirectResponse(url=get_blob_store().get_public_url(path))
 
 
 # Generic seat_id routes - must come AFTER specific routes like /preview and /seatmap
 
 @router.get("/{venue_id}/{seat_id}")
 async def get_image(venue_id: str, seat_id: str):
-    """Get the generated image for a specific seat."""
-    venue_dir = VENUES_DIR / venue_id
-    if not venue_dir.exists():
+    """Get the generated image for a specific seat (redirects to the blob store)."""
+    return _redirect_to_asset(venue_id, f"{venue_id}/final_images/{seat_id}_final.jpg", "Image not found")
+
+
+@router.get("/{venue_id}/{seat_id}/nearest", response_model=NearestViewResponse)
+async def get_nearest_image(venue_id: str, seat_id: str):
+    """
+    Get the closest rendered view for any seat (e.g. "101_A_12").
+
+    Only some seats are rendered; this returns the rendered seat nearest in
+    position and viewing direction, so the frontend always has an image.
+    """
+    venue = VenuesDB.get(venue_id)
+    if not venue:
         raise HTTPException(status_code=404, detail="Venue not found")
 
-    image_path = venue_dir / "outputs" / "final_images" / f"{seat_id}_final.jpg"
-    if not image_path.exists():
-        raise HTTPException(status_code=404, detail="Image not found")
+    result = SeatViewsDB.nearest(venue["venue_id"], seat_id)
+    if not result:
+        raise HTTPException(status_code=404, detail="No rendered view found for seat")
 
-    return FileResponse(
-        image_path,
-        media_type="image/jpeg",
-        filename=f"{venue_id}_{seat_id}.jpg",
-    )
+    return NearestViewResponse(**result)
 
 
 @router.get("/{venue_id}/{seat_id}/depth")
 async def get_depth_map(venue_id: str, seat_id: str):
-    """Get the depth map for a specific seat."""
-    venue_dir = VENUES_DIR / venue_id
-    if not venue_dir.exists():
-        raise HTTPException(status_code=404, detail="Venue not found")
-
-    depth_path = venue_dir / "outputs" / "depth_maps" / f"{seat_id}_depth.png"
-    if not depth_path.exists():
-        raise HTTPException(status_code=404, detail="Depth map not found")
-
-    return FileResponse(
-        depth_path,
-        media_type="image/png",
-        filename=f"{venue_id}_{seat_id}_depth.png",
-    )
+    """Get the depth map for a specific seat (redirects to the blob store)."""
+    return _redirect_to_asset(venue_id, f"{venue_id}/depth_maps/{seat_id}_depth.png", "Depth map not found")
 
 
 @router.delete("/{venue_id}/{seat_id}")
@@ -311,21 +225,19 @@ async def delete_image(venue_id: str, seat_id: str):
         raise HTTPException(status_code=404, detail="Venue not found")
 
     actual_venue_id = venue["venue_id"]
-    venue_dir = VENUES_DIR / actual_venue_id
-
-    image_path = venue_dir / "outputs" / "final_images" / f"{seat_id}_final.jpg"
-    depth_path = venue_dir / "outputs" / "depth_maps" / f"{seat_id}_depth.png"
+    assets = StorageDB.get_asset_manifest(actual_venue_id).assets
 
     deleted = []
-    if image_path.exists():
-        image_path.unlink()
-        deleted.append("image")
-    if depth_path.exists():
-        depth_path.unlink()
-        deleted.append("depth_map")
-
-    # Also delete from Supabase
+    for image_type, label, path in (
+        ("final", "image", f"{actual_venue_id}/final_images/{seat_id}_final.jpg"),
+        ("depth", "depth_map", f"{actual_venue_id}/depth_maps/{seat_id}_depth.png"),
+    ):
+        if path in assets and StorageDB.delete_image(actual_venue_id, seat_id, image_type):
+            deleted.append(label)
+
+    # Also delete the database rows
     ImagesDB.delete(actual_venue_id, seat_id)
+    SeatViewsDB.invalidate(actual_venue_id)
 
     if not deleted:
         raise HTTPException(status_code=404, detail="No files found")
@@ -218,6 +218,13 @@ async def start_pipeline(request: PipelineRequest):
         sections=request.sections,
         selected_section_ids=request.selected_section_ids,
         custom_seats=request.custom_seats,
+        anchor_radius=request.anchor_radius,
+        anchor_budget=request.anchor_budget,
+        incremental=request.incremental,
+        mirror_symmetry=request.mirror_symmetry,
+        use_depth_cache=request.use_depth_cache,
+        depth_parallelism=request.depth_parallelism,
+        shard_threshold=request.shard_threshold,
         prompt=request.prompt,
         model=model,
         strength=request.strength,
@@ -232,6 +239,13 @@ async def start_pipeline(request: PipelineRequest):
         skip_depth_render=request.skip_depth_render,
     )
 
+    # Shared generation rate limiter (normally already started by the worker)
+    try:
+        from temporal.client import ensure_rate_limiter
+        await ensure_rate_limiter(client)
+    except Exception as e:
+        logger.warning(f"Could not start generation rate limiter: {e}")
+
     try:
         await client.start_workflow(
             VenuePipelineWorkflow.run,
@@ -276,8 +290,11 @@ async def get_pipeline_progress(workflow_id: str):
             total_steps=progress.total_steps,
             message=progress.message,
             seats_generated=progress.seats_generated,
+            depth_maps_planned=progress.depth_maps_planned,
             depth_maps_rendered=progress.depth_maps_rendered,
             images_generated=progress.images_generated,
+            generation_concurrency=progress.generation_concurrency,
+            generation_throttles=progress.generation_throttles,
             estimated_cost=progress.estimated_cost,
             actual_cost=progress.actual_cost,
             failed_items=progress.failed_items,
@@ -358,6 +375,8 @@ async def get_pipeline_result(workflow_id: str):
             images_generated=result.images_generated,
             image_paths=result.image_paths,
             failed_seats=result.failed_seats,
+            shards=result.shards,
+            path_listing_refs=result.path_listing_refs,
             total_cost=result.total_cost,
             duration_seconds=result.duration_seconds,
             error_message=result.error_message,
@@ -10,7 +10,7 @@ import uuid
 import logging
 from datetime import datetime
 
-from api.db import get_supabase, resolve_venue_id
+from api.db import StorageDB, VenuesDB, get_blob_store, get_supabase, resolve_venue_id
 from api.schemas import (
     SeatmapExtractionResponse,
     SeatmapAdjustmentRequest,
@@ -59,15 +59,17 @@ async def upload_seatmap(
         filename = f"{image_type}_{uuid.uuid4().hex[:8]}.{ext}"
         storage_path = f"venues/{actual_venue_id}/seatmaps/{filename}"
 
-        # Upload to Supabase Storage (bucket name is case-sensitive)
-        storage_response = supabase.storage.from_("IMAGES").upload(
+        # Upload to the blob store
+        store = get_blob_store()
+        store.upload(
             storage_path,
             content,
             {"content-type": file.content_type}
         )
 
         # Get public URL
-        public_url = supabase.storage.from_("IMAGES").get_public_url(storage_path)
+        public_url = store.get_public_url(storage_path)
+        StorageDB.record_asset(actual_venue_id, storage_path, content, file.content_type)
 
         # Update venue with seatmap URL
         supabase.table("venues").update({
@@ -205,18 +207,12 @@ async def start_extraction(
         # Resolve venue_id (handle slug or UUID)
         actual_venue_id = resolve_venue_id(supabase, venue_id)
 
-        # If no seatmap_url provided, get the most recent one from storage
+        # If no seatmap_url provided, get the most recent one from the asset manifest
         if not seatmap_url:
-            # List files in the venue's seatmaps folder
-            storage_files = supabase.storage.from_("IMAGES").list(f"venues/{actual_venue_id}/seatmaps")
-            seatmap_files = [f for f in storage_files if f['name'].startswith('seatmap_')]
-            if not seatmap_files:
+            latest = StorageDB.get_seatmap_path(actual_venue_id)
+            if latest is None:
                 raise HTTPException(status_code=400, detail="No seatmap uploaded for this venue")
-            # Get the most recent one
-            latest = sorted(seatmap_files, key=lambda x: x.get('created_at', ''), reverse=True)[0]
-            seatmap_url = supabase.storage.from_("IMAGES").get_public_url(
-                f"venues/{actual_venue_id}/seatmaps/{latest['name']}"
-            )
+            seatmap_url = get_blob_store().get_public_url(latest)
 
         # Create extraction record
         extraction_id = str(uuid.uuid4())
@@ -379,23 +375,12 @@ async def finalize_extraction(
 
         logger.info(f"Finalizing {len(sections)} sections for venue {actual_venue_id}")
 
-        # Delete existing sections for this venue (no event_type filter - replace all default sections)
-        try:
-            delete_result = supabase.table("sections").delete().eq(
-                "venue_id", actual_venue_id
-            ).is_("event_type_id", None).execute()
-            logger.info(f"Deleted existing sections: {delete_result.data}")
-        except Exception as delete_error:
-            logger.warning(f"Delete sections error (continuing anyway): {delete_error}")
-
-        # Insert new sections
-        sections_to_insert = []
+        # Convert to section definitions
+        new_sections = {}
         for section in sections:
-            section_id = section.get("section_id") or section.get("name") or f"Section_{len(sections_to_insert)+1}"
-            section_data = {
-                "id": str(uuid.uuid4()),
-                "venue_id": actual_venue_id,
-                "section_id": str(section_id),  # Ensure string
+            section_id = str(section.get("section_id") or section.get("name") or f"Section_{len(new_sections)+1}")
+            new_sections[section_id] = {
+                "section_id": section_id,
                 "tier": section.get("tier", "lower"),
                 "angle": float(section.get("angle", 0)),
                 "inner_radius": float(section.get("inner_radius", 18.0)),
@@ -404,13 +389,14 @@ async def finalize_extraction(
                 "row_rise": float(section.get("row_rise", 0.4)),
                 "base_height": float(section.get("base_height", 2.0)),
             }
-            sections_to_insert.append(section_data)
-            logger.debug(f"Section to insert: {section_data}")
 
-        if sections_to_insert:
-            logger.info(f"Inserting {len(sections_to_insert)} sections...")
-            insert_result = supabase.table("sections").insert(sections_to_insert).execute()
-            logger.info(f"Insert result: {len(insert_result.data)} sections inserted")
+        # Diff against existing sections - only changed sections are rewritten
+        update_result = VenuesDB.update_sections(actual_venue_id, new_sections)
+        section_diff = update_result["section_diff"]
+        logger.info(
+            f"Sections: {len(section_diff['added'])} added, {len(section_diff['changed'])} changed, "
+            f"{len(section_diff['removed'])} removed, {len(section_diff['unchanged'])} unchanged"
+        )
 
         # Mark extraction as finalized
         supabase.table("seatmap_extractions").update({
@@ -422,11 +408,12 @@ async def finalize_extraction(
             "has_seatmap": True
         }).eq("id", actual_venue_id).execute()
 
-        logger.info(f"Finalized extraction {extraction_id} with {len(sections_to_insert)} sections")
+        logger.info(f"Finalized extraction {extraction_id} with {len(new_sections)} sections")
 
         return {
             "status": "finalized",
-            "sections_count": len(sections_to_insert),
+            "sections_count": len(new_sections),
+            "section_diff": section_diff,
             "venue_id": actual_venue_id,
         }
 
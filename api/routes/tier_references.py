@@ -9,7 +9,7 @@ from typing import Optional
 import uuid
 import logging
 
-from api.db import get_supabase, resolve_venue_id
+from api.db import get_blob_store, get_supabase, resolve_venue_id
 from api.schemas import (
     TierReferenceResponse,
     TierReferenceListResponse,
@@ -139,15 +139,16 @@ async def upload_tier_reference(
         filename = f"tier_ref_{tier}_{uuid.uuid4().hex[:8]}.{ext}"
         storage_path = f"venues/{actual_venue_id}/tier_references/{filename}"
 
-        # Upload to Supabase Storage
-        supabase.storage.from_("IMAGES").upload(
+        # Upload to the blob store
+        store = get_blob_store()
+        store.upload(
             storage_path,
             content,
             {"content-type": file.content_type}
         )
 
         # Get public URL
-        public_url = supabase.storage.from_("IMAGES").get_public_url(storage_path)
+        public_url = store.get_public_url(storage_path)
 
         # Check if reference already exists for this tier
         existing = supabase.table("tier_references").select("id").eq(
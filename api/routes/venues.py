@@ -73,8 +73,12 @@ async def update_sections(venue_id: str, sections: dict):
     if not venue:
         raise HTTPException(status_code=404, detail="Venue not found")
     actual_venue_id = venue["venue_id"]
-    VenuesDB.update_sections(actual_venue_id, sections)
-    return {"status": "updated", "sections_count": len(sections)}
+    result = VenuesDB.update_sections(actual_venue_id, sections)
+    return {
+        "status": "updated",
+        "sections_count": len(sections),
+        "section_diff": result["section_diff"],
+    }
 
 
 @router.get("/{venue_id}/config")
@@ -113,9 +113,20 @@ class PipelineRequest(BaseModel):
     selected_section_ids: Optional[List[str]] = None
     custom_seats: Optional[List[str]] = None
 
+    # Anchor selection - coverage radius and/or render budget
+    anchor_radius: Optional[float] = Field(None, gt=0)
+    anchor_budget: Optional[int] = Field(None, ge=1)
+    incremental: bool = False           # Only re-render sections whose geometry changed
+
     # Surface configuration
     surface_type: SurfaceType = SurfaceType.RINK
 
+    # Depth rendering
+    mirror_symmetry: bool = True        # Flip mirror-image seats' depth maps instead of rendering
+    use_depth_cache: bool = True        # Only render depth maps missing from the content-addressed cache
+    depth_parallelism: int = Field(4, ge=1, le=32)  # Depth batches rendered concurrently
+    shard_threshold: int = Field(500, ge=1)  # Above this many seats to render, run per-tier child workflows
+
     # AI generation settings
     prompt: str = "Arena view, empty arena"
     model: AIModel = AIModel.FLUX
@@ -145,9 +156,14 @@ class PipelineProgress(BaseModel):
 
     # Progress counts
     seats_generated: int = 0
+    depth_maps_planned: int = 0
     depth_maps_rendered: int = 0
     images_generated: int = 0
 
+    # Adaptive AI generation concurrency (current limit, throttles seen)
+    generation_concurrency: int = 0
+    generation_throttles: int = 0
+
     # Cost tracking
     estimated_cost: float = 0.0
     actual_cost: float = 0.0
@@ -167,9 +183,11 @@ class PipelineResult(BaseModel):
     depth_maps_rendered: int = 0
     images_generated: int = 0
 
-    # Paths
+    # Paths (sharded runs list them per shard in path-listing artifacts)
     image_paths: List[str] = Field(default_factory=list)
     failed_seats: List[str] = Field(default_factory=list)
+    shards: int = 0
+    path_listing_refs: List[str] = Field(default_factory=list)
 
     # Cost and timing
     total_cost: float = 0.0
@@ -186,6 +204,13 @@ class PipelineStartResponse(BaseModel):
 
 # ============== Image Schemas ==============
 
+class ImageVariant(BaseModel):
+    """A resized copy of a seat image."""
+    url: str
+    width: int
+    format: str  # "webp" or "avif"
+
+
 class SeatImage(BaseModel):
     """Information about a generated seat image."""
     seat_id: str
@@ -195,9 +220,19 @@ class SeatImage(BaseModel):
     tier: str
     depth_map_url: Optional[str] = None
     final_image_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None  # Smallest variant
+    variants: List[ImageVariant] = []
+    srcset: Dict[str, str] = {}  # format -> "url 320w, url 640w, ..." for <source srcset>
     generated_at: Optional[datetime] = None
 
 
+class NearestViewResponse(SeatImage):
+    """Closest rendered view to a requested seat."""
+    requested_seat_id: str
+    exact: bool = False
+    distance: float = 0.0
+
+
 class ImageGalleryResponse(BaseModel):
     """Response for image gallery."""
     venue_id: str
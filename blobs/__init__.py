@@ -0,0 +1,66 @@
+"""
+Venue file storage shared by the Temporal workers and the API.
+
+The blob store backends, the per-venue asset manifest and image variant
+paths/srcsets. No Temporal or FastAPI imports (Supabase only when that
+backend is used), so it can be added to any Modal image with
+add_local_python_source("blobs").
+"""
+
+from .manifest import (
+    DEPTH_MAP,
+    FINAL_IMAGE,
+    IMAGE_VARIANT,
+    MODEL,
+    PREVIEW,
+    SEAT_MANIFEST,
+    SEATMAP,
+    AssetManifest,
+    asset_entry,
+    asset_kind,
+    list_folder,
+    load_asset_manifest,
+    read_asset_manifest,
+    rebuild_asset_manifest,
+    update_asset_manifest,
+)
+from .store import (
+    BUCKET,
+    BlobExistsError,
+    BlobStore,
+    LocalBlobStore,
+    SupabaseBlobStore,
+    blob_store,
+    set_blob_store,
+    supabase_client,
+)
+from .variants import CONTENT_TYPES as VARIANT_CONTENT_TYPES, srcsets, variant_path
+
+__all__ = [
+    "DEPTH_MAP",
+    "FINAL_IMAGE",
+    "IMAGE_VARIANT",
+    "MODEL",
+    "PREVIEW",
+    "SEAT_MANIFEST",
+    "SEATMAP",
+    "AssetManifest",
+    "asset_entry",
+    "asset_kind",
+    "list_folder",
+    "load_asset_manifest",
+    "read_asset_manifest",
+    "rebuild_asset_manifest",
+    "update_asset_manifest",
+    "BUCKET",
+    "BlobExistsError",
+    "BlobStore",
+    "LocalBlobStore",
+    "SupabaseBlobStore",
+    "blob_store",
+    "set_blob_store",
+    "supabase_client",
+    "VARIANT_CONTENT_TYPES",
+    "srcsets",
+    "variant_path",
+]
@@ -0,0 +1,299 @@
+"""
+Per-venue asset manifest in the blob store.
+
+Every file a venue owns in the blob store (3D model, preview, seat
+manifest, depth maps, final images and their variants, seatmaps) is
+recorded with its size and hash in one JSON object, so "what does this venue have" is one small read
+instead of a list() per folder (which also stops at the provider's page
+size). Functions take a BlobStore (see store.py).
+
+Layout:
+    {venue_id}/assets.json                  head: the latest version, read by the API
+    {venue_id}/assets/v00000042.json        immutable versions
+
+Updates are optimistic: a writer loads the newest version, applies its
+change and creates version N+1 with upsert off, so two writers can't both
+produce the same version. The loser reloads and applies its change again.
+The head is then pointed at the newest version - a writer that finds a
+newer one leaves the head to that writer. Writers in one process also take
+a per-venue lock, so they don't race each other.
+
+Venues saved before the manifest existed are backfilled from paged
+listings by their first write; that write fails rather than save a
+backfill with a listing missing. Reads never write: a venue without a
+manifest is listed in memory.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from .store import BlobExistsError
+
+ASSET_MANIFEST_FILENAME = "assets.json"
+VERSIONS_DIR = "assets"
+KEEP_VERSIONS = 10
+MAX_UPDATE_ATTEMPTS = 8
+
+# Entries per page when listing a folder (Supabase defaults to 100)
+LIST_PAGE_SIZE = 1000
+
+# Asset kinds, by where the file lives under the venue
+MODEL = "model"
+PREVIEW = "preview"
+SEAT_MANIFEST = "seat_manifest"
+DEPTH_MAP = "depth_map"
+FINAL_IMAGE = "final_image"
+IMAGE_VARIANT = "image_variant"
+SEATMAP = "seatmap"
+
+_venue_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+
+def asset_kind(path: str) -> Optional[str]:
+    """Kind of a blob path ("{venue_id}/depth_maps/101_A_1_depth.png" -> "depth_map")."""
+    name = path.rsplit("/", 1)[-1]
+    if "/depth_maps/" in path:
+        return DEPTH_MAP
+    if "/final_images/" in path:
+        return FINAL_IMAGE
+    if "/image_variants/" in path:
+        return IMAGE_VARIANT
+    if "/seatmaps/" in path:
+        return SEATMAP
+    return {
+        "venue_model.blend": MODEL,
+        "preview.png": PREVIEW,
+        "seats.arrow": SEAT_MANIFEST,
+    }.get(name)
+
+
+def asset_entry(
+    path: str,
+    data: Optional[bytes] = None,
+    content_type: Optional[str] = None,
+    size: Optional[int] = None,
+    etag: Optional[str] = None,
+) -> dict:
+    """Manifest entry for a file: kind, size, sha256 (when the bytes are at hand) or eTag."""
+    entry = {
+        "kind": asset_kind(path),
+        "size": len(data) if data is not None else size,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if data is not None:
+        entry["sha256"] = hashlib.sha256(data).hexdigest()
+    if etag:
+        entry["etag"] = etag
+    if content_type:
+        entry["content_type"] = content_type
+    return entry
+
+
+@dataclass
+class AssetManifest:
+    """All files of one venue: blob path -> entry (kind, size, sha256/etag, ...)."""
+    venue_id: str
+    version: int = 0
+    assets: Dict[str, dict] = field(default_factory=dict)
+    updated_at: Optional[str] = None
+
+    def of_kind(self, kind: str) -> Dict[str, dict]:
+        return {path: entry for path, entry in self.assets.items() if entry.get("kind") == kind}
+
+    def count(self, kind: str) -> int:
+        return sum(1 for entry in self.assets.values() if entry.get("kind") == kind)
+
+    def to_bytes(self) -> bytes:
+        return json.dumps({
+            "venue_id": self.venue_id,
+            "version": self.version,
+            "updated_at": self.updated_at,
+            "assets": self.assets,
+        }, separators=(",", ":")).encode()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "AssetManifest":
+        doc = json.loads(data)
+        return cls(
+            venue_id=doc["venue_id"],
+            version=doc.get("version", 0),
+            assets=doc.get("assets", {}),
+            updated_at=doc.get("updated_at"),
+        )
+
+
+def head_path(venue_id: str) -> str:
+    return f"{venue_id}/{ASSET_MANIFEST_FILENAME}"
+
+
+def version_path(venue_id: str, version: int) -> str:
+    return f"{venue_id}/{VERSIONS_DIR}/v{version:08d}.json"
+
+
+def list_folder(store, folder: str) -> List[dict]:
+    """Every file entry in a blob store folder, following pages (folders themselves skipped)."""
+    entries: List[dict] = []
+    offset = 0
+    while True:
+        page = store.list(folder, {"limit": LIST_PAGE_SIZE, "offset": offset})
+        entries.extend(f for f in page if f.get("id"))
+        offset += len(page)
+        if len(page) < LIST_PAGE_SIZE:
+            return entries
+
+
+def read_asset_manifest(store, venue_id: str) -> Optional[AssetManifest]:
+    """The head manifest (one small download), or None if the venue has none yet."""
+    try:
+        data = store.download(head_path(venue_id))
+    except Exception:
+        return None
+    return AssetManifest.from_bytes(data) if data else None
+
+
+def _newest_version_number(store, venue_id: str) -> int:
+    """Number of the newest immutable version, 0 if there is none."""
+    newest = store.list(
+        f"{venue_id}/{VERSIONS_DIR}",
+        {"limit": 1, "sortBy": {"column": "name", "order": "desc"}},
+    )
+    if not newest or not newest[0].get("id"):
+        return 0
+    return int(newest[0]["name"].lstrip("v").split(".", 1)[0])
+
+
+def _read_latest_version(store, venue_id: str) -> Optional[AssetManifest]:
+    """Newest immutable version (authoritative for writers; the head may lag), else the head."""
+    version = _newest_version_number(store, venue_id)
+    if version:
+        return AssetManifest.from_bytes(store.download(version_path(venue_id, version)))
+    return read_asset_manifest(store, venue_id)
+
+
+def _publish_head(store, venue_id: str, manifest: AssetManifest) -> None:
+    """
+    Point the head at the newest version.
+
+    Skipped when a newer version already exists (its writer publishes it).
+    After writing, the newest version is checked again: if a newer writer
+    published before us, its version is written back over ours.
+    """
+    published = None
+    for _ in range(MAX_UPDATE_ATTEMPTS):
+        newest = _newest_version_number(store, venue_id)
+        if newest > manifest.version:
+            if published is None:
+                return
+            try:
+                manifest = AssetManifest.from_bytes(store.download(version_path(venue_id, newest)))
+            except KeyError:
+                return  # Pruned; an even newer writer is publishing
+        if published == manifest.version:
+            return
+        store.upload(
+            head_path(venue_id),
+            manifest.to_bytes(),
+            file_options={"content-type": "application/json", "upsert": "true"},
+        )
+        published = manifest.version
+
+
+def update_asset_manifest(
+    store,
+    venue_id: str,
+    put: Optional[Dict[str, dict]] = None,
+    remove: Iterable[str] = (),
+) -> AssetManifest:
+    """
+    Add/replace (`put`: path -> entry) and drop (`remove`) entries as one new version.
+
+    A venue without a manifest is backfilled from listings first.
+
+    Raises RuntimeError if other writers keep winning for MAX_UPDATE_ATTEMPTS,
+    or if a backfill listing fails (nothing is written then).
+    """
+    remove = list(remove)
+    with _venue_locks[venue_id]:
+        for attempt in range(MAX_UPDATE_ATTEMPTS):
+            manifest = _read_latest_version(store, venue_id)
+            if manifest is None:
+                manifest = rebuild_asset_manifest(store, venue_id, strict=True)
+            manifest.assets.update(put or {})
+            for path in remove:
+                manifest.assets.pop(path, None)
+            manifest.version += 1
+            manifest.updated_at = datetime.now(timezone.utc).isoformat()
+
+            try:
+                store.upload(
+                    version_path(venue_id, manifest.version),
+                    manifest.to_bytes(),
+                    file_options={"content-type": "application/json", "upsert": "false"},
+                )
+            except BlobExistsError:
+                # Another writer took this version; reload and apply again
+                time.sleep(random.uniform(0.05, 0.2) * (attempt + 1))
+                continue
+
+            _publish_head(store, venue_id, manifest)
+            if manifest.version > KEEP_VERSIONS:
+                try:
+                    store.remove([version_path(venue_id, manifest.version - KEEP_VERSIONS)])
+                except Exception:
+                    pass
+            return manifest
+
+    raise RuntimeError(f"Asset manifest for {venue_id} still contended after {MAX_UPDATE_ATTEMPTS} attempts")
+
+
+def rebuild_asset_manifest(
+    store,
+    venue_id: str,
+    extra_folders: Iterable[str] = (),
+    strict: bool = False,
+) -> AssetManifest:
+    """
+    Build the manifest from paged listings of the venue's folders, in memory
+    (version 0, not saved).
+
+    Entries carry the listing's eTag instead of a sha256. A folder whose
+    listing fails is skipped, or raises RuntimeError with strict (for
+    backfills that get saved).
+    """
+    folders = [venue_id, f"{venue_id}/depth_maps", f"{venue_id}/final_images",
+               f"{venue_id}/image_variants", f"{venue_id}/seatmaps", f"venues/{venue_id}/seatmaps", *extra_folders]
+    assets: Dict[str, dict] = {}
+    for folder in folders:
+        try:
+            files = list_folder(store, folder)
+        except Exception as e:
+            # Missing folders list as empty, so this is a real failure
+            if strict:
+                raise RuntimeError(f"Cannot backfill asset manifest for {venue_id}: listing {folder} failed: {e}") from e
+            continue
+        for f in files:
+            path = f"{folder}/{f['name']}"
+            if asset_kind(path) is None:
+                continue
+            metadata = f.get("metadata") or {}
+            entry = asset_entry(
+                path,
+                content_type=metadata.get("mimetype"),
+                size=metadata.get("size"),
+                etag=(metadata.get("eTag") or "").strip('"') or None,
+            )
+            entry["updated_at"] = f.get("updated_at") or entry["updated_at"]
+            assets[path] = entry
+    return AssetManifest(venue_id=venue_id, assets=assets)
+
+
+def load_asset_manifest(store, venue_id: str) -> AssetManifest:
+    """The venue's manifest: one read, or (before its first write) built from listings. Never writes."""
+    return read_asset_manifest(store, venue_id) or rebuild_asset_manifest(store, venue_id)
@@ -0,0 +1,297 @@
+"""
+Blob storage for venue files (models, previews, depth maps, images, seatmaps).
+
+BlobStore is the subset of a Supabase storage bucket the app uses -
+upload(), download(), remove(), list() and get_public_url() with the same
+arguments and result shapes - so callers work unchanged against:
+
+    SupabaseBlobStore  the IMAGES bucket
+    LocalBlobStore     a directory on disk: content-addressed objects in
+                       sharded directories (identical bytes stored once) plus
+                       a path index; for development, benchmarks and CI
+
+The backend comes from the BLOB_STORE env var: "supabase" (default; needs
+SUPABASE_URL/SUPABASE_KEY) or "local" under BLOB_DIR (default
+/tmp/venue_blobs). The local store must be asked for explicitly, so a
+worker missing its Supabase config fails instead of writing files the API
+can't see. Local public URLs are BLOB_PUBLIC_URL (default
+http://localhost:8000/images/blobs) + path, served by the API.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Union
+
+BUCKET = "IMAGES"
+
+DEFAULT_BLOB_DIR = "/tmp/venue_blobs"
+DEFAULT_BLOB_PUBLIC_URL = "http://localhost:8000/images/blobs"
+
+
+class BlobExistsError(Exception):
+    """upload() with upsert off hit an existing path."""
+
+
+def _upsert(file_options: Optional[dict]) -> bool:
+    return str((file_options or {}).get("upsert", "false")).lower() == "true"
+
+
+class BlobStore:
+    """Path-addressed blob storage. See the module docstring for the contract."""
+
+    def upload(self, path: str, data: bytes, file_options: Optional[dict] = None) -> None:
+        """Store bytes at path; BlobExistsError if it exists and file_options["upsert"] isn't "true"."""
+        raise NotImplementedError
+
+    def download(self, path: str) -> bytes:
+        """Bytes at path (KeyError if missing)."""
+        raise NotImplementedError
+
+    def remove(self, paths: List[str]) -> None:
+        raise NotImplementedError
+
+    def list(self, path: str, options: Optional[dict] = None) -> List[dict]:
+        """
+        Entries directly under a folder, Supabase-shaped: {"name", "id" (None for
+        folders), "updated_at", "metadata": {"size", "mimetype", "eTag"}}.
+
+        options: "limit" (default 100), "offset", "sortBy": {"column": "name", "order": "asc"|"desc"}
+        """
+        raise NotImplementedError
+
+    def get_public_url(self, path: str) -> str:
+        raise NotImplementedError
+
+
+class SupabaseBlobStore(BlobStore):
+    """
+    A Supabase storage bucket.
+
+    Args:
+        bucket: supabase_client.storage.from_("IMAGES")
+    """
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+
+    def upload(self, path: str, data: bytes, file_options: Optional[dict] = None) -> None:
+        try:
+            self.bucket.upload(path, data, file_options=file_options or {})
+        except Exception as e:
+            message = str(e).lower()
+            if not _upsert(file_options) and ("duplicate" in message or "already exists" in message or "409" in message):
+                raise BlobExistsError(path) from e
+            raise
+
+    def download(self, path: str) -> bytes:
+        try:
+            data = self.bucket.download(path)
+        except Exception as e:
+            message = str(e).lower()
+            if "not found" in message or "not_found" in message or "404" in message:
+                raise KeyError(path) from e
+            raise
+        if not data:
+            raise KeyError(path)
+        return data
+
+    def remove(self, paths: List[str]) -> None:
+        self.bucket.remove(paths)
+
+    def list(self, path: str, options: Optional[dict] = None) -> List[dict]:
+        return self.bucket.list(path, options or {})
+
+    def get_public_url(self, path: str) -> str:
+        return self.bucket.get_public_url(path)
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Blobs on local disk, deduplicated by content.
+
+    Layout under root:
+        objects/ab/abcdef...       bytes, named by sha256 (sharded by prefix)
+        paths/<path>.json          {"sha256", "size", "content_type", "updated_at"}
+
+    Writes go through a temp file and rename, and create-only uploads use
+    O_EXCL, so concurrent writers (threads or processes) see whole files.
+    Removing a path leaves its object; prune() deletes unreferenced ones.
+    """
+
+    INDEX_SUFFIX = ".json"
+
+    def __init__(self, root: Union[str, Path], public_url: str = DEFAULT_BLOB_PUBLIC_URL):
+        self.root = Path(root)
+        self.public_url = public_url.rstrip("/")
+
+    @classmethod
+    def from_env(cls) -> "LocalBlobStore":
+        return cls(
+            os.environ.get("BLOB_DIR", DEFAULT_BLOB_DIR),
+            os.environ.get("BLOB_PUBLIC_URL", DEFAULT_BLOB_PUBLIC_URL),
+        )
+
+    def _object_path(self, key: str) -> Path:
+        return self.root / "objects" / key[:2] / key
+
+    def _index_path(self, path: str) -> Path:
+        clean = path.strip("/")
+        if not clean or ".." in clean.split("/"):
+            raise ValueError(f"Invalid blob path: {path!r}")
+        return self.root / "paths" / f"{clean}{self.INDEX_SUFFIX}"
+
+    def _write_atomic(self, target: Path, data: bytes) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        tmp.replace(target)
+
+    def _read_index(self, path: str) -> dict:
+        try:
+            return json.loads(self._index_path(path).read_bytes())
+        except FileNotFoundError:
+            raise KeyError(path)
+
+    def upload(self, path: str, data: bytes, file_options: Optional[dict] = None) -> None:
+        file_options = file_options or {}
+        key = hashlib.sha256(data).hexdigest()
+        object_path = self._object_path(key)
+        if not object_path.exists():
+            self._write_atomic(object_path, data)
+
+        entry = json.dumps({
+            "sha256": key,
+            "size": len(data),
+            "content_type": file_options.get("content-type", "application/octet-stream"),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }).encode()
+
+        index_path = self._index_path(path)
+        if _upsert(file_options):
+            self._write_atomic(index_path, entry)
+            return
+
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            fd = os.open(index_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+        except FileExistsError:
+            raise BlobExistsError(path)
+        with os.fdopen(fd, "wb") as f:
+            f.write(entry)
+
+    def download(self, path: str) -> bytes:
+        try:
+            return self.object_file(path).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(path)
+
+    def object_file(self, path: str) -> Path:
+        """File holding the bytes at path (for serving without a copy; KeyError if missing)."""
+        return self._object_path(self._read_index(path)["sha256"])
+
+    def content_type(self, path: str) -> str:
+        return self._read_index(path).get("content_type", "application/octet-stream")
+
+    def remove(self, paths: List[str]) -> None:
+        for path in paths:
+            try:
+                self._index_path(path).unlink()
+            except FileNotFoundError:
+                pass
+
+    def list(self, path: str, options: Optional[dict] = None) -> List[dict]:
+        options = options or {}
+        folder = self.root / "paths" / path.strip("/")
+        if not folder.is_dir():
+            return []
+
+        entries = []
+        for child in folder.iterdir():
+            if child.name.startswith("."):
+                continue
+            if child.is_dir():
+                entries.append({"name": child.name, "id": None, "updated_at": None, "metadata": None})
+            elif child.name.endswith(self.INDEX_SUFFIX):
+                entry = json.loads(child.read_bytes())
+                entries.append({
+                    "name": child.name[:-len(self.INDEX_SUFFIX)],
+                    "id": entry["sha256"],
+                    "updated_at": entry.get("updated_at"),
+                    "created_at": entry.get("updated_at"),
+                    "metadata": {
+                        "size": entry.get("size"),
+                        "mimetype": entry.get("content_type"),
+                        "eTag": entry["sha256"],
+                    },
+                })
+
+        sort_by = options.get("sortBy") or {}
+        entries.sort(key=lambda e: e.get(sort_by.get("column", "name")) or "",
+                     reverse=sort_by.get("order") == "desc")
+        offset = options.get("offset", 0)
+        return entries[offset:offset + options.get("limit", 100)]
+
+    def get_public_url(self, path: str) -> str:
+        return f"{self.public_url}/{path.strip('/')}"
+
+    def prune(self) -> int:
+        """Delete objects no path refers to; returns how many were removed."""
+        referenced = {
+            json.loads(index.read_bytes())["sha256"]
+            for index in (self.root / "paths").rglob(f"*{self.INDEX_SUFFIX}")
+        }
+        removed = 0
+        for obj in (self.root / "objects").glob("*/*"):
+            if obj.name not in referenced and not obj.name.endswith(".tmp"):
+                obj.unlink()
+                removed += 1
+        return removed
+
+
+_store: Optional[BlobStore] = None
+_store_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def supabase_client():
+    """The process's Supabase client (SUPABASE_URL/SUPABASE_KEY), or None if they aren't set."""
+    supabase_url = os.environ.get("SUPABASE_URL")
+    supabase_key = os.environ.get("SUPABASE_KEY")
+    if not supabase_url or not supabase_key:
+        return None
+    from supabase import create_client
+    return create_client(supabase_url, supabase_key)
+
+
+def blob_store() -> BlobStore:
+    """The worker process's blob store (created once, from env)."""
+    global _store
+    if _store is not None:
+        return _store
+
+    with _store_lock:
+        if _store is None:
+            backend = os.environ.get("BLOB_STORE", "supabase")
+            if backend == "local":
+                _store = LocalBlobStore.from_env()
+            elif backend == "supabase":
+                client = supabase_client()
+                if client is None:
+                    raise ValueError(
+                        "SUPABASE_URL and SUPABASE_KEY must be set (or BLOB_STORE=local for a local blob store)"
+                    )
+                _store = SupabaseBlobStore(client.storage.from_(BUCKET))
+            else:
+                raise ValueError(f"Unknown BLOB_STORE {backend!r} (expected 'supabase' or 'local')")
+    return _store
+
+
+def set_blob_store(store: Optional[BlobStore]) -> None:
+    """Use `store` for this process (e.g. a LocalBlobStore in benchmarks); None resets."""
+    global _store
+    _store = store
@@ -0,0 +1,25 @@
+"""
+Paths and srcsets of the responsive image variants stored next to generated
+seat images (encoded by temporal/activities/image_variants.py):
+
+    {venue_id}/image_variants/{seat_id}_w640.webp
+"""
+
+from typing import Dict, List, Sequence
+
+CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+
+
+def variant_path(venue_id: str, seat_id: str, width: int, fmt: str) -> str:
+    return f"{venue_id}/image_variants/{seat_id}_w{width}.{fmt}"
+
+
+def srcsets(variants: Sequence[dict]) -> Dict[str, str]:
+    """format -> srcset string ("url 320w, url 640w") from recorded variants."""
+    by_format: Dict[str, List[dict]] = {}
+    for variant in variants:
+        by_format.setdefault(variant["format"], []).append(variant)
+    return {
+        fmt: ", ".join(f"{v['url']} {v['width']}w" for v in sorted(entries, key=lambda v: v["width"]))
+        for fmt, entries in by_format.items()
+    }
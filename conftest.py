@@ -0,0 +1,2 @@
+# test_temporal.py is a connection check script (run it directly), not a pytest module
+collect_ignore = ["test_temporal.py"]
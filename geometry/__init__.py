@@ -0,0 +1,97 @@
+"""
+Venue geometry shared by the scripts, Modal functions, Temporal activities and API.
+
+NumPy/Arrow only - no Blender, Supabase or Temporal imports - so it can be
+added to any Modal image with add_local_python_source("geometry").
+"""
+
+from .anchors import (
+    DEFAULT_ANCHOR_RADIUS,
+    farthest_point_sampling,
+    get_anchor_seats,
+    select_anchor_seats,
+)
+from .diff import (
+    SECTION_HASH_FIELDS,
+    SectionDiff,
+    changed_seat_ids,
+    changed_seat_indices,
+    diff_sections,
+    section_hash,
+    section_hashes,
+)
+from .index import SeatIndex
+from .manifest import (
+    MANIFEST_FILENAME,
+    build_seat_manifest,
+    manifest_metadata,
+    manifest_section_hashes,
+    manifest_seats,
+    read_seat_manifest,
+    seat_arrays_from_manifest,
+    seat_manifest_to_bytes,
+    write_seat_manifest,
+)
+from .seats import (
+    LOOK_ANGLE_WEIGHT,
+    SeatArrays,
+    calculate_seat_positions,
+    generate_seat_arrays,
+    get_sample_seats,
+    row_label,
+    row_number,
+    view_features,
+)
+from .symmetry import (
+    DEFAULT_MIRROR_TOLERANCE,
+    MirrorPlan,
+    expand_mirrored,
+    flip_depth_png,
+    mirror_partners,
+    mirror_planes,
+    plan_mirrored_renders,
+)
+
+__all__ = [
+    # Seat generation
+    "LOOK_ANGLE_WEIGHT",
+    "SeatArrays",
+    "calculate_seat_positions",
+    "generate_seat_arrays",
+    "get_sample_seats",
+    "row_label",
+    "row_number",
+    "view_features",
+    "SeatIndex",
+    # Anchor selection
+    "DEFAULT_ANCHOR_RADIUS",
+    "farthest_point_sampling",
+    "get_anchor_seats",
+    "select_anchor_seats",
+    # Seat manifest
+    "MANIFEST_FILENAME",
+    "build_seat_manifest",
+    "manifest_metadata",
+    "manifest_section_hashes",
+    "manifest_seats",
+    "read_seat_manifest",
+    "seat_arrays_from_manifest",
+    "seat_manifest_to_bytes",
+    "write_seat_manifest",
+    # Section diffing
+    "SECTION_HASH_FIELDS",
+    "SectionDiff",
+    "changed_seat_ids",
+    "changed_seat_indices",
+    "diff_sections",
+    "section_hash",
+    "section_hashes",
+    # Mirror-symmetry render planning
+    "DEFAULT_MIRROR_TOLERANCE",
+    "MirrorPlan",
+    "expand_mirrored",
+    "flip_depth_png",
+    "mirror_partners",
+    "mirror_planes",
+    "plan_mirrored_renders",
+]
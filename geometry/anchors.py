@@ -0,0 +1,137 @@
+"""
+Coverage-driven anchor selection.
+
+Anchors are the seats that get rendered. Instead of hand-picking sections per
+tier, anchors are chosen by farthest-point sampling in seat pose space
+(position + weighted view direction, see view_features): each new anchor is
+the seat whose view is currently worst covered. Stopping at a coverage radius
+guarantees every seat has an anchor within that view error; greedy
+farthest-point sampling is within 2x of the optimal anchor count for it.
+
+Sampling can be seeded with fixed anchors (e.g. the already-rendered anchors
+of sections that didn't change), so an incremental run only adds anchors
+where coverage was lost instead of reshuffling the whole bowl.
+
+With mirror planes, every anchor is picked together with its mirror images,
+so the render planner can derive them (see symmetry.plan_mirrored_renders)
+instead of rendering seats that happen to have no anchor partner.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from .seats import LOOK_ANGLE_WEIGHT, SeatArrays, view_features
+from .symmetry import mirror_partners
+
+# Default view error bound (pose-space metres) when no budget is given
+DEFAULT_ANCHOR_RADIUS = 12.0
+
+
+def farthest_point_sampling(
+    points: np.ndarray,
+    radius: Optional[float] = None,
+    budget: Optional[int] = None,
+    fixed: Optional[Sequence[int]] = None,
+    partners: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, float]:
+    """
+    Greedy farthest-point sampling.
+
+    Stops when every point is within radius of a selected point, or when
+    budget points have been selected, whichever comes first.
+
+    Args:
+        points: (N, D) array
+        radius: Target coverage radius
+        budget: Maximum number of points to select (fixed points count
+            towards it, but are always kept)
+        fixed: Indices that are already selected; sampling continues from them
+        partners: (N, K) indices selected together with each sampled point
+            (-1 for none), e.g. from symmetry.mirror_partners(); a group that
+            doesn't fit in the budget ends sampling
+
+    Returns:
+        (selected indices in selection order, fixed first; achieved coverage radius)
+    """
+    n = len(points)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), 0.0
+    if radius is None and budget is None:
+        raise ValueError("farthest_point_sampling needs a radius or a budget")
+    selected = list(dict.fromkeys(int(i) for i in fixed)) if fixed is not None else []
+    limit = n if budget is None else max(min(budget, n), 1, len(selected))
+    is_selected = np.zeros(n, dtype=bool)
+    min_dist = np.full(n, np.inf)  # squared distance to nearest anchor
+
+    def group(index: int) -> list:
+        members = [index] if partners is None else [index, *partners[index].tolist()]
+        return [i for i in dict.fromkeys(members) if i >= 0 and not is_selected[i]]
+
+    def add(indices: list) -> None:
+        for index in indices:
+            is_selected[index] = True
+            diff = points - points[index]
+            np.minimum(min_dist, np.einsum("ij,ij->i", diff, diff), out=min_dist)
+
+    if selected:
+        add(selected)
+    else:
+        # Seed with the most peripheral point so the result is deterministic
+        centroid = points.mean(axis=0)
+        selected = group(int(np.argmax(np.einsum("ij,ij->i", points - centroid, points - centroid))))
+        add(selected)
+    radius_sq = None if radius is None else radius * radius
+
+    while len(selected) < limit:
+        candidate = int(np.argmax(min_dist))
+        if radius_sq is not None and min_dist[candidate] <= radius_sq:
+            break
+        members = group(candidate)
+        if len(selected) + len(members) > limit:
+            break
+        selected.extend(members)
+        add(members)
+
+    return np.array(selected, dtype=np.int64), float(np.sqrt(min_dist.max()))
+
+
+def select_anchor_seats(
+    seats: SeatArrays,
+    radius: Optional[float] = None,
+    budget: Optional[int] = None,
+    angle_weight: float = LOOK_ANGLE_WEIGHT,
+    fixed: Optional[Sequence[int]] = None,
+    planes: Sequence[str] = (),
+) -> Tuple[np.ndarray, float]:
+    """
+    Pick the anchor seats covering every seat in the venue, across all tiers.
+
+    Args:
+        seats: Seats from generate_seat_arrays()
+        radius: Maximum view error any seat may have to its nearest anchor
+        budget: Maximum number of anchors (render budget)
+        fixed: Seat indices that stay anchors (e.g. kept from a previous run)
+        planes: Mirror planes (symmetry.mirror_planes()); anchors are picked
+            together with their mirror-image seats
+
+    Returns:
+        (anchor indices, achieved coverage radius)
+    """
+    if radius is None and budget is None:
+        radius = DEFAULT_ANCHOR_RADIUS
+    points = view_features(seats.x, seats.y, seats.z, seats.look_angle, angle_weight)
+    partners = mirror_partners(seats.x, seats.y, seats.z, planes) if planes else None
+    return farthest_point_sampling(points, radius=radius, budget=budget, fixed=fixed, partners=partners)
+
+
+def get_anchor_seats(
+    seats: SeatArrays,
+    radius: Optional[float] = None,
+    budget: Optional[int] = None,
+    fixed: Optional[Sequence[int]] = None,
+    planes: Sequence[str] = (),
+) -> np.ndarray:
+    """Indices of the anchor seats (see select_anchor_seats), sorted by seat order."""
+    anchors, _ = select_anchor_seats(seats, radius=radius, budget=budget, fixed=fixed, planes=planes)
+    return np.sort(anchors)
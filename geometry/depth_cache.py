@@ -0,0 +1,148 @@
+"""
+Content-addressed depth-map cache.
+
+A depth map is a pure function of the .blend geometry, the camera pose and
+intrinsics and the depth encoding. depth_cache_key() hashes exactly those, so
+a cached map is reused whenever - and only when - all of them match; a
+changed section, surface or lens simply misses.
+
+Backends store one PNG per key: LocalDepthCache on disk, ObjectStoreDepthCache
+in any bucket with download/upload (e.g. a Supabase storage bucket).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+# Bump when the depth encoding (Blender depth material) changes
+DEPTH_ENCODING = "view-z:1-z/100:clamp:png-rgb8:v1"
+
+
+@dataclass(frozen=True)
+class DepthCamera:
+    """Seat camera matching RENDER_DEPTH_SCRIPT's SeatCamera."""
+    width: int = 1024
+    height: int = 768
+    lens: float = 18.0           # mm
+    sensor_width: float = 36.0   # mm, Blender default (sensor fit AUTO -> horizontal)
+    clip_start: float = 0.1
+    clip_end: float = 200.0
+    eye_height: float = 1.2
+
+
+DEFAULT_CAMERA = DepthCamera()
+
+
+def _digest(payload) -> str:
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def blend_hash(blend_bytes: bytes) -> str:
+    """Hash of a .blend file (its geometry as far as Blender renders go)."""
+    return hashlib.sha256(blend_bytes).hexdigest()[:16]
+
+
+def depth_cache_key(
+    geometry_hash: str,
+    seat: dict,
+    camera: DepthCamera = DEFAULT_CAMERA,
+) -> str:
+    """
+    Cache key of one seat's depth map.
+
+    Args:
+        geometry_hash: blend_hash() of the venue model
+        seat: Seat dict with x, y, z (the id is deliberately not part of the key)
+        camera: Lens, sensor, resolution, clipping and eye height
+    """
+    return _digest({
+        "geometry": geometry_hash,
+        "pose": [round(seat["x"], 3), round(seat["y"], 3), round(seat["z"] + camera.eye_height, 3)],
+        "target": [0, 0, 0],
+        "camera": asdict(camera),
+        "encoding": DEPTH_ENCODING,
+    })
+
+
+class DepthCache:
+    """Key -> PNG bytes store. Subclasses implement get() and put()."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def put(self, key: str, png_bytes: bytes) -> None:
+        raise NotImplementedError
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """key -> PNG bytes for the keys that are cached."""
+        found = {}
+        for key in keys:
+            png_bytes = self.get(key)
+            if png_bytes is not None:
+                found[key] = png_bytes
+        return found
+
+    def put_many(self, entries: Dict[str, bytes]) -> None:
+        for key, png_bytes in entries.items():
+            self.put(key, png_bytes)
+
+
+class LocalDepthCache(DepthCache):
+    """Depth maps on disk, sharded by key prefix: {root}/ab/abcdef....png"""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.png"
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, png_bytes: bytes) -> None:
+        path = self._path(key)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(png_bytes)
+        tmp_path.replace(path)
+
+
+class ObjectStoreDepthCache(DepthCache):
+    """
+    Depth maps in an object store bucket under {prefix}/ab/abcdef....png.
+
+    Args:
+        bucket: Object with download(path) -> bytes and upload(path, bytes, file_options)
+            (e.g. a blobs.store.BlobStore)
+    """
+
+    def __init__(self, bucket, prefix: str = "depth_cache"):
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _object_path(self, key: str) -> str:
+        return f"{self.prefix}/{key[:2]}/{key}.png"
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.bucket.download(self._object_path(key))
+        except Exception:
+            return None
+
+    def put(self, key: str, png_bytes: bytes) -> None:
+        # Same key means same content, so upsert is always safe
+        self.bucket.upload(
+            self._object_path(key),
+            png_bytes,
+            file_options={"content-type": "image/png", "upsert": "true"},
+        )
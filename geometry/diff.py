@@ -0,0 +1,105 @@
+"""
+Section-level change detection.
+
+Each section definition gets a content hash over the fields that move its
+seats. Comparing old and new hashes tells which sections (and therefore
+which seats) need new depth maps and images, so tweaking one section doesn't
+re-render the whole venue.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .seats import DEFAULT_ROWS, DEFAULT_SEATS_PER_ROW, SeatArrays
+
+# Geometry fields and the defaults generate_seat_arrays() applies to them
+SECTION_HASH_FIELDS = {
+    "angle": 0.0,
+    "inner_radius": 18.0,
+    "rows": DEFAULT_ROWS,
+    "seats_per_row": DEFAULT_SEATS_PER_ROW,
+    "row_depth": 0.85,
+    "row_rise": 0.4,
+    "base_height": 2.0,
+}
+
+
+def section_hash(section: dict) -> str:
+    """
+    Content hash of a section's geometry.
+
+    Missing fields hash the same as their defaults, and floats are rounded so
+    values that went through a database round trip still match.
+    """
+    values = {}
+    for name, default in SECTION_HASH_FIELDS.items():
+        value = section.get(name)
+        if value is None:
+            value = default
+        values[name] = int(value) if isinstance(default, int) else round(float(value), 6)
+
+    payload = json.dumps(values, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def section_hashes(sections: Dict[str, dict]) -> Dict[str, str]:
+    """section_id -> content hash for every section."""
+    return {section_id: section_hash(data) for section_id, data in sections.items()}
+
+
+@dataclass
+class SectionDiff:
+    """Result of comparing two sets of section hashes."""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def dirty(self) -> List[str]:
+        """Sections whose seats need (re)rendering."""
+        return self.added + self.changed
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {
+            "added": self.added,
+            "removed": self.removed,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+        }
+
+
+def diff_sections(old_hashes: Optional[Dict[str, str]], new_hashes: Dict[str, str]) -> SectionDiff:
+    """
+    Compare section hashes. With no previous hashes every section is "added".
+    """
+    old_hashes = old_hashes or {}
+    diff = SectionDiff()
+    for section_id, new_hash in new_hashes.items():
+        old_hash = old_hashes.get(section_id)
+        if old_hash is None:
+            diff.added.append(section_id)
+        elif old_hash != new_hash:
+            diff.changed.append(section_id)
+        else:
+            diff.unchanged.append(section_id)
+    diff.removed = [section_id for section_id in old_hashes if section_id not in new_hashes]
+    return diff
+
+
+def changed_seat_indices(seats: SeatArrays, diff: SectionDiff) -> np.ndarray:
+    """Indices of every seat in an added or changed section."""
+    slices = [seats.index.section_slice(section_id) for section_id in diff.dirty]
+    ranges = [np.arange(s.start, s.stop) for s in slices if s is not None]
+    if not ranges:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(ranges).astype(np.int64)
+
+
+def changed_seat_ids(seats: SeatArrays, diff: SectionDiff) -> List[str]:
+    """Seat ids of every seat in an added or changed section."""
+    return [seats.seat_id(i) for i in changed_seat_indices(seats, diff)]
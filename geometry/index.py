@@ -0,0 +1,98 @@
+"""
+Hierarchical tier -> section -> row index over SeatArrays.
+
+Built once in a single pass over the per-section arrays. Because seats are
+laid out contiguously by section, row and seat, every level of the hierarchy
+resolves to a slice (or a closed-form offset), so sample, anchor and custom
+seat selection never rescan seats.
+"""
+
+from typing import TYPE_CHECKING, Dict, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .seats import SeatArrays
+
+
+class SeatIndex:
+    """
+    Slice lookups for a venue's seats.
+
+    Attributes:
+        tier_section_order: Section indices grouped by tier, sorted by section id
+            within each tier; tier t owns [tier_offsets[t], tier_offsets[t + 1])
+        tier_seat_order: Seat indices grouped by tier, in tier_section_order
+    """
+
+    def __init__(self, seats: "SeatArrays"):
+        self.seats = seats
+        self.section_lookup: Dict[str, int] = {
+            section_id: i for i, section_id in enumerate(seats.section_ids)
+        }
+        self.tier_lookup: Dict[str, int] = {tier: i for i, tier in enumerate(seats.tiers)}
+        n_tiers = len(seats.tiers)
+
+        # tier -> sections
+        section_ids = np.array(seats.section_ids, dtype=str)
+        self.tier_section_order = np.lexsort((section_ids, seats.section_tier)).astype(np.int64)
+        self.tier_offsets = np.zeros(n_tiers + 1, dtype=np.int64)
+        np.cumsum(np.bincount(seats.section_tier, minlength=n_tiers), out=self.tier_offsets[1:])
+
+        # tier -> seats, weighted by seats per section so no per-seat sort is needed
+        section_sizes = np.diff(seats.section_offsets)
+        ordered_sizes = section_sizes[self.tier_section_order]
+        starts = seats.section_offsets[:-1][self.tier_section_order]
+        run_starts = np.repeat(starts - np.concatenate(([0], np.cumsum(ordered_sizes)[:-1])), ordered_sizes)
+        self.tier_seat_order = np.arange(int(ordered_sizes.sum()), dtype=np.int64) + run_starts
+        self.tier_seat_offsets = np.zeros(n_tiers + 1, dtype=np.int64)
+        tier_sizes = np.bincount(seats.section_tier, weights=section_sizes, minlength=n_tiers)
+        np.cumsum(tier_sizes.astype(np.int64), out=self.tier_seat_offsets[1:])
+
+    # ----- tier level -----
+
+    def tier_sections(self, tier: str) -> np.ndarray:
+        """Section indices of a tier, sorted by section id (a view, no copy)."""
+        t = self.tier_lookup.get(tier)
+        if t is None:
+            return np.empty(0, dtype=np.int64)
+        return self.tier_section_order[self.tier_offsets[t]:self.tier_offsets[t + 1]]
+
+    def tier_seats(self, tier: str) -> np.ndarray:
+        """Seat indices of a tier (a view, no copy)."""
+        t = self.tier_lookup.get(tier)
+        if t is None:
+            return np.empty(0, dtype=np.int64)
+        return self.tier_seat_order[self.tier_seat_offsets[t]:self.tier_seat_offsets[t + 1]]
+
+    # ----- section level -----
+
+    def section_slice(self, section_id: str) -> Optional[slice]:
+        """Seat slice of a section, or None if it doesn't exist."""
+        s = self.section_lookup.get(section_id)
+        if s is None:
+            return None
+        return slice(int(self.seats.section_offsets[s]), int(self.seats.section_offsets[s + 1]))
+
+    # ----- row level -----
+
+    def row_starts(self, sections: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """First seat index of each (section index, 0-based row) pair, vectorized."""
+        return self.seats.section_offsets[sections] + rows * self.seats.section_seats_per_row[sections]
+
+    def row_slice(self, section_id: str, row_num: int) -> Optional[slice]:
+        """Seat slice of one row of a section, or None if it doesn't exist."""
+        s = self.section_lookup.get(section_id)
+        if s is None or not 0 <= row_num < int(self.seats.section_rows[s]):
+            return None
+        seats_per_row = int(self.seats.section_seats_per_row[s])
+        start = int(self.seats.section_offsets[s]) + row_num * seats_per_row
+        return slice(start, start + seats_per_row)
+
+    def seat(self, section_id: str, row_num: int, seat_num: int) -> Optional[int]:
+        """Index of a seat (0-based row, 1-based seat), or None if it doesn't exist."""
+        row = self.row_slice(section_id, row_num)
+        if row is None or not 1 <= seat_num <= row.stop - row.start:
+            return None
+        return row.start + seat_num - 1
+
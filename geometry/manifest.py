@@ -0,0 +1,226 @@
+"""
+Columnar seat manifest.
+
+One Arrow IPC file per venue (seats.arrow) holds every seat with typed
+columns. Anchor and sample sets are boolean columns rather than separate
+JSON files, and a "changed" column marks seats whose section geometry
+changed since the previous manifest (section content hashes live in the
+schema metadata). The file is written uncompressed so it can be memory-mapped and
+read column-by-column without parsing.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pyarrow as pa
+
+from .seats import SeatArrays, row_label, row_number
+
+MANIFEST_FILENAME = "seats.arrow"
+MANIFEST_VERSION = "2"
+
+SEAT_MANIFEST_SCHEMA = pa.schema([
+    pa.field("section", pa.dictionary(pa.int32(), pa.string())),
+    pa.field("tier", pa.dictionary(pa.int16(), pa.string())),
+    pa.field("row", pa.dictionary(pa.int16(), pa.string())),
+    pa.field("seat", pa.int16()),
+    pa.field("x", pa.float32()),
+    pa.field("y", pa.float32()),
+    pa.field("z", pa.float32()),
+    pa.field("look_angle", pa.float32()),
+    pa.field("anchor", pa.bool_()),
+    pa.field("sample", pa.bool_()),
+    pa.field("changed", pa.bool_()),
+])
+
+
+def _flags(n: int, indices: Optional[Sequence[int]]) -> np.ndarray:
+    mask = np.zeros(n, dtype=bool)
+    if indices is not None and len(indices):
+        mask[np.asarray(indices, dtype=np.int64)] = True
+    return mask
+
+
+def build_seat_manifest(
+    seats: SeatArrays,
+    anchor: Optional[Sequence[int]] = None,
+    sample: Optional[Sequence[int]] = None,
+    changed: Optional[Sequence[int]] = None,
+    section_hashes: Optional[Dict[str, str]] = None,
+    metadata: Optional[Dict[str, str]] = None,
+) -> pa.Table:
+    """
+    Build the manifest table from generated seats.
+
+    Args:
+        seats: Seats from generate_seat_arrays()
+        anchor: Indices of anchor seats
+        sample: Indices of sample seats
+        changed: Indices of seats whose geometry changed (None = all seats)
+        section_hashes: section_id -> content hash (see geometry.diff)
+        metadata: Extra string key/values stored in the schema metadata
+
+    Returns:
+        pyarrow Table with SEAT_MANIFEST_SCHEMA
+    """
+    n = len(seats)
+    max_row = int(seats.section_rows.max()) if len(seats.section_rows) else 0
+    row_labels = [row_label(r) for r in range(max_row)]
+
+    columns = [
+        pa.DictionaryArray.from_arrays(
+            pa.array(seats.section_idx, type=pa.int32()), pa.array(seats.section_ids, type=pa.string())
+        ),
+        pa.DictionaryArray.from_arrays(
+            pa.array(seats.tier_idx, type=pa.int16()), pa.array(seats.tiers, type=pa.string())
+        ),
+        pa.DictionaryArray.from_arrays(
+            pa.array(seats.row, type=pa.int16()), pa.array(row_labels, type=pa.string())
+        ),
+        pa.array(seats.seat, type=pa.int16()),
+        pa.array(seats.x.astype(np.float32)),
+        pa.array(seats.y.astype(np.float32)),
+        pa.array(seats.z.astype(np.float32)),
+        pa.array(seats.look_angle.astype(np.float32)),
+        pa.array(_flags(n, anchor)),
+        pa.array(_flags(n, sample)),
+        pa.array(np.ones(n, dtype=bool) if changed is None else _flags(n, changed)),
+    ]
+
+    schema_metadata = {"manifest_version": MANIFEST_VERSION}
+    if section_hashes is not None:
+        schema_metadata["section_hashes"] = json.dumps(section_hashes, sort_keys=True)
+    schema_metadata.update(metadata or {})
+    schema = SEAT_MANIFEST_SCHEMA.with_metadata(schema_metadata)
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def write_seat_manifest(table: pa.Table, path: Union[str, Path]) -> Path:
+    """Write the manifest to an (uncompressed, mmap-able) Arrow IPC file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return path
+
+
+def seat_manifest_to_bytes(table: pa.Table) -> bytes:
+    """Serialize the manifest for upload to object storage."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def read_seat_manifest(source: Union[str, Path, bytes]) -> pa.Table:
+    """
+    Open a seat manifest.
+
+    Paths are memory-mapped, so columns are only paged in when touched.
+    Raw bytes (e.g. downloaded from storage) are read zero-copy.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return pa.ipc.open_file(pa.BufferReader(source)).read_all()
+    return pa.ipc.open_file(pa.memory_map(str(source), "r")).read_all()
+
+
+def manifest_metadata(table: pa.Table) -> Dict[str, str]:
+    """Decoded schema metadata of a manifest."""
+    raw = table.schema.metadata or {}
+    return {k.decode(): v.decode() for k, v in raw.items()}
+
+
+def manifest_section_hashes(table: pa.Table) -> Dict[str, str]:
+    """section_id -> content hash recorded when the manifest was built ({} if none)."""
+    raw = manifest_metadata(table).get("section_hashes")
+    return json.loads(raw) if raw else {}
+
+
+def manifest_seats(table: pa.Table, *flags: str) -> List[dict]:
+    """
+    Seat dicts for the rows with all of the given boolean flags set
+    ("anchor", "sample", "changed"), or every row if no flags are given.
+    Meant for small subsets.
+    """
+    for flag in flags:
+        table = table.filter(table.column(flag))
+
+    columns = {
+        name: table.column(name).to_pylist()
+        for name in ("section", "tier", "row", "seat", "x", "y", "z", "look_angle")
+    }
+    return [
+        {
+            "id": f"{section}_{row}_{seat}",
+            "section": section,
+            "row": row,
+            "seat": seat,
+            "tier": tier,
+            "x": round(x, 3),
+            "y": round(y, 3),
+            "z": round(z, 3),
+            "look_angle": round(look_angle, 2),
+        }
+        for section, tier, row, seat, x, y, z, look_angle in zip(
+            columns["section"], columns["tier"], columns["row"], columns["seat"],
+            columns["x"], columns["y"], columns["z"], columns["look_angle"],
+        )
+    ]
+
+
+def _dictionary_column(table: pa.Table, name: str):
+    """(indices, dictionary values) of a dictionary-encoded column."""
+    column = table.column(name).combine_chunks()
+    indices = column.indices.to_numpy(zero_copy_only=False)
+    return indices, column.dictionary.to_pylist()
+
+
+def seat_arrays_from_manifest(table: pa.Table) -> SeatArrays:
+    """
+    Rebuild SeatArrays from a manifest without going through dicts.
+
+    Relies on the manifest being laid out section by section, row by row,
+    as build_seat_manifest() writes it.
+    """
+    section_codes, section_ids = _dictionary_column(table, "section")
+    tier_codes, tiers = _dictionary_column(table, "tier")
+    row_codes, row_labels = _dictionary_column(table, "row")
+
+    row_numbers = np.array([row_number(label) for label in row_labels], dtype=np.int32)
+    row = row_numbers[row_codes] if len(row_codes) else np.empty(0, dtype=np.int32)
+    seat = table.column("seat").to_numpy().astype(np.int32)
+    section_idx = section_codes.astype(np.int32)
+
+    n_sections = len(section_ids)
+    counts = np.bincount(section_idx, minlength=n_sections)
+    offsets = np.zeros(n_sections + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    section_rows = np.zeros(n_sections, dtype=np.int64)
+    section_seats_per_row = np.zeros(n_sections, dtype=np.int64)
+    section_tier = np.zeros(n_sections, dtype=np.int16)
+    if len(section_idx):
+        np.maximum.at(section_rows, section_idx, row + 1)
+        np.maximum.at(section_seats_per_row, section_idx, seat)
+        present = counts > 0
+        section_tier[present] = tier_codes[offsets[:-1][present]]
+
+    return SeatArrays(
+        section_ids=section_ids,
+        tiers=tiers,
+        section_tier=section_tier,
+        section_rows=section_rows,
+        section_seats_per_row=section_seats_per_row,
+        section_offsets=offsets,
+        section_idx=section_idx,
+        tier_idx=tier_codes.astype(np.int16),
+        row=row,
+        seat=seat,
+        x=table.column("x").to_numpy(),
+        y=table.column("y").to_numpy(),
+        z=table.column("z").to_numpy(),
+        look_angle=table.column("look_angle").to_numpy(),
+    )
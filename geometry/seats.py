@@ -0,0 +1,302 @@
+"""
+Vectorized seat generation.
+
+Every physical seat in a venue (sections x rows x seats_per_row) is produced
+in a single NumPy broadcast pass and kept as contiguous arrays. Python dicts
+are only built for the handful of seats that leave the engine (API responses,
+render batches), never for the whole bowl.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Defaults for section definitions that don't carry every field
+# (sections stored in Supabase have no seats_per_row column)
+DEFAULT_SEATS_PER_ROW = 20
+DEFAULT_ROWS = 15
+SECTION_ARC = 15.0  # degrees per section
+
+# Metres of positional distance that one radian of view direction is worth.
+# Keeps seats on opposite sides of a narrow aisle from matching each other.
+LOOK_ANGLE_WEIGHT = 5.0
+
+
+def row_label(row_num: int) -> str:
+    """
+    Convert a 0-based row number to its ticket label.
+
+    0 -> "A", 25 -> "Z", 26 -> "AA", 27 -> "BB", ...
+    """
+    letter = chr(ord("A") + row_num % 26)
+    return letter * (row_num // 26 + 1)
+
+
+def row_number(label: str) -> int:
+    """Inverse of row_label(). Raises ValueError for malformed labels."""
+    if not label or not label.isalpha() or len(set(label.upper())) != 1:
+        raise ValueError(f"Invalid row label: {label!r}")
+    letter = label.upper()[0]
+    return (len(label) - 1) * 26 + (ord(letter) - ord("A"))
+
+
+def calculate_seat_positions(
+    section_angle,
+    tier_radius,
+    row_num,
+    seat_num,
+    seats_per_row,
+    row_depth,
+    row_rise,
+    base_height,
+    section_arc: float = SECTION_ARC,
+):
+    """
+    Calculate XYZ positions and look angles for many seats at once.
+
+    All arguments broadcast against each other, so scalars, per-section
+    arrays and per-seat arrays can be mixed freely. seat_num is 0-based.
+
+    Returns: (x, y, z, look_angle_degrees) as float64 arrays
+    """
+    row_num = np.asarray(row_num, dtype=np.float64)
+    seat_num = np.asarray(seat_num, dtype=np.float64)
+    seats_per_row = np.asarray(seats_per_row, dtype=np.float64)
+
+    current_radius = tier_radius + row_num * row_depth
+    current_height = base_height + row_num * row_rise
+
+    # Seats spread across the section arc (single-seat rows sit at the center)
+    span = np.maximum(seats_per_row - 1, 1)
+    seat_offset = np.where(seats_per_row > 1, (seat_num / span - 0.5) * section_arc, 0.0)
+
+    angle_rad = np.radians(section_angle + seat_offset)
+
+    # Arena is oriented with center at 0,0
+    # X = side to side, Y = toward/away from center, Z = height
+    x = current_radius * np.sin(angle_rad)
+    y = current_radius * np.cos(angle_rad)
+    z = np.broadcast_to(current_height, x.shape).astype(np.float64)
+
+    # Look angle points toward center (0, 0, 0)
+    look_angle = np.degrees(np.arctan2(-x, -y))
+
+    return x, y, z, look_angle
+
+
+def view_features(x, y, z, look_angle, angle_weight: float = LOOK_ANGLE_WEIGHT) -> np.ndarray:
+    """
+    Seat pose vectors: position plus the view direction as a weighted unit
+    vector (so -179 and 179 degrees are neighbours). Euclidean distance
+    between these is the "view error" between two seats.
+    """
+    theta = np.radians(np.asarray(look_angle, dtype=np.float64))
+    return np.column_stack([
+        np.asarray(x, dtype=np.float64),
+        np.asarray(y, dtype=np.float64),
+        np.asarray(z, dtype=np.float64),
+        angle_weight * np.cos(theta),
+        angle_weight * np.sin(theta),
+    ])
+
+
+@dataclass
+class SeatArrays:
+    """
+    Struct-of-arrays representation of every seat in a venue.
+
+    Seats are laid out contiguously by section, then row, then seat, so the
+    seats of section i occupy [section_offsets[i], section_offsets[i + 1]).
+    """
+    section_ids: List[str]          # section_idx -> section_id
+    tiers: List[str]                # tier_idx -> tier name
+    section_tier: np.ndarray        # per-section tier_idx
+    section_rows: np.ndarray        # per-section row count
+    section_seats_per_row: np.ndarray
+    section_offsets: np.ndarray     # len(section_ids) + 1 prefix sums
+
+    section_idx: np.ndarray         # per-seat arrays
+    tier_idx: np.ndarray
+    row: np.ndarray                 # 0-based row number
+    seat: np.ndarray                # 1-based seat number
+    x: np.ndarray
+    y: np.ndarray
+    z: np.ndarray
+    look_angle: np.ndarray
+
+    @cached_property
+    def index(self):
+        """Hierarchical tier -> section -> row index (built once, on first use)."""
+        from .index import SeatIndex
+        return SeatIndex(self)
+
+    def __len__(self) -> int:
+        return int(self.x.shape[0])
+
+    def seat_id(self, index: int) -> str:
+        """Build the public seat id (e.g. "101_A_12") for one seat."""
+        section_id = self.section_ids[self.section_idx[index]]
+        return f"{section_id}_{row_label(int(self.row[index]))}_{int(self.seat[index])}"
+
+    def locate(self, seat_id: str) -> Optional[int]:
+        """
+        Find the array index of a seat id in O(1), or None if it doesn't exist.
+
+        Section ids may contain underscores, so the id is split from the right.
+        """
+        parts = seat_id.rsplit("_", 2)
+        if len(parts) != 3:
+            return None
+        section_id, label, seat_str = parts
+        try:
+            row_num = row_number(label)
+            seat_num = int(seat_str)
+        except ValueError:
+            return None
+        return self.index.seat(section_id, row_num, seat_num)
+
+    def locate_many(self, seat_ids: Iterable[str]) -> np.ndarray:
+        """Indices of the given seat ids, silently skipping unknown ids."""
+        found = [self.locate(seat_id) for seat_id in seat_ids]
+        return np.array([i for i in found if i is not None], dtype=np.int64)
+
+    def to_dicts(self, indices: Optional[Sequence[int]] = None) -> List[dict]:
+        """
+        Convert seats to the dict format used by the API and render scripts.
+
+        Only call this at the edge, with the indices that actually leave the engine.
+        """
+        if indices is None:
+            indices = range(len(self))
+
+        seats = []
+        for i in indices:
+            i = int(i)
+            section_id = self.section_ids[self.section_idx[i]]
+            label = row_label(int(self.row[i]))
+            seat_num = int(self.seat[i])
+            seats.append({
+                "id": f"{section_id}_{label}_{seat_num}",
+                "section": section_id,
+                "row": label,
+                "seat": seat_num,
+                "tier": self.tiers[self.tier_idx[i]],
+                "x": round(float(self.x[i]), 3),
+                "y": round(float(self.y[i]), 3),
+                "z": round(float(self.z[i]), 3),
+                "look_angle": round(float(self.look_angle[i]), 2),
+            })
+        return seats
+
+    def tier_counts(self) -> Dict[str, int]:
+        """Number of seats per tier."""
+        counts = np.bincount(self.tier_idx, minlength=len(self.tiers))
+        return {tier: int(count) for tier, count in zip(self.tiers, counts)}
+
+
+def _count(value, default: int) -> int:
+    """A section's row/seat count; unset (None) means the default, 0 means none."""
+    return default if value is None else max(int(value), 0)
+
+
+def generate_seat_arrays(sections: Dict[str, dict], section_arc: float = SECTION_ARC) -> SeatArrays:
+    """
+    Generate every physical seat for a venue in one broadcast pass.
+
+    Args:
+        sections: Dictionary mapping section_id to section config
+        section_arc: Degrees of arc each section spans
+
+    Returns:
+        SeatArrays with one entry per seat
+    """
+    section_ids = list(sections.keys())
+    tiers: List[str] = []
+    tier_lookup: Dict[str, int] = {}
+
+    n_sections = len(section_ids)
+    angle = np.empty(n_sections)
+    inner_radius = np.empty(n_sections)
+    row_depth = np.empty(n_sections)
+    row_rise = np.empty(n_sections)
+    base_height = np.empty(n_sections)
+    rows = np.empty(n_sections, dtype=np.int64)
+    seats_per_row = np.empty(n_sections, dtype=np.int64)
+    section_tier = np.empty(n_sections, dtype=np.int16)
+
+    for i, section_id in enumerate(section_ids):
+        data = sections[section_id]
+        tier = data.get("tier", "lower")
+        if tier not in tier_lookup:
+            tier_lookup[tier] = len(tiers)
+            tiers.append(tier)
+        section_tier[i] = tier_lookup[tier]
+        angle[i] = data.get("angle", 0.0)
+        inner_radius[i] = data.get("inner_radius", 18.0)
+        row_depth[i] = data.get("row_depth", 0.85)
+        row_rise[i] = data.get("row_rise", 0.4)
+        base_height[i] = data.get("base_height", 2.0)
+        rows[i] = _count(data.get("rows"), DEFAULT_ROWS)
+        seats_per_row[i] = _count(data.get("seats_per_row"), DEFAULT_SEATS_PER_ROW)
+
+    per_section = rows * seats_per_row
+    offsets = np.zeros(n_sections + 1, dtype=np.int64)
+    np.cumsum(per_section, out=offsets[1:])
+    total = int(offsets[-1])
+
+    # Expand per-section parameters to per-seat arrays, then recover each
+    # seat's (row, seat) from its position inside the section block
+    section_idx = np.repeat(np.arange(n_sections, dtype=np.int32), per_section)
+    local = np.arange(total, dtype=np.int64) - offsets[section_idx]
+    spr = seats_per_row[section_idx]
+    row = (local // spr).astype(np.int32)
+    seat_num = (local % spr).astype(np.int32)
+
+    x, y, z, look_angle = calculate_seat_positions(
+        section_angle=angle[section_idx],
+        tier_radius=inner_radius[section_idx],
+        row_num=row,
+        seat_num=seat_num,
+        seats_per_row=spr,
+        row_depth=row_depth[section_idx],
+        row_rise=row_rise[section_idx],
+        base_height=base_height[section_idx],
+        section_arc=section_arc,
+    )
+
+    return SeatArrays(
+        section_ids=section_ids,
+        tiers=tiers,
+        section_tier=section_tier,
+        section_rows=rows,
+        section_seats_per_row=seats_per_row,
+        section_offsets=offsets,
+        section_idx=section_idx,
+        tier_idx=section_tier[section_idx],
+        row=row,
+        seat=seat_num + 1,
+        x=x,
+        y=y,
+        z=z,
+        look_angle=look_angle,
+    )
+
+
+def get_sample_seats(seats: SeatArrays) -> np.ndarray:
+    """
+    Indices of a representative sample: front, middle and back row center
+    seat of every section, in section order.
+    """
+    rows = seats.section_rows
+    sections = np.arange(len(seats.section_ids))
+    center = seats.section_seats_per_row // 2
+
+    # Columns: front, middle (only if > 2 rows), back (only if > 1 row)
+    sample_rows = np.stack([np.zeros_like(rows), rows // 2, rows - 1], axis=1)
+    keep = np.stack([rows > 0, rows > 2, rows > 1], axis=1)
+    keep &= (seats.section_seats_per_row > 0)[:, None]
+
+    starts = seats.index.row_starts(sections[:, None], sample_rows) + center[:, None]
+    return starts[keep].astype(np.int64)
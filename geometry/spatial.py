@@ -0,0 +1,87 @@
+"""
+Nearest rendered view lookup.
+
+Only a subset of seats get depth maps and final images. RenderedViewIndex
+holds a KD-tree over the rendered seats so any seat in the bowl can be
+answered with the closest rendered view in microseconds.
+"""
+
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .seats import LOOK_ANGLE_WEIGHT, SeatArrays, view_features
+
+
+@dataclass
+class NearestView:
+    """Result of a nearest rendered view query."""
+    seat_id: str
+    distance: float
+    payload: Any
+
+
+class RenderedViewIndex:
+    """
+    KD-tree over the seats that have a rendered view.
+
+    Args:
+        seats: Full venue seats (from the seat manifest)
+        rendered_ids: Seat ids that have a rendered view
+        payloads: Optional per-rendered-seat data returned with matches
+            (e.g. image rows); same order as rendered_ids
+    """
+
+    def __init__(
+        self,
+        seats: SeatArrays,
+        rendered_ids: Sequence[str],
+        payloads: Optional[Sequence[Any]] = None,
+        angle_weight: float = LOOK_ANGLE_WEIGHT,
+    ):
+        if payloads is None:
+            payloads = [None] * len(rendered_ids)
+
+        self.seats = seats
+        self.angle_weight = angle_weight
+
+        # Rendered ids that aren't in the manifest (stale rows) are dropped
+        indices: List[int] = []
+        self.seat_ids: List[str] = []
+        self.payloads: List[Any] = []
+        for seat_id, payload in zip(rendered_ids, payloads):
+            i = seats.locate(seat_id)
+            if i is not None:
+                indices.append(i)
+                self.seat_ids.append(seat_id)
+                self.payloads.append(payload)
+
+        idx = np.array(indices, dtype=np.int64)
+        self._tree = cKDTree(
+            view_features(seats.x[idx], seats.y[idx], seats.z[idx], seats.look_angle[idx], angle_weight)
+        ) if len(idx) else None
+
+    def __len__(self) -> int:
+        return len(self.seat_ids)
+
+    def nearest(self, seat_id: str) -> Optional[NearestView]:
+        """
+        Closest rendered view to a seat id, or None if the seat doesn't exist
+        in the venue or nothing has been rendered yet.
+        """
+        i = self.seats.locate(seat_id)
+        if i is None or self._tree is None:
+            return None
+
+        query = view_features(
+            self.seats.x[i:i + 1], self.seats.y[i:i + 1], self.seats.z[i:i + 1],
+            self.seats.look_angle[i:i + 1], self.angle_weight,
+        )[0]
+        distance, match = self._tree.query(query, k=1)
+        return NearestView(
+            seat_id=self.seat_ids[match],
+            distance=float(distance),
+            payload=self.payloads[match],
+        )
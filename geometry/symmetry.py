@@ -0,0 +1,256 @@
+"""
+Mirror-symmetry render planning.
+
+Every camera looks at the center of the bowl, and the bowl itself is
+rotationally symmetric, so two seats that are mirror images across a
+symmetry plane of the playing surface see mirror-image views: one depth map
+is the other flipped horizontally. Seats related by both planes (a 180
+degree turn around the center) see the identical view.
+
+plan_mirrored_renders() pairs such seats within a tolerance so only one of
+each group is rendered; expand_mirrored() produces the rest. Anchor selection
+uses mirror_partners() to pick whole mirror groups, so anchors actually have
+their partners in the render set.
+"""
+
+import io
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Max distance (metres) between a seat and the mirror image of another seat
+DEFAULT_MIRROR_TOLERANCE = 0.05
+
+# Mirror plane name -> (x sign, y sign, flip image)
+# "x" mirrors across the x = 0 plane, "y" across y = 0, "xy" is both (a
+# half turn about the vertical axis, which leaves the image unchanged)
+_TRANSFORMS = {
+    "x": (-1.0, 1.0, True),
+    "y": (1.0, -1.0, True),
+    "xy": (-1.0, -1.0, False),
+}
+
+
+def _is_zero(value) -> bool:
+    return abs(float(value)) < 1e-6
+
+
+def mirror_planes(config: Optional[dict]) -> List[str]:
+    """
+    Symmetry planes of a venue scene ("x", "y").
+
+    Takes the venue config VENUE_BUILD_SCRIPT builds from ('surface_config'
+    and optional 'landmarks': {'jumbotron': {'position', 'size'}}). The
+    surface, boards and field markings are symmetric about both axes; a stage
+    sits at one end (x = 0 plane only); a jumbotron keeps a plane only if it
+    is centered on it.
+    """
+    config = config or {}
+    surface_config = config.get("surface_config", {})
+    planes = {"x", "y"}
+
+    if surface_config.get("surface_type", "rink") == "stage":
+        planes.discard("y")
+
+    jumbotron = config.get("landmarks", {}).get("jumbotron")
+    if jumbotron:
+        x, y = jumbotron["position"][0], jumbotron["position"][1]
+        if not _is_zero(x):
+            planes.discard("x")
+        if not _is_zero(y):
+            planes.discard("y")
+
+    return sorted(planes)
+
+
+def _plane_transforms(planes: Sequence[str]) -> List[str]:
+    """_TRANSFORMS names available with the given planes (both give the half turn too)."""
+    transforms = [name for name in ("x", "y") if name in planes]
+    if len(transforms) == 2:
+        transforms.append("xy")
+    return transforms
+
+
+def mirror_partners(
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    planes: Sequence[str],
+    tolerance: float = DEFAULT_MIRROR_TOLERANCE,
+) -> np.ndarray:
+    """
+    A seat at the mirror image of every seat, under each transform of the planes.
+
+    Args:
+        x, y, z: Seat positions (e.g. SeatArrays.x/.y/.z)
+        planes: Symmetry planes from mirror_planes()
+        tolerance: Max distance between a seat and a mirrored position
+
+    Returns:
+        (N, T) int64 seat indices, -1 where no seat is within tolerance
+    """
+    points = np.column_stack([x, y, z]).astype(np.float64)
+    transforms = _plane_transforms(planes)
+    partners = np.full((len(points), len(transforms)), -1, dtype=np.int64)
+    if not len(points) or not transforms:
+        return partners
+
+    cells = np.round(points / tolerance).astype(np.int64)
+    tolerance_sq = tolerance * tolerance
+    grid: Optional[Dict[Tuple[int, int, int], List[int]]] = None
+    coords = points.tolist()
+
+    # Cells as scalar keys (mirroring only negates x/y, so the span covers both)
+    span = 2 * int(np.abs(cells).max()) + 3
+
+    def scalar_keys(c: np.ndarray) -> np.ndarray:
+        return ((c[:, 0] + span // 2) * span + (c[:, 1] + span // 2)) * span + (c[:, 2] + span // 2)
+
+    order = np.argsort(scalar_keys(cells), kind="stable")
+    sorted_keys = scalar_keys(cells)[order]
+
+    for t, name in enumerate(transforms):
+        sx, sy, _ = _TRANSFORMS[name]
+        mirrored = points * (sx, sy, 1.0)
+        mirrored_cells = np.round(mirrored / tolerance).astype(np.int64)
+
+        # Mirror images of generated seats almost always land in the cell of
+        # their partner: match those vectorized
+        keys = scalar_keys(mirrored_cells)
+        at = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+        candidate = order[at]
+        hit = (sorted_keys[at] == keys) & (
+            ((points[candidate] - mirrored) ** 2).sum(axis=1) <= tolerance_sq
+        )
+        partners[hit, t] = candidate[hit]
+
+        # The rest search the neighbouring cells
+        for i in np.flatnonzero(~hit).tolist():
+            if grid is None:
+                grid = {}
+                for j, key in enumerate(cells.tolist()):
+                    grid.setdefault(tuple(key), []).append(j)
+            mx, my, mz = mirrored[i].tolist()
+            cx, cy, cz = mirrored_cells[i].tolist()
+            best, best_d2 = -1, tolerance_sq
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for dz in (-1, 0, 1):
+                        for j in grid.get((cx + dx, cy + dy, cz + dz), ()):
+                            px, py, pz = coords[j]
+                            d2 = (px - mx) ** 2 + (py - my) ** 2 + (pz - mz) ** 2
+                            if d2 <= best_d2:
+                                best, best_d2 = j, d2
+            partners[i, t] = best
+
+    return partners
+
+
+@dataclass
+class MirrorPlan:
+    """
+    Which seats to render and which to derive.
+
+    Attributes:
+        render: Seats that need a real render
+        mirrors: source seat_id -> [(derived seat_id, flip)] produced from its depth map
+    """
+    render: List[dict] = field(default_factory=list)
+    mirrors: Dict[str, List[Tuple[str, bool]]] = field(default_factory=dict)
+
+    @property
+    def derived_count(self) -> int:
+        return sum(len(targets) for targets in self.mirrors.values())
+
+
+def plan_mirrored_renders(
+    seats: Sequence[dict],
+    planes: Sequence[str],
+    tolerance: float = DEFAULT_MIRROR_TOLERANCE,
+) -> MirrorPlan:
+    """
+    Group seats that are mirror images of each other.
+
+    Seats are bucketed on a tolerance-sized grid, so each lookup checks the
+    neighbouring cells only. Seats are claimed in order: the first seat of a
+    group is rendered and its mirror partners are derived from it.
+
+    Args:
+        seats: Seat dicts with id, x, y, z
+        planes: Symmetry planes from mirror_planes()
+        tolerance: Max distance between a seat and a mirrored position
+    """
+    transforms = _plane_transforms(planes)
+
+    def cell(x: float, y: float, z: float) -> Tuple[int, int, int]:
+        return (round(x / tolerance), round(y / tolerance), round(z / tolerance))
+
+    grid: Dict[Tuple[int, int, int], List[int]] = {}
+    for i, seat in enumerate(seats):
+        grid.setdefault(cell(seat["x"], seat["y"], seat["z"]), []).append(i)
+
+    def find(x: float, y: float, z: float, claimed: List[bool]) -> Optional[int]:
+        cx, cy, cz = cell(x, y, z)
+        best, best_d2 = None, tolerance * tolerance
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    for j in grid.get((cx + dx, cy + dy, cz + dz), ()):
+                        if claimed[j]:
+                            continue
+                        other = seats[j]
+                        d2 = (other["x"] - x) ** 2 + (other["y"] - y) ** 2 + (other["z"] - z) ** 2
+                        if d2 <= best_d2:
+                            best, best_d2 = j, d2
+        return best
+
+    plan = MirrorPlan()
+    claimed = [False] * len(seats)
+    for i, seat in enumerate(seats):
+        if claimed[i]:
+            continue
+        claimed[i] = True
+        plan.render.append(seat)
+
+        for name in transforms:
+            sx, sy, flip = _TRANSFORMS[name]
+            j = find(seat["x"] * sx, seat["y"] * sy, seat["z"], claimed)
+            if j is not None:
+                claimed[j] = True
+                plan.mirrors.setdefault(seat["id"], []).append((seats[j]["id"], flip))
+
+    return plan
+
+
+def flip_depth_png(png_bytes: bytes) -> bytes:
+    """Mirror a depth map PNG left to right."""
+    from PIL import Image, ImageOps
+
+    buffer = io.BytesIO()
+    ImageOps.mirror(Image.open(io.BytesIO(png_bytes))).save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def expand_mirrored(
+    depth_maps: Dict[str, bytes],
+    mirrors: Dict[str, Sequence[Tuple[str, bool]]],
+) -> Dict[str, bytes]:
+    """
+    Add derived seats' depth maps to rendered ones.
+
+    Args:
+        depth_maps: seat_id -> PNG bytes for rendered seats
+        mirrors: MirrorPlan.mirrors (or the subset for one batch)
+
+    Returns:
+        New dict with rendered and derived depth maps
+    """
+    expanded = dict(depth_maps)
+    for source_id, targets in mirrors.items():
+        png_bytes = depth_maps.get(source_id)
+        if png_bytes is None:
+            continue
+        for target_id, flip in targets:
+            expanded[target_id] = flip_depth_png(png_bytes) if flip else png_bytes
+    return expanded
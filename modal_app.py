@@ -37,8 +37,11 @@ web_image = (
         "httpx>=0.25.0",
         "temporalio>=1.7.0",
         "modal",  # Required for Function.lookup() to call other Modal functions
+        "numpy",
+        "pyarrow",
+        "scipy",  # KD-tree for nearest rendered view lookups
     )
-    .add_local_python_source("api", "temporal", copy=True)
+    .add_local_python_source("api", "temporal", "geometry", "blobs", copy=True)
 )
 
 # Blender image with Python packages
@@ -254,128 +257,46 @@ def extract_sections_from_seatmap(seatmap_url: str) -> dict:
     }
 
 
-# ============== SEAT GENERATION (Pure Python) ==============
+# ============== SEAT GENERATION (NumPy) ==============
 
-@app.function(image=modal.Image.debian_slim(python_version="3.11"))
-def generate_seats(sections: Dict[str, dict]) -> Tuple[List[dict], List[dict], List[dict]]:
+# Seat engine image - the geometry package is shared with scripts/ and the API
+seats_image = (
+    modal.Image.debian_slim(python_version="3.11")
+    .pip_install("numpy", "pyarrow")
+    .add_local_python_source("geometry", copy=True)
+)
+
+
+@app.function(image=seats_image)
+def generate_seats(
+    sections: Dict[str, dict],
+    custom_seats: Optional[List[str]] = None,
+) -> dict:
     """
-    Generate seat coordinates from section definitions.
-    Returns: (all_seats, sample_seats, anchor_seats)
+    Generate every seat in the bowl from section definitions.
+
+    The full bowl stays in NumPy arrays inside this function; only the seats
+    that leave it are converted to dicts. Anchor seats are picked with the
+    seat manifest (save_seat_manifest_activity), which keeps the previous
+    run's anchors in unchanged sections.
+
+    Returns: {
+        "total_seats": int,
+        "tier_counts": {tier: count},
+        "sample_seats": [...],   # front/middle/back center seat per section
+        "custom_seats": [...],   # requested seat ids that exist
+    }
     """
+    from geometry import generate_seat_arrays, get_sample_seats
 
-    def angle_to_radians(degrees: float) -> float:
-        return degrees * math.pi / 180
-
-    def calculate_seat_position(
-        section_angle: float,
-        tier_radius: float,
-        row_num: int,
-        seat_num: int,
-        seats_per_row: int,
-        row_depth: float,
-        row_rise: float,
-        base_height: float,
-        section_arc: float = 15.0
-    ) -> Tuple[float, float, float, float]:
-        current_radius = tier_radius + (row_num * row_depth)
-        current_height = base_height + (row_num * row_rise)
-
-        if seats_per_row > 1:
-            seat_offset = (seat_num / (seats_per_row - 1) - 0.5) * section_arc
-        else:
-            seat_offset = 0
-
-        total_angle = section_angle + seat_offset
-        angle_rad = angle_to_radians(total_angle)
-
-        x = current_radius * math.sin(angle_rad)
-        y = current_radius * math.cos(angle_rad)
-        z = current_height
-
-        look_angle = math.degrees(math.atan2(-x, -y))
-
-        return (round(x, 3), round(y, 3), round(z, 3), round(look_angle, 2))
-
-    def generate_seats_for_section(section_data: dict) -> List[dict]:
-        """Generate 3 representative seats per section: Front, Middle, Back."""
-        seats = []
-        section_id = section_data["section_id"]
-        section_angle = section_data["angle"]
-        tier = section_data["tier"]
-        inner_radius = section_data["inner_radius"]
-        rows = section_data["rows"]  # Actual row count for position calculation
-        row_depth = section_data["row_depth"]
-        row_rise = section_data["row_rise"]
-        base_height = section_data["base_height"]
-
-        # Generate 3 strategic positions: Front, Middle, Back
-        positions = [
-            ("Front", 0),           # First row
-            ("Middle", rows // 2),  # Middle row
-            ("Back", rows - 1)      # Last row
-        ]
+    seats = generate_seat_arrays(sections)
 
-        for row_label, row_num in positions:
-            x, y, z, look_angle = calculate_seat_position(
-                section_angle, inner_radius, row_num, 0, 1, row_depth, row_rise, base_height
-            )
-            seats.append({
-                "id": f"{section_id}_{row_label}_1",
-                "section": section_id, "row": row_label, "seat": 1,
-                "tier": tier, "x": x, "y": y, "z": z, "look_angle": look_angle
-            })
-        return seats
-
-    # Generate all seats
-    all_seats = []
-    for section_id, section_data in sections.items():
-        all_seats.extend(generate_seats_for_section(section_data))
-
-    # Sample seats
-    sample_seats = []
-    sections_by_id = {}
-    for seat in all_seats:
-        sections_by_id.setdefault(seat["section"], []).append(seat)
-
-    for section_id, section_seats in sections_by_id.items():
-        rows = sorted(set(s["row"] for s in section_seats))
-        sample_rows = [rows[0]]
-        if len(rows) > 2:
-            sample_rows.append(rows[len(rows) // 2])
-        if len(rows) > 1:
-            sample_rows.append(rows[-1])
-
-        for row in sample_rows:
-            row_seats = [s for s in section_seats if s["row"] == row]
-            if row_seats:
-                sample_seats.append(row_seats[len(row_seats) // 2])
-
-    # Anchor seats (minimal set)
-    anchor_seats = []
-    tiers = {"lower": [], "mid": [], "upper": []}
-    for seat in all_seats:
-        tiers[seat["tier"]].append(seat)
-
-    for tier, tier_seats in tiers.items():
-        tier_sections = sorted(set(s["section"] for s in tier_seats))
-        if len(tier_sections) >= 3:
-            sample_sections = [tier_sections[0], tier_sections[len(tier_sections)//2], tier_sections[-1]]
-        else:
-            sample_sections = tier_sections
-
-        for section in sample_sections:
-            section_seats = [s for s in tier_seats if s["section"] == section]
-            rows = sorted(set(s["row"] for s in section_seats))
-            if rows:
-                front_row = [s for s in section_seats if s["row"] == rows[0]]
-                if front_row:
-                    anchor_seats.append(front_row[len(front_row)//2])
-                if len(rows) > 1:
-                    back_row = [s for s in section_seats if s["row"] == rows[-1]]
-                    if back_row:
-                        anchor_seats.append(back_row[len(back_row)//2])
-
-    return all_seats, sample_seats, anchor_seats
+    return {
+        "total_seats": len(seats),
+        "tier_counts": seats.tier_counts(),
+        "sample_seats": seats.to_dicts(get_sample_seats(seats)),
+        "custom_seats": seats.to_dicts(seats.locate_many(custom_seats or [])),
+    }
 
 
 # ============== BLENDER VENUE BUILDING ==============
@@ -678,154 +599,50 @@ def build_venue_model(config: dict, sections: dict) -> dict:
 
 # ============== DEPTH MAP RENDERING ==============
 
-RENDER_DEPTH_SCRIPT = '''
-import bpy
-import json
-import sys
-from mathutils import Vector
-
-EYE_HEIGHT = 1.2
-LOOK_AT = Vector((0, 0, 0))
-
-def setup_render():
-    scene = bpy.context.scene
-    # Blender 4.x uses BLENDER_EEVEE_NEXT
-    scene.render.engine = 'BLENDER_EEVEE_NEXT'
-    scene.render.resolution_x = 1024
-    scene.render.resolution_y = 768
-    scene.render.resolution_percentage = 100
-    scene.render.image_settings.file_format = 'PNG'
-    scene.render.image_settings.color_mode = 'RGB'
-
-def create_depth_material():
-    mat_name = "DepthViz"
-    if mat_name in bpy.data.materials:
-        bpy.data.materials.remove(bpy.data.materials[mat_name])
-
-    mat = bpy.data.materials.new(name=mat_name)
-    mat.use_nodes = True
-    nodes = mat.node_tree.nodes
-    links = mat.node_tree.links
-    nodes.clear()
-
-    cam_data = nodes.new('ShaderNodeCameraData')
-    cam_data.location = (-600, 0)
-
-    divide = nodes.new('ShaderNodeMath')
-    divide.operation = 'DIVIDE'
-    divide.location = (-400, 0)
-    divide.inputs[1].default_value = 100.0
-
-    subtract = nodes.new('ShaderNodeMath')
-    subtract.operation = 'SUBTRACT'
-    subtract.location = (-200, 0)
-    subtract.inputs[0].default_value = 1.0
-
-    clamp = nodes.new('ShaderNodeClamp')
-    clamp.location = (0, 0)
-
-    emission = nodes.new('ShaderNodeEmission')
-    emission.location = (200, 0)
-    emission.inputs['Strength'].default_value = 1.0
-
-    output = nodes.new('ShaderNodeOutputMaterial')
-    output.location = (400, 0)
-
-    links.new(cam_data.outputs['View Z Depth'], divide.inputs[0])
-    links.new(divide.outputs[0], subtract.inputs[1])
-    links.new(subtract.outputs[0], clamp.inputs[0])
-    links.new(clamp.outputs[0], emission.inputs['Color'])
-    links.new(emission.outputs[0], output.inputs['Surface'])
-    return mat
-
-def apply_depth_material():
-    depth_mat = create_depth_material()
-    for obj in bpy.data.objects:
-        if obj.type == 'MESH':
-            obj.data.materials.clear()
-            obj.data.materials.append(depth_mat)
-
-def setup_camera():
-    camera = bpy.data.objects.get('SeatCamera')
-    if camera is None:
-        bpy.ops.object.camera_add()
-        camera = bpy.context.active_object
-        camera.name = 'SeatCamera'
-    camera.data.lens = 18
-    camera.data.clip_start = 0.1
-    camera.data.clip_end = 200
-    bpy.context.scene.camera = camera
-    return camera
-
-def render_seat(camera, seat, output_path):
-    x, y, z = seat["x"], seat["y"], seat["z"]
-    camera.location = Vector((x, y, z + EYE_HEIGHT))
-    direction = LOOK_AT - camera.location
-    camera.rotation_euler = direction.to_track_quat('-Z', 'Y').to_euler()
-
-    bpy.context.scene.render.filepath = output_path
-    bpy.ops.render.render(write_still=True)
+# Depth maps are rendered by the persistent Blender render server
+# (scripts/blender_render_server.py, shared with scripts/04_render_depths.py).
+# One Blender process per container loads each .blend once, keeps it warm
+# keyed by content hash and streams PNGs back as seats finish.
+render_server_image = blender_image.add_local_file(
+    "scripts/blender_render_server.py", "/root/blender_render_server.py"
+)
 
-# Load blend file and seats
-blend_path = sys.argv[-2]
-seats_json = sys.argv[-1]
+_render_server = None
 
-bpy.ops.wm.open_mainfile(filepath=blend_path)
 
-seats = json.loads(seats_json)
-setup_render()
-apply_depth_material()
-camera = setup_camera()
+def _get_render_server():
+    """Container-wide render server, (re)started on first use or after a crash."""
+    global _render_server
+    import sys
 
-results = []
-for i, seat in enumerate(seats):
-    output_path = f"/tmp/depth_{seat['id']}.png"
-    render_seat(camera, seat, output_path)
-    results.append({"id": seat["id"], "path": output_path})
-    print(f"RENDERED: {seat['id']}")
+    if "/root" not in sys.path:
+        sys.path.insert(0, "/root")
+    from blender_render_server import BlenderRenderServer
 
-print(f"SUCCESS: Rendered {len(seats)} depth maps")
-'''
+    if _render_server is None or not _render_server.alive:
+        _render_server = BlenderRenderServer()
+    return _render_server
 
 
-@app.function(image=blender_image, timeout=600)
-def render_depth_maps(blend_file_bytes: bytes, seats: List[dict]) -> Dict[str, bytes]:
+@app.function(image=render_server_image, timeout=600, scaledown_window=600)
+def render_depth_maps(blend_file_bytes: bytes, seats: List[dict], animated: bool = True) -> Dict[str, bytes]:
     """
     Render depth maps for given seats.
+    With animated=True the batch is one animation render (one seat per frame).
     Returns dict mapping seat_id -> PNG bytes.
     """
-    import subprocess
-
-    # Save blend file
-    blend_path = "/tmp/venue_model.blend"
-    with open(blend_path, "wb") as f:
-        f.write(blend_file_bytes)
-
-    # Write render script
-    script_path = "/tmp/render_script.py"
-    with open(script_path, "w") as f:
-        f.write(RENDER_DEPTH_SCRIPT)
-
-    # Run Blender
-    cmd = [
-        "blender", "--background", "--python", script_path,
-        "--", blend_path, json.dumps(seats)
-    ]
+    server = _get_render_server()
+    warm = server.load_bytes(blend_file_bytes)
+    print(f"Scene {server.loaded_hash} ({'warm' if warm else 'loaded'}), rendering {len(seats)} seats")
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if "SUCCESS" not in result.stdout:
-        raise RuntimeError(f"Blender render failed: {result.stderr}\n{result.stdout}")
-
-    # Collect rendered images
     depth_maps = {}
-    for seat in seats:
-        png_path = f"/tmp/depth_{seat['id']}.png"
-        try:
-            with open(png_path, "rb") as f:
-                depth_maps[seat["id"]] = f.read()
-        except FileNotFoundError:
-            print(f"Warning: Depth map not found for {seat['id']}")
+    for seat_id, png_bytes in server.render(seats, animated=animated):
+        depth_maps[seat_id] = png_bytes
+        print(f"RENDERED: {seat_id}")
+
+    missing = [seat["id"] for seat in seats if seat["id"] not in depth_maps]
+    if missing:
+        print(f"Warning: Depth maps not rendered for {missing}")
 
     return depth_maps
 
@@ -1125,8 +942,10 @@ temporal_worker_image = (
         "requests",
         "httpx",
         "supabase>=2.0.0",
+        "numpy",
+        "pyarrow",
     )
-    .add_local_python_source("temporal", copy=True)
+    .add_local_python_source("temporal", "geometry", "blobs", copy=True)
 )
 
 @app.function(
@@ -1149,25 +968,10 @@ async def temporal_worker():
     import os
     import asyncio
     from temporalio.client import Client
-    from temporalio.worker import Worker
-
-    # Import the workflow and activities from our temporal package
-    from temporal.workflows.venue_pipeline import VenuePipelineWorkflow
-    from temporal.activities.modal_activities import (
-        generate_seats_activity,
-        build_venue_model_activity,
-        render_depth_maps_activity,
-        generate_ai_image_activity,
-    )
-    from temporal.activities.storage_activities import (
-        save_seats_json_activity,
-        save_blend_file_activity,
-        save_depth_maps_activity,
-        save_generated_images_activity,
-        load_existing_images_activity,
-        load_existing_blend_activity,
-        load_existing_depth_maps_activity,
-    )
+
+    # Worker pools (one task queue per resource class) from our temporal package
+    from temporal.client import ensure_rate_limiter
+    from temporal.worker import WORKER_POOLS, create_workers, start_artifact_pruning
 
     # Get Temporal credentials from secrets
     namespace = os.environ.get("TEMPORAL_NAMESPACE")
@@ -1188,37 +992,31 @@ async def temporal_worker():
 
     print(f"Connected to Temporal namespace: {client.namespace}")
 
-    # Create and run worker with the proper workflow and activities
-    worker = Worker(
-        client,
-        task_queue="venue-pipeline-queue",
-        workflows=[VenuePipelineWorkflow],
-        activities=[
-            # Modal compute activities
-            generate_seats_activity,
-            build_venue_model_activity,
-            render_depth_maps_activity,
-            generate_ai_image_activity,
-            # Storage activities
-            save_seats_json_activity,
-            save_blend_file_activity,
-            save_depth_maps_activity,
-            save_generated_images_activity,
-            load_existing_images_activity,
-            load_existing_blend_activity,
-            load_existing_depth_maps_activity,
-        ],
-    )
+    # Every pool by default; TEMPORAL_WORKER_POOLS (e.g. "generation") runs a subset
+    pools = [p for p in os.environ.get("TEMPORAL_WORKER_POOLS", ",".join(WORKER_POOLS)).split(",") if p]
+    workers = create_workers(client, pools)
+
+    # Shared rate limiter for AI generation across all pipelines
+    await ensure_rate_limiter(client)
+
+    for name in pools:
+        pool = WORKER_POOLS[name]
+        print(
+            f"Starting pool {name} on task queue {pool.task_queue}: "
+            f"{len(pool.workflows)} workflows, {len(pool.activities)} activities"
+        )
 
-    print("Starting Temporal worker on task queue: venue-pipeline-queue")
-    print(f"Registered workflow: VenuePipelineWorkflow")
-    print(f"Registered {11} activities")
+    # Expired activity artifacts, if this worker runs the storage pool
+    pruning = start_artifact_pruning(pools)
 
     # Run for 23 hours (Modal will restart after 24h timeout)
     try:
-        await asyncio.wait_for(worker.run(), timeout=82800)
+        await asyncio.wait_for(asyncio.gather(*(worker.run() for worker in workers)), timeout=82800)
     except asyncio.TimeoutError:
         print("Worker timeout - will be restarted by Modal")
+    finally:
+        if pruning is not None:
+            pruning.cancel()
 
 
 # ============== CLI ENTRY POINT ==============
@@ -1257,8 +1055,9 @@ def main():
 
     # Test seat generation
     print("\n1. Testing seat generation...")
-    all_seats, sample_seats, anchor_seats = generate_seats.remote(test_sections)
-    print(f"   Generated {len(all_seats)} seats, {len(anchor_seats)} anchors")
+    seat_result = generate_seats.remote(test_sections)
+    sample_seats = seat_result["sample_seats"]
+    print(f"   Generated {seat_result['total_seats']} seats, {len(sample_seats)} sample seats")
 
     # Test venue building
     print("\n2. Testing venue model building...")
@@ -1267,7 +1066,7 @@ def main():
 
     # Test depth rendering
     print("\n3. Testing depth map rendering...")
-    test_seats = anchor_seats[:2]  # Just test 2 seats
+    test_seats = sample_seats[:2]  # Just test 2 seats
     depth_maps = render_depth_maps.remote(blend_bytes, test_seats)
     print(f"   Rendered {len(depth_maps)} depth maps")
 
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+benchmark_activity_overlap.py
+
+Show whether N concurrent async activities actually overlap on one worker
+event loop. An async activity that calls a blocking function (the old
+modal .remote()) serializes everything the worker does; one that awaits
+(.remote.aio()) lets the calls run side by side.
+
+Runs activities through temporalio.testing.ActivityEnvironment, so no
+Temporal server is needed.
+
+Usage:
+    python scripts/benchmark_activity_overlap.py                 # simulated Modal calls
+    python scripts/benchmark_activity_overlap.py -n 32 --delay 0.5
+    python scripts/benchmark_activity_overlap.py --modal -n 8    # real generate_seats_activity (deployed app)
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from temporalio import activity  # noqa: E402
+from temporalio.testing import ActivityEnvironment  # noqa: E402
+
+
+@activity.defn
+async def blocking_call_activity(delay: float) -> float:
+    """Stands in for an async activity calling the synchronous modal .remote()."""
+    time.sleep(delay)
+    return delay
+
+
+@activity.defn
+async def awaiting_call_activity(delay: float) -> float:
+    """Stands in for an async activity awaiting modal .remote.aio()."""
+    await asyncio.sleep(delay)
+    return delay
+
+
+async def run_concurrently(fn, args, n: int) -> float:
+    """Wall seconds for n concurrent fn(*args) activities."""
+    start = time.perf_counter()
+    await asyncio.gather(*(ActivityEnvironment().run(fn, *args) for _ in range(n)))
+    return time.perf_counter() - start
+
+
+async def benchmark(label: str, fn, args, n: int):
+    # One call alone, then n at once. Overlap 1.0x = fully serialized, nx = all overlapped
+    single = await run_concurrently(fn, args, 1)
+    wall = await run_concurrently(fn, args, n)
+    overlap = n * single / wall if wall else 0.0
+    print(f"  {label:<26} 1 call {single:6.2f}s   {n} calls {wall:7.2f}s   overlap {overlap:5.1f}x")
+
+
+def demo_sections(count: int = 4) -> dict:
+    return {
+        str(100 + i): {
+            "section_id": str(100 + i),
+            "tier": "lower",
+            "angle": i * (360.0 / count),
+            "inner_radius": 12.0,
+            "rows": 10,
+            "seats_per_row": 12,
+            "row_depth": 0.85,
+            "row_rise": 0.4,
+            "base_height": 0.0,
+        }
+        for i in range(count)
+    }
+
+
+async def main_async(args):
+    print(f"{args.n} concurrent activities")
+
+    if args.modal:
+        from temporal.activities.modal_activities import generate_seats_activity
+
+        await benchmark("generate_seats_activity", generate_seats_activity, (demo_sections(),), args.n)
+        return
+
+    await benchmark("blocking .remote()", blocking_call_activity, (args.delay,), args.n)
+    await benchmark("awaiting .remote.aio()", awaiting_call_activity, (args.delay,), args.n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark overlap of concurrent async activities")
+    parser.add_argument("-n", type=int, default=16, help="Number of concurrent activities")
+    parser.add_argument("--delay", type=float, default=0.25, help="Simulated Modal call duration (seconds)")
+    parser.add_argument("--modal", action="store_true",
+                        help="Call the deployed Modal app through generate_seats_activity")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+benchmark_seat_index.py
+
+Compare the old dict/list seat selection against the array index
+(geometry.SeatIndex) on a synthetic 100k-seat venue.
+
+Usage:
+    python scripts/benchmark_seat_index.py
+    python scripts/benchmark_seat_index.py --seats 250000 --custom 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from geometry import SeatIndex, generate_seat_arrays, get_sample_seats  # noqa: E402
+
+TIERS = ["floor", "lower", "club", "mid", "upper"]
+
+
+def make_sections(total_seats: int, rows: int = 40, seats_per_row: int = 25) -> dict:
+    """Synthetic bowl with enough sections to reach total_seats."""
+    n_sections = max(total_seats // (rows * seats_per_row), 1)
+    sections = {}
+    for i in range(n_sections):
+        tier = TIERS[i % len(TIERS)]
+        section_id = f"{(TIERS.index(tier) + 1) * 100 + i // len(TIERS)}"
+        sections[section_id] = {
+            "section_id": section_id,
+            "tier": tier,
+            "angle": (360.0 / n_sections) * i,
+            "inner_radius": 10.0 + TIERS.index(tier) * 8.0,
+            "rows": rows,
+            "seats_per_row": seats_per_row,
+            "row_depth": 0.85,
+            "row_rise": 0.4,
+            "base_height": TIERS.index(tier) * 4.0,
+        }
+    return sections
+
+
+def legacy_sample_seats(all_seats: list) -> list:
+    """The per-section list rescans the pipeline used before the index."""
+    sample_seats = []
+    sections_by_id = {}
+    for seat in all_seats:
+        sections_by_id.setdefault(seat["section"], []).append(seat)
+
+    for section_seats in sections_by_id.values():
+        rows = sorted(set(s["row"] for s in section_seats))
+        sample_rows = [rows[0]]
+        if len(rows) > 2:
+            sample_rows.append(rows[len(rows) // 2])
+        if len(rows) > 1:
+            sample_rows.append(rows[-1])
+
+        for row in sample_rows:
+            row_seats = [s for s in section_seats if s["row"] == row]
+            if row_seats:
+                sample_seats.append(row_seats[len(row_seats) // 2])
+    return sample_seats
+
+
+def legacy_custom_seats(all_seats: list, custom_ids: list) -> list:
+    """Workflow-style filter: scan every seat for membership in the custom list."""
+    return [s for s in all_seats if s.get("id") in custom_ids]
+
+
+def timed(fn, *args, repeat: int = 3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark seat selection at stadium scale")
+    parser.add_argument("--seats", type=int, default=100_000, help="Approximate number of seats")
+    parser.add_argument("--custom", type=int, default=1000, help="Number of custom seat ids to resolve")
+    args = parser.parse_args()
+
+    sections = make_sections(args.seats)
+
+    gen_time, seats = timed(generate_seat_arrays, sections)
+    index_time, _ = timed(SeatIndex, seats)
+    print(f"Venue: {len(sections)} sections, {len(seats)} seats")
+    print(f"  generate_seat_arrays: {gen_time * 1000:9.2f} ms")
+    print(f"  build SeatIndex:      {index_time * 1000:9.2f} ms")
+
+    all_seats = seats.to_dicts()
+    rng = random.Random(0)
+    custom_ids = [seats.seat_id(rng.randrange(len(seats))) for _ in range(args.custom)]
+
+    print("\nSample seats (front/middle/back per section):")
+    legacy_time, legacy = timed(legacy_sample_seats, all_seats, repeat=1)
+    index_time, indexed = timed(get_sample_seats, seats)
+    # Counts only: the legacy version sorted row labels as strings ("AA" < "B"),
+    # so past row Z its middle/back picks were wrong
+    assert len(legacy) == len(indexed)
+    print(f"  legacy dict scan:     {legacy_time * 1000:9.2f} ms")
+    print(f"  SeatIndex:            {index_time * 1000:9.2f} ms  ({legacy_time / index_time:,.0f}x)")
+
+    print(f"\nCustom seats ({args.custom} ids):")
+    legacy_time, legacy = timed(legacy_custom_seats, all_seats, custom_ids, repeat=1)
+    index_time, indexed = timed(seats.locate_many, custom_ids)
+    assert {s["id"] for s in legacy} == {seats.seat_id(i) for i in indexed}
+    print(f"  legacy list scan:     {legacy_time * 1000:9.2f} ms")
+    print(f"  SeatIndex:            {index_time * 1000:9.2f} ms  ({legacy_time / index_time:,.0f}x)")
+
+    print("\nTier / section / row lookups:")
+    tier_time, _ = timed(lambda: [seats.index.tier_seats(t) for t in seats.tiers])
+    row_time, _ = timed(lambda: [seats.index.row_slice(s, 10) for s in seats.section_ids])
+    print(f"  all tier slices:      {tier_time * 1e6:9.2f} us")
+    print(f"  one row per section:  {row_time * 1e6:9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
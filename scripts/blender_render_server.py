@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+blender_render_server.py
+
+Persistent Blender depth-map render server.
+
+One Blender process is started once and fed JSON commands over stdin. It
+loads a .blend once, keeps it warm keyed by content hash (depth material and
+SeatCamera already applied), and reports each depth map on stdout as soon as
+it is written, so batches don't pay Blender startup, file load and
+apply_depth_material again.
+
+Inside Blender (server side):
+    blender --background --python blender_render_server.py -- --serve
+
+From Python (client side):
+    with BlenderRenderServer() as server:
+        server.load("venue.blend")
+        for seat_id, png_bytes in server.render(seats):
+            ...
+
+Protocol - one JSON object per line:
+    stdin   {"cmd": "load", "path": ..., "hash": ...}
+            {"cmd": "render", "seats": [...], "output_dir": ..., "animated": true}
+            {"cmd": "shutdown"}
+    stdout  MESSAGE_PREFIX + {"event": "ready" | "loaded" | "rendered" | "failed" | "done" | "error", ...}
+
+Blender's own log output goes to stdout too; only lines starting with
+MESSAGE_PREFIX belong to the protocol.
+
+render_parallel() shards a seat list across several servers (one Blender
+process each) for local multi-core renders.
+"""
+
+import hashlib
+import json
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# Blender imports (only available when run inside Blender)
+try:
+    import bpy
+    import mathutils
+    BLENDER_AVAILABLE = True
+except ImportError:
+    BLENDER_AVAILABLE = False
+
+MESSAGE_PREFIX = "@@render-server "
+EYE_HEIGHT = 1.2
+WORK_DIR = Path(tempfile.gettempdir()) / "render_server"
+
+
+def blend_hash(blend_bytes: bytes) -> str:
+    """Content hash identifying a loaded scene."""
+    return hashlib.sha256(blend_bytes).hexdigest()[:16]
+
+
+# ============== BLENDER SIDE ==============
+
+def setup_render_settings():
+    scene = bpy.context.scene
+    # Blender 4.2-4.x names EEVEE 'BLENDER_EEVEE_NEXT'; 5.0 renamed it back
+    try:
+        scene.render.engine = 'BLENDER_EEVEE_NEXT'
+    except TypeError:
+        scene.render.engine = 'BLENDER_EEVEE'
+    scene.render.resolution_x = 1024
+    scene.render.resolution_y = 768
+    scene.render.resolution_percentage = 100
+    scene.render.image_settings.file_format = 'PNG'
+    scene.render.image_settings.color_mode = 'RGB'
+    scene.render.film_transparent = False
+
+
+def create_depth_material():
+    mat_name = "DepthVisualization"
+    if mat_name in bpy.data.materials:
+        bpy.data.materials.remove(bpy.data.materials[mat_name])
+
+    mat = bpy.data.materials.new(name=mat_name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    nodes.clear()
+
+    cam_data = nodes.new('ShaderNodeCameraData')
+    cam_data.location = (-600, 0)
+
+    divide = nodes.new('ShaderNodeMath')
+    divide.operation = 'DIVIDE'
+    divide.location = (-400, 0)
+    divide.inputs[1].default_value = 100.0
+
+    subtract = nodes.new('ShaderNodeMath')
+    subtract.operation = 'SUBTRACT'
+    subtract.location = (-200, 0)
+    subtract.inputs[0].default_value = 1.0
+
+    clamp = nodes.new('ShaderNodeClamp')
+    clamp.location = (0, 0)
+
+    emission = nodes.new('ShaderNodeEmission')
+    emission.location = (200, 0)
+    emission.inputs['Strength'].default_value = 1.0
+
+    output = nodes.new('ShaderNodeOutputMaterial')
+    output.location = (400, 0)
+
+    links.new(cam_data.outputs['View Z Depth'], divide.inputs[0])
+    links.new(divide.outputs[0], subtract.inputs[1])
+    links.new(subtract.outputs[0], clamp.inputs[0])
+    links.new(clamp.outputs[0], emission.inputs['Color'])
+    links.new(emission.outputs[0], output.inputs['Surface'])
+    return mat
+
+
+def apply_depth_material():
+    depth_mat = create_depth_material()
+    for obj in bpy.data.objects:
+        if obj.type == 'MESH':
+            obj.data.materials.clear()
+            obj.data.materials.append(depth_mat)
+    print("Applied depth material to all meshes")
+
+
+def setup_camera():
+    camera = bpy.data.objects.get('SeatCamera')
+    if camera is None:
+        bpy.ops.object.camera_add()
+        camera = bpy.context.active_object
+        camera.name = 'SeatCamera'
+    camera.data.lens = 18
+    camera.data.clip_start = 0.1
+    camera.data.clip_end = 200
+    bpy.context.scene.camera = camera
+    return camera
+
+
+def prepare_scene():
+    """Render settings, depth material and camera for the open .blend."""
+    setup_render_settings()
+    apply_depth_material()
+    return setup_camera()
+
+
+def render_seat(camera, seat, output_path):
+    x, y, z = seat["x"], seat["y"], seat["z"]
+    camera.location = mathutils.Vector((x, y, z + EYE_HEIGHT))
+    direction = mathutils.Vector((0, 0, 0)) - camera.location
+    camera.rotation_euler = direction.to_track_quat('-Z', 'Y').to_euler()
+
+    bpy.context.scene.render.filepath = str(output_path)
+    bpy.ops.render.render(write_still=True)
+
+
+def render_seats_animated(camera, seats, output_dir, on_rendered=None):
+    """
+    Render a batch as one animation: seat i is keyed as frame i + 1 on
+    SeatCamera, so render setup is paid once per batch instead of per seat.
+    Each frame is renamed to {seat_id}_depth.png as soon as it is written.
+
+    Args:
+        on_rendered: Optional callback(seat_id, output_path) per finished frame
+    """
+    if not seats:
+        return
+    scene = bpy.context.scene
+    output_dir = Path(output_dir)
+
+    # Constant keys: every frame is exactly one seat's pose
+    camera.animation_data_clear()
+    edit_prefs = bpy.context.preferences.edit
+    previous_interpolation = edit_prefs.keyframe_new_interpolation_type
+    edit_prefs.keyframe_new_interpolation_type = 'CONSTANT'
+    try:
+        for frame, seat in enumerate(seats, start=1):
+            x, y, z = seat["x"], seat["y"], seat["z"]
+            camera.location = mathutils.Vector((x, y, z + EYE_HEIGHT))
+            direction = mathutils.Vector((0, 0, 0)) - camera.location
+            camera.rotation_euler = direction.to_track_quat('-Z', 'Y').to_euler()
+            camera.keyframe_insert(data_path="location", frame=frame)
+            camera.keyframe_insert(data_path="rotation_euler", frame=frame)
+    finally:
+        edit_prefs.keyframe_new_interpolation_type = previous_interpolation
+
+    scene.frame_start = 1
+    scene.frame_end = len(seats)
+    scene.render.filepath = str(output_dir / "frame_")
+    scene.render.use_file_extension = True
+
+    def frame_written(scene, *args):
+        frame = scene.frame_current
+        if not 1 <= frame <= len(seats):
+            return
+        seat_id = seats[frame - 1]["id"]
+        output_path = output_dir / f"{seat_id}_depth.png"
+        Path(scene.render.frame_path(frame=frame)).replace(output_path)
+        if on_rendered:
+            on_rendered(seat_id, output_path)
+
+    bpy.app.handlers.render_write.append(frame_written)
+    try:
+        bpy.ops.render.render(animation=True)
+    finally:
+        bpy.app.handlers.render_write.remove(frame_written)
+
+
+def _send(event: str, **data):
+    print(MESSAGE_PREFIX + json.dumps({"event": event, **data}), flush=True)
+
+
+def serve():
+    """Command loop; runs until shutdown or stdin closes."""
+    loaded_hash = None
+    camera = None
+
+    _send("ready")
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            command = json.loads(line)
+            cmd = command.get("cmd")
+
+            if cmd == "load":
+                cached = command["hash"] == loaded_hash
+                if not cached:
+                    bpy.ops.wm.open_mainfile(filepath=command["path"])
+                    camera = prepare_scene()
+                    loaded_hash = command["hash"]
+                _send("loaded", hash=loaded_hash, cached=cached)
+
+            elif cmd == "render":
+                if camera is None:
+                    raise ValueError("No scene loaded")
+                output_dir = Path(command["output_dir"])
+                output_dir.mkdir(parents=True, exist_ok=True)
+                seats = command["seats"]
+
+                if command.get("animated"):
+                    done = set()
+
+                    def frame_rendered(seat_id, output_path):
+                        done.add(seat_id)
+                        _send("rendered", id=seat_id, path=str(output_path))
+
+                    render_seats_animated(camera, seats, output_dir, on_rendered=frame_rendered)
+                    for seat in seats:
+                        if seat["id"] not in done:
+                            _send("failed", id=seat["id"], error="frame not written")
+                    _send("done", count=len(done))
+                    continue
+
+                rendered = 0
+                for seat in seats:
+                    output_path = output_dir / f"{seat['id']}_depth.png"
+                    try:
+                        render_seat(camera, seat, output_path)
+                    except Exception as e:
+                        _send("failed", id=seat["id"], error=str(e))
+                        continue
+                    rendered += 1
+                    _send("rendered", id=seat["id"], path=str(output_path))
+                _send("done", count=rendered)
+
+            elif cmd == "shutdown":
+                break
+
+            else:
+                raise ValueError(f"Unknown command: {cmd}")
+
+        except Exception as e:
+            _send("error", error=str(e))
+
+
+# ============== CLIENT SIDE ==============
+
+class BlenderRenderServer:
+    """
+    Client for a long-lived Blender render server process.
+
+    Args:
+        blender_path: Blender executable (default: "blender" on PATH)
+    """
+
+    def __init__(self, blender_path: Optional[str] = None):
+        blender_path = blender_path or shutil.which("blender")
+        if not blender_path:
+            raise RuntimeError("Blender not found")
+
+        self.loaded_hash: Optional[str] = None
+        self.process = subprocess.Popen(
+            [blender_path, "--background", "--python", str(Path(__file__).resolve()), "--", "--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        self._expect("ready")
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def _send(self, **command):
+        self.process.stdin.write(json.dumps(command) + "\n")
+        self.process.stdin.flush()
+
+    def _read(self) -> dict:
+        """Next protocol message, skipping Blender's own output."""
+        for line in self.process.stdout:
+            if line.startswith(MESSAGE_PREFIX):
+                message = json.loads(line[len(MESSAGE_PREFIX):])
+                if message["event"] == "error":
+                    raise RuntimeError(f"Blender render server error: {message['error']}")
+                return message
+        raise RuntimeError(f"Blender render server exited with code {self.process.wait()}")
+
+    def _expect(self, event: str) -> dict:
+        message = self._read()
+        if message["event"] != event:
+            raise RuntimeError(f"Blender render server: expected {event}, got {message}")
+        return message
+
+    def load(self, blend_path, scene_hash: Optional[str] = None) -> bool:
+        """
+        Make a .blend the active scene. No-op if that content is already loaded.
+
+        Returns:
+            True if the scene was already warm
+        """
+        blend_path = Path(blend_path)
+        scene_hash = scene_hash or blend_hash(blend_path.read_bytes())
+        if scene_hash == self.loaded_hash:
+            return True
+
+        self._send(cmd="load", path=str(blend_path), hash=scene_hash)
+        message = self._expect("loaded")
+        self.loaded_hash = scene_hash
+        return message["cached"]
+
+    def load_bytes(self, blend_bytes: bytes) -> bool:
+        """load() for .blend contents (e.g. from storage); written once per hash."""
+        scene_hash = blend_hash(blend_bytes)
+        if scene_hash == self.loaded_hash:
+            return True
+
+        blend_path = WORK_DIR / f"{scene_hash}.blend"
+        if not blend_path.exists():
+            blend_path.parent.mkdir(parents=True, exist_ok=True)
+            blend_path.write_bytes(blend_bytes)
+        return self.load(blend_path, scene_hash)
+
+    def render(self, seats: List[dict], output_dir=None, animated: bool = True) -> Iterator[Tuple[str, bytes]]:
+        """
+        Render seats in the loaded scene.
+
+        Yields (seat_id, png_bytes) as each depth map finishes. PNGs are
+        written to output_dir as {seat_id}_depth.png (default: a work dir).
+        With animated=True the batch is rendered as one animation, one seat
+        per frame; otherwise each seat is a separate still render.
+        """
+        output_dir = Path(output_dir) if output_dir else WORK_DIR / "depth_maps" / (self.loaded_hash or "none")
+        self._send(cmd="render", seats=seats, output_dir=str(output_dir), animated=animated)
+
+        while True:
+            message = self._read()
+            if message["event"] == "done":
+                return
+            if message["event"] == "failed":
+                print(f"Warning: Depth map failed for {message['id']}: {message['error']}")
+                continue
+            yield message["id"], Path(message["path"]).read_bytes()
+
+    def close(self):
+        if self.alive:
+            try:
+                self._send(cmd="shutdown")
+                self.process.wait(timeout=30)
+            except (BrokenPipeError, subprocess.TimeoutExpired):
+                self.process.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def render_parallel(
+    blend_path,
+    seats: List[dict],
+    output_dir=None,
+    workers: int = 2,
+    blender_path: Optional[str] = None,
+    animated: bool = True,
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Shard seats round-robin across `workers` render servers.
+
+    Yields (seat_id, png_bytes) from whichever server finishes next, so
+    wall-clock time scales with seats / workers.
+    """
+    workers = max(1, min(workers, len(seats)))
+    results: "queue.Queue" = queue.Queue()
+
+    def run_shard(shard: List[dict]):
+        try:
+            with BlenderRenderServer(blender_path) as server:
+                server.load(blend_path)
+                for item in server.render(shard, output_dir, animated=animated):
+                    results.put(item)
+        except Exception as e:
+            results.put(e)
+        finally:
+            results.put(None)
+
+    for i in range(workers):
+        threading.Thread(target=run_shard, args=(seats[i::workers],), daemon=True).start()
+
+    finished = 0
+    while finished < workers:
+        item = results.get()
+        if item is None:
+            finished += 1
+        elif isinstance(item, Exception):
+            raise RuntimeError(f"Render worker failed: {item}") from item
+        else:
+            yield item
+
+
+if __name__ == "__main__" and BLENDER_AVAILABLE and "--serve" in sys.argv:
+    serve()
@@ -12,6 +12,7 @@ import os
 import random
 import time
 import ssl
+import threading
 import certifi
 from pathlib import Path
 from typing import List, Optional, Callable
@@ -77,6 +78,61 @@ class RateLimitError(Exception):
     pass
 
 
+class AdaptiveConcurrency:
+    """
+    AIMD limit on in-flight API calls, shared by all worker threads of a batch.
+
+    Adds about one slot per window of successful calls and halves on rate
+    limits (same policy as temporal/workflows/concurrency.AIMDController), so
+    throughput follows the provider's real limit. Only the first throttle of
+    a burst halves: calls started before the last decrease are ignored.
+    """
+
+    def __init__(self, initial: int = 1, max_limit: int = 8, min_limit: int = 1):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.active = 0
+        self.epoch = 0
+        self.successes = 0
+        self.throttles = 0
+        self._cond = threading.Condition()
+
+    @property
+    def current(self) -> int:
+        return max(self.min_limit, min(self.max_limit, int(self.limit)))
+
+    def acquire(self) -> int:
+        """Block until a slot is free; returns the epoch the call started in."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.active < self.current)
+            self.active += 1
+            return self.epoch
+
+    def release(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            self.successes += 1
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / max(self.limit, 1.0))
+            self._cond.notify_all()
+
+    def on_throttle(self, started_epoch: int):
+        with self._cond:
+            self.throttles += 1
+            if started_epoch == self.epoch:
+                self.limit = max(float(self.min_limit), self.limit / 2)
+                self.epoch += 1
+                print(f"  Rate limited - concurrency -> {self.current}")
+
+
+# Concurrency controller (and start epoch) of the batch call running on this thread
+_batch_state = threading.local()
+
+
 def retry_with_backoff(
     func: Callable,
     max_retries: int = 5,
@@ -105,6 +161,10 @@ def retry_with_backoff(
             if not is_rate_limit:
                 raise
 
+            concurrency = getattr(_batch_state, "concurrency", None)
+            if concurrency is not None:
+                concurrency.on_throttle(_batch_state.epoch)
+
             if attempt == max_retries:
                 raise
 
@@ -400,8 +460,8 @@ def batch_generate(
     output_dir: Path,
     model: str = "flux",
     strength: float = 0.75,
-    max_workers: int = 1,  # Reduced from 3 to avoid rate limits
-    min_delay: float = 8.0,  # Minimum seconds between requests
+    max_workers: int = 8,  # Ceiling for the adaptive concurrency
+    min_delay: float = 0.0,  # Optional fixed gap between requests
     seat_ids: Optional[List[str]] = None  # Optional: specific seats to generate
 ) -> List[str]:
     """
@@ -413,8 +473,9 @@ def batch_generate(
         output_dir: Where to save generated images
         model: Model to use (flux, sdxl, controlnet)
         strength: ControlNet strength
-        max_workers: Parallel workers (default 1 to avoid rate limits)
-        min_delay: Minimum delay between requests in seconds
+        max_workers: Max parallel API calls; the actual number starts at 1 and
+            adapts (AIMD) to the provider's rate limit
+        min_delay: Minimum delay between requests in seconds (0 = rely on AIMD)
         seat_ids: Optional list of specific seat IDs to generate
     """
 
@@ -449,7 +510,12 @@ def batch_generate(
 
     print(f"Generating {total} images using {model}...")
     print(f"Prompt: {prompt[:80]}...")
-    print(f"Rate limit: {min_delay}s between requests, {max_workers} worker(s)")
+    print(f"Concurrency: adaptive, up to {max_workers} parallel request(s)")
+    if min_delay > 0:
+        print(f"Rate limit: {min_delay}s between requests")
+
+    concurrency = AdaptiveConcurrency(initial=1, max_limit=max(1, max_workers))
+    delay_lock = threading.Lock()
 
     def process_one(depth_map: Path, index: int) -> tuple:
         nonlocal last_request_time
@@ -457,49 +523,55 @@ def batch_generate(
         seat_id = depth_map.stem.replace("_depth", "")
         output_path = output_dir / f"{seat_id}_final.jpg"
 
-        # Enforce minimum delay between requests
-        elapsed = time.time() - last_request_time
-        if elapsed < min_delay and last_request_time > 0:
-            wait_time = min_delay - elapsed
-            print(f"  Waiting {wait_time:.1f}s before next request...")
-            time.sleep(wait_time)
+        _batch_state.concurrency = concurrency
+        _batch_state.epoch = concurrency.acquire()
+        try:
+            # Enforce minimum delay between requests
+            with delay_lock:
+                elapsed = time.time() - last_request_time
+                if elapsed < min_delay and last_request_time > 0:
+                    wait_time = min_delay - elapsed
+                    print(f"  Waiting {wait_time:.1f}s before next request...")
+                    time.sleep(wait_time)
+                last_request_time = time.time()
+
+            try:
+                result = generate_fn(
+                    depth_map_path=depth_map,
+                    prompt=prompt,
+                    output_path=output_path,
+                    strength=strength
+                )
+            except Exception as e:
+                print(f"  {seat_id}: {e}")
+                result = None
 
-        last_request_time = time.time()
+            if result:
+                concurrency.on_success()
+            return seat_id, result
+        finally:
+            concurrency.release()
+            _batch_state.concurrency = None
 
-        result = generate_fn(
-            depth_map_path=depth_map,
-            prompt=prompt,
-            output_path=output_path,
-            strength=strength
-        )
+    # Worker threads block on the controller, so only `current` calls run at once
+    completed = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(process_one, dm, i): dm for i, dm in enumerate(depth_maps)}
 
-        return seat_id, result
+        for future in as_completed(futures):
+            completed += 1
+            seat_id, result = future.result()
 
-    # Sequential processing for better rate limit handling
-    if max_workers == 1:
-        for i, depth_map in enumerate(depth_maps):
-            seat_id, result = process_one(depth_map, i)
             if result:
                 results.append(result)
-                print(f"[{i+1}/{total}] ✓ {seat_id}")
+                print(f"[{completed}/{total}] ✓ {seat_id} (concurrency {concurrency.current})")
             else:
-                print(f"[{i+1}/{total}] ✗ {seat_id} failed")
-    else:
-        # Parallel processing (not recommended with rate limits)
-        completed = 0
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(process_one, dm, i): dm for i, dm in enumerate(depth_maps)}
-
-            for future in as_completed(futures):
-                completed += 1
-                seat_id, result = future.result()
-
-                if result:
-                    results.append(result)
-                    print(f"[{completed}/{total}] ✓ {seat_id}")
-                else:
-                    print(f"[{completed}/{total}] ✗ {seat_id} failed")
+                print(f"[{completed}/{total}] ✗ {seat_id} failed")
 
+    print(
+        f"Final concurrency {concurrency.current} "
+        f"({concurrency.successes} ok, {concurrency.throttles} rate limited)"
+    )
     return results
 
 
@@ -512,8 +584,9 @@ def main():
     parser.add_argument("--model", default="flux", choices=["sdxl", "flux", "controlnet"],
                         help="Model to use (flux recommended)")
     parser.add_argument("--strength", type=float, default=0.75, help="ControlNet strength")
-    parser.add_argument("--workers", type=int, default=1, help="Parallel API calls (default 1 for rate limits)")
-    parser.add_argument("--delay", type=float, default=8.0, help="Minimum delay between requests (seconds)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="Max parallel API calls (adapts to rate limits, starting at 1)")
+    parser.add_argument("--delay", type=float, default=0.0, help="Minimum delay between requests (seconds)")
     parser.add_argument("--seats", type=str, nargs="+", help="Specific seat IDs to generate (e.g., 101_A_12)")
     args = parser.parse_args()
     
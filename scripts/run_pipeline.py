@@ -4,17 +4,31 @@ run_pipeline.py - Master script for venue seat view generation
 """
 
 import argparse
+import json
 import os
 import shutil
 import subprocess
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from geometry import (  # noqa: E402
+    MANIFEST_FILENAME,
+    MirrorPlan,
+    expand_mirrored,
+    manifest_seats,
+    mirror_planes,
+    plan_mirrored_renders,
+    read_seat_manifest,
+)
+
 
 class VenuePipeline:
-    def __init__(self, venue_id: str, event_type: str = "hockey"):
+    def __init__(self, venue_id: str, event_type: str = "hockey", workers: int = 1):
         self.venue_id = venue_id
         self.event_type = event_type
+        self.workers = workers  # parallel Blender render processes
         self.blender_path = None
         
         self.script_dir = Path(__file__).parent
@@ -24,9 +38,8 @@ class VenuePipeline:
         self.config_path = self.venue_dir / "config.json"
         self.sections_path = self.venue_dir / "sections.json"
         self.blend_path = self.venue_dir / f"{venue_id}_{event_type}.blend"
-        self.all_seats_path = self.venue_dir / "all_seats.json"
-        self.sample_seats_path = self.venue_dir / "sample_seats.json"
-        self.anchor_seats_path = self.venue_dir / "anchor_seats.json"
+        self.manifest_path = self.venue_dir / MANIFEST_FILENAME
+        self.render_seats_path = self.venue_dir / "render_seats.json"
         self.depth_maps_dir = self.venue_dir / "outputs" / "depth_maps"
         self.final_images_dir = self.venue_dir / "outputs" / "final_images"
     
@@ -85,8 +98,8 @@ class VenuePipeline:
             print("  OR add to PATH:")
             print('  export PATH="/Applications/Blender.app/Contents/MacOS:$PATH"')
             sys.exit(1)
-        
-        print(f"✓ Found Blender: {self.blender_path}")
+        else:
+            print(f"✓ Found Blender: {self.blender_path}")
         
         self.depth_maps_dir.mkdir(parents=True, exist_ok=True)
         self.final_images_dir.mkdir(parents=True, exist_ok=True)
@@ -97,8 +110,11 @@ class VenuePipeline:
         cmd = [sys.executable, str(self.script_dir / "01_extract_sections.py")]
         self.run_command(cmd, "Extract sections")
     
-    def step_2_generate_seats(self):
+    def step_2_generate_seats(self, mirror: bool = True):
         cmd = [sys.executable, str(self.script_dir / "02_generate_seats.py")]
+        if mirror:
+            # Pick anchors with their mirror images so step 4 can flip them
+            cmd += ["--mirror-planes", ",".join(mirror_planes(self.render_config()))]
         self.run_command(cmd, "Generate seat coordinates")
     
     def step_3_build_venue(self):
@@ -109,15 +125,71 @@ class VenuePipeline:
         ]
         self.run_command(cmd, f"Build 3D venue ({self.event_type})")
     
-    def step_4_render_depths(self, seats_file: str = "anchor_seats.json"):
-        seats_path = self.venue_dir / seats_file
+    def render_config(self) -> dict:
+        """
+        Scene config for the mirror planner.
+        
+        Local configs describe the surface per event type; this maps them to
+        the surface_config shape the API/Modal pipeline uses.
+        """
+        with open(self.config_path) as f:
+            config = json.load(f)
+        
+        event_config = config.get("configurations", {}).get(self.event_type, {})
+        surface_type = event_config.get("surface", "rink")
+        return {
+            "surface_config": {
+                "surface_type": surface_type,
+                "length": event_config.get("length", 60),
+                "width": event_config.get("width", 26),
+                "boards": surface_type == "rink",
+            },
+            "landmarks": config.get("landmarks", {}),
+        }
+    
+    def plan_render_seats(self, seat_set: str, changed_only: bool, mirror: bool) -> MirrorPlan:
+        """Flagged manifest seats, minus mirror images that can be flipped from a partner."""
+        flags = (seat_set, "changed") if changed_only else (seat_set,)
+        seats = manifest_seats(read_seat_manifest(self.manifest_path), *flags)
+        if not mirror:
+            return MirrorPlan(render=seats)
+        
+        plan = plan_mirrored_renders(seats, mirror_planes(self.render_config()))
+        if plan.mirrors:
+            print(f"\n✓ Mirror symmetry: rendering {len(plan.render)} of {len(seats)} seats")
+        return plan
+    
+    def write_mirrored_depths(self, plan: MirrorPlan):
+        """Write flipped depth maps for seats derived from a mirror partner."""
+        sources = {}
+        for source_id in plan.mirrors:
+            path = self.depth_maps_dir / f"{source_id}_depth.png"
+            if path.exists():
+                sources[source_id] = path.read_bytes()
+        
+        derived = expand_mirrored(sources, plan.mirrors)
+        for seat_id, png_bytes in derived.items():
+            if seat_id not in sources:
+                (self.depth_maps_dir / f"{seat_id}_depth.png").write_bytes(png_bytes)
+        if plan.mirrors:
+            print(f"✓ Derived {len(derived) - len(sources)} mirrored depth maps")
+    
+    def step_4_render_depths(self, seat_set: str = "anchor", changed_only: bool = False, mirror: bool = True):
+        # Blender's bundled Python has no pyarrow, so hand it just the
+        # flagged subset of the manifest as a small JSON file
+        plan = self.plan_render_seats(seat_set, changed_only, mirror)
+        with open(self.render_seats_path, 'w') as f:
+            json.dump(plan.render, f)
         
+        # 04 drives one persistent Blender render server for the whole set
         cmd = [
-            self.blender_path, str(self.blend_path), "--background",
-            "--python", str(self.script_dir / "04_render_depths.py"),
-            "--", str(seats_path), str(self.depth_maps_dir)
+            sys.executable, str(self.script_dir / "04_render_depths.py"),
+            "--venue", self.venue_id, "--seats", self.render_seats_path.name,
+            "--blend", str(self.blend_path), "--blender", self.blender_path,
+            "--workers", str(self.workers),
         ]
-        self.run_command(cmd, f"Render depth maps ({seats_file})")
+        self.run_command(cmd, f"Render depth maps ({len(plan.render)} {seat_set} seats)")
+        self.write_mirrored_depths(plan)
     
     def step_5_generate_images(self, model: str = "flux"):
         cmd = [
@@ -129,7 +201,8 @@ class VenuePipeline:
         ]
         self.run_command(cmd, "Generate final images")
     
-    def run_full_pipeline(self, samples_only: bool = True, skip_ai: bool = False, model: str = "flux"):
+    def run_full_pipeline(self, samples_only: bool = True, skip_ai: bool = False, model: str = "flux",
+                          changed_only: bool = False, mirror: bool = True):
         print(f"\n{'#'*60}")
         print(f"# VENUE SEAT VIEW PIPELINE")
         print(f"# Venue: {self.venue_id}")
@@ -143,18 +216,18 @@ class VenuePipeline:
         else:
             print(f"\n✓ Sections exist: {self.sections_path}")
         
-        if not self.anchor_seats_path.exists():
-            self.step_2_generate_seats()
+        if not self.manifest_path.exists():
+            self.step_2_generate_seats(mirror)
         else:
-            print(f"\n✓ Seats exist: {self.anchor_seats_path}")
+            print(f"\n✓ Seats exist: {self.manifest_path}")
         
+        seat_set = "anchor" if samples_only else "sample"
         if not self.blend_path.exists():
             self.step_3_build_venue()
         else:
             print(f"\n✓ Venue model exists: {self.blend_path}")
         
-        seats_file = "anchor_seats.json" if samples_only else "sample_seats.json"
-        self.step_4_render_depths(seats_file)
+        self.step_4_render_depths(seat_set, changed_only, mirror)
         
         if not skip_ai:
             if not os.environ.get("REPLICATE_API_TOKEN"):
@@ -186,29 +259,37 @@ def main():
     parser.add_argument("--skip-ai", action="store_true", help="Skip AI generation")
     parser.add_argument("--model", default="flux", choices=["flux", "sdxl", "controlnet"])
     parser.add_argument("--step", choices=["sections", "seats", "build", "render", "generate"])
+    parser.add_argument("--changed-only", action="store_true",
+                        help="Only render seats whose section geometry changed since the last seat generation")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Parallel Blender render processes")
+    parser.add_argument("--no-mirror", action="store_true",
+                        help="Render every seat instead of flipping mirror-image seats' depth maps")
     
     args = parser.parse_args()
     
-    pipeline = VenuePipeline(args.venue, args.event)
+    pipeline = VenuePipeline(args.venue, args.event, workers=args.workers)
     
     if args.step:
         pipeline.check_prerequisites()
         if args.step == "sections":
             pipeline.step_1_extract_sections()
         elif args.step == "seats":
-            pipeline.step_2_generate_seats()
+            pipeline.step_2_generate_seats(not args.no_mirror)
         elif args.step == "build":
             pipeline.step_3_build_venue()
         elif args.step == "render":
-            seats_file = "sample_seats.json" if args.full_samples else "anchor_seats.json"
-            pipeline.step_4_render_depths(seats_file)
+            seat_set = "sample" if args.full_samples else "anchor"
+            pipeline.step_4_render_depths(seat_set, args.changed_only, not args.no_mirror)
         elif args.step == "generate":
             pipeline.step_5_generate_images(args.model)
     else:
         pipeline.run_full_pipeline(
             samples_only=not args.full_samples,
             skip_ai=args.skip_ai,
-            model=args.model
+            model=args.model,
+            changed_only=args.changed_only,
+            mirror=not args.no_mirror,
         )
 
 
@@ -0,0 +1,7 @@
+-- Section content hashes
+-- Lets section updates diff by geometry instead of replacing every row,
+-- so unchanged sections keep their depth maps and images.
+
+ALTER TABLE sections ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+COMMENT ON COLUMN sections.content_hash IS 'Hash of the section geometry (angle, radius, rows, seats per row, depth, rise, base height); see geometry/diff.py';
@@ -0,0 +1,7 @@
+-- Responsive image variants
+-- Each generated image is also stored as WebP (optionally AVIF) at several
+-- widths; galleries pick one with srcset instead of loading the full JPEG.
+
+ALTER TABLE images ADD COLUMN IF NOT EXISTS variants JSONB DEFAULT '[]';
+
+COMMENT ON COLUMN images.variants IS 'Resized copies of final_image_url: [{"url", "width", "format"}]; see temporal/activities/image_variants.py';
@@ -7,7 +7,8 @@ from .modal_activities import (
     generate_ai_image_activity,
 )
 from .storage_activities import (
-    save_seats_json_activity,
+    store_artifacts_activity,
+    save_seat_manifest_activity,
     save_blend_file_activity,
     save_depth_maps_activity,
     save_generated_images_activity,
@@ -21,7 +22,8 @@ __all__ = [
     "render_depth_maps_activity",
     "generate_ai_image_activity",
     # Storage activities
-    "save_seats_json_activity",
+    "store_artifacts_activity",
+    "save_seat_manifest_activity",
     "save_blend_file_activity",
     "save_depth_maps_activity",
     "save_generated_images_activity",
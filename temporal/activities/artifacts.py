@@ -0,0 +1,271 @@
+"""
+Claim-check artifact store for activity payloads.
+
+Large bytes (.blend files, depth maps, generated images) are written to an
+artifact store and activities exchange small content-addressed references
+("artifact://<sha256>") instead of base64 blobs. Workflow history then holds
+64-byte refs rather than megabytes per call, and payload limits no longer
+apply to the data itself.
+
+Bytes that already live in the blob store (e.g. depth maps found when
+resuming) travel as "storage://<path>#<hash>" refs instead, and are only
+downloaded by the activity that reads them.
+
+The backend comes from the ARTIFACT_STORE env var:
+    "blob"  - the blob store (blobs/store.py) under artifacts/ (default;
+              "supabase" is accepted as an alias)
+    "local" - ARTIFACT_DIR on disk (default /tmp/venue_artifacts); only
+              valid when every worker shares that filesystem
+
+Artifacts only live as long as the workflows passing them around: prune()
+deletes those not written for ARTIFACT_TTL_HOURS (default 24, well past the
+pipeline's 2 hour execution timeout). Putting bytes that already exist
+rewrites them, so an artifact a new run reuses starts a fresh TTL.
+"""
+
+import base64
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+ARTIFACT_SCHEME = "artifact://"
+STORAGE_SCHEME = "storage://"
+
+# Recently fetched artifacts kept in memory (e.g. the .blend reused by every depth batch)
+_MEMORY_CACHE_SIZE = 16
+
+# Artifacts not written for this long are pruned
+DEFAULT_ARTIFACT_TTL_HOURS = 24.0
+
+# A put of bytes this process wrote less than this long ago skips the write
+_REWRITE_AFTER_SECONDS = 3600.0
+
+
+def artifact_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def is_artifact_ref(value: Optional[str]) -> bool:
+    return isinstance(value, str) and value.startswith(ARTIFACT_SCHEME)
+
+
+def storage_ref(path: str, content_hash: Optional[str] = None) -> str:
+    """
+    Ref to an object already in the blob store; nothing is downloaded.
+
+    content_hash (sha256 from the asset manifest, or the eTag when listed)
+    ties the ref to that version of the object, so a re-uploaded file gets
+    a different ref.
+    """
+    return f"{STORAGE_SCHEME}{path}#{content_hash}" if content_hash else f"{STORAGE_SCHEME}{path}"
+
+
+def is_storage_ref(value: Optional[str]) -> bool:
+    return isinstance(value, str) and value.startswith(STORAGE_SCHEME)
+
+
+def storage_ref_path(ref: str) -> str:
+    return ref[len(STORAGE_SCHEME):].partition("#")[0]
+
+
+def get_stored_object(ref: str) -> bytes:
+    """Download the blob a storage ref points to (KeyError if missing)."""
+    from blobs.store import blob_store
+    return blob_store().download(storage_ref_path(ref))
+
+
+class ArtifactStore:
+    """Content-addressed bytes store. Subclasses implement _read(), _write() and prune()."""
+
+    def __init__(self):
+        self._recent: "OrderedDict[str, bytes]" = OrderedDict()
+        # When this process last wrote each key in _recent (time.monotonic())
+        self._written_at: Dict[str, float] = {}
+        # Uploads resolve refs from several threads at once
+        self._lock = threading.Lock()
+
+    def _read(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    def _write(self, key: str, data: bytes) -> None:
+        """Write (or rewrite, refreshing its age) the object for key."""
+        raise NotImplementedError
+
+    def prune(self, max_age: timedelta) -> int:
+        """Delete artifacts not written for max_age; returns how many were removed."""
+        raise NotImplementedError
+
+    def put(self, data: bytes) -> str:
+        """Store bytes and return their ref. Identical bytes share one object."""
+        key = artifact_key(data)
+        with self._lock:
+            written_at = self._written_at.get(key)
+        if written_at is None or time.monotonic() - written_at > _REWRITE_AFTER_SECONDS:
+            self._write(key, data)
+            self._remember(key, data, written=True)
+        return f"{ARTIFACT_SCHEME}{key}"
+
+    def get(self, ref: str) -> bytes:
+        """Bytes for a ref (KeyError if the store doesn't have them)."""
+        key = ref[len(ARTIFACT_SCHEME):]
+        with self._lock:
+            data = self._recent.get(key)
+            if data is not None:
+                self._recent.move_to_end(key)
+        if data is None:
+            data = self._read(key)
+            self._remember(key, data)
+        return data
+
+    def _remember(self, key: str, data: bytes, written: bool = False) -> None:
+        with self._lock:
+            self._recent[key] = data
+            self._recent.move_to_end(key)
+            if written:
+                self._written_at[key] = time.monotonic()
+            while len(self._recent) > _MEMORY_CACHE_SIZE:
+                evicted, _ = self._recent.popitem(last=False)
+                self._written_at.pop(evicted, None)
+
+
+class LocalArtifactStore(ArtifactStore):
+    """Artifacts on disk, sharded by key prefix: {root}/ab/abcdef..."""
+
+    def __init__(self, root: Union[str, Path]):
+        super().__init__()
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def _read(self, key: str) -> bytes:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        if path.exists():
+            path.touch()
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    def prune(self, max_age: timedelta) -> int:
+        cutoff = time.time() - max_age.total_seconds()
+        removed = 0
+        for path in self.root.glob("*/*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass  # pruned concurrently
+        return removed
+
+
+class BlobArtifactStore(ArtifactStore):
+    """
+    Artifacts in the blob store under {prefix}/ab/abcdef...
+
+    Args:
+        blobs: a BlobStore (see blobs/store.py)
+    """
+
+    def __init__(self, blobs, prefix: str = "artifacts"):
+        super().__init__()
+        self.blobs = blobs
+        self.prefix = prefix
+
+    def _object_path(self, key: str) -> str:
+        return f"{self.prefix}/{key[:2]}/{key}"
+
+    def _read(self, key: str) -> bytes:
+        try:
+            return self.blobs.download(self._object_path(key))
+        except KeyError:
+            raise KeyError(key)
+
+    def _write(self, key: str, data: bytes) -> None:
+        # Same key means same content, so upsert is always safe
+        self.blobs.upload(
+            self._object_path(key),
+            data,
+            file_options={"content-type": "application/octet-stream", "upsert": "true"},
+        )
+
+    def prune(self, max_age: timedelta) -> int:
+        from blobs.manifest import list_folder
+
+        cutoff = datetime.now(timezone.utc) - max_age
+        shards = [f["name"] for f in self.blobs.list(self.prefix, {"limit": 1000}) if not f.get("id")]
+        expired = [
+            f"{self.prefix}/{shard}/{f['name']}"
+            for shard in shards
+            for f in list_folder(self.blobs, f"{self.prefix}/{shard}")
+            if _parse_timestamp(f.get("updated_at")) < cutoff
+        ]
+        # Remove after listing: removing while paging by offset would skip entries
+        for start in range(0, len(expired), 1000):
+            self.blobs.remove(expired[start:start + 1000])
+        if expired and hasattr(self.blobs, "prune"):
+            self.blobs.prune()  # LocalBlobStore keeps unreferenced bytes until pruned
+        return len(expired)
+
+
+def _parse_timestamp(value: Optional[str]) -> datetime:
+    """Listing timestamp as an aware datetime (far future if unknown, so it's never pruned)."""
+    if not value:
+        return datetime.max.replace(tzinfo=timezone.utc)
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+_store: Optional[ArtifactStore] = None
+
+
+def artifact_store() -> ArtifactStore:
+    """The worker process's artifact store (created once, from env)."""
+    global _store
+    if _store is not None:
+        return _store
+
+    if os.environ.get("ARTIFACT_STORE", "blob") == "local":
+        _store = LocalArtifactStore(os.environ.get("ARTIFACT_DIR", "/tmp/venue_artifacts"))
+    else:
+        # Shares the worker's blob store with the uploads
+        from blobs.store import blob_store
+        _store = BlobArtifactStore(blob_store())
+    return _store
+
+
+def put_artifact(data: bytes) -> str:
+    return artifact_store().put(data)
+
+
+def get_artifact(ref: str) -> bytes:
+    return artifact_store().get(ref)
+
+
+def prune_artifacts(max_age: Optional[timedelta] = None) -> int:
+    """Delete expired artifacts (max_age defaults to ARTIFACT_TTL_HOURS); returns how many."""
+    if max_age is None:
+        max_age = timedelta(hours=float(os.environ.get("ARTIFACT_TTL_HOURS", DEFAULT_ARTIFACT_TTL_HOURS)))
+    return artifact_store().prune(max_age)
+
+
+def artifact_bytes(value: str) -> bytes:
+    """Bytes of an artifact or storage ref, or of a base64 string (legacy payloads)."""
+    if is_artifact_ref(value):
+        return get_artifact(value)
+    if is_storage_ref(value):
+        return get_stored_object(value)
+    return base64.b64decode(value)
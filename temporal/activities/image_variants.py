@@ -0,0 +1,140 @@
+"""
+Responsive variants of generated seat images.
+
+Generated images are full-size JPEGs; galleries show them a few hundred
+pixels wide. At save time each image is also encoded as WebP (and AVIF when
+enabled and Pillow supports it) at several widths and stored next to the
+originals, so pages can pick a size with srcset (paths and srcsets are in
+blobs/variants.py, shared with the API).
+
+Encoding is CPU-bound and holds the GIL, so it runs on a process pool
+shared by the worker's activities.
+
+Env vars:
+    IMAGE_VARIANT_WIDTHS     comma-separated widths (default 320,640,1280)
+    IMAGE_VARIANT_FORMATS    comma-separated formats (default webp; "webp,avif" adds AVIF)
+    IMAGE_VARIANT_PROCESSES  process pool size (default: CPU count)
+"""
+
+import asyncio
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from blobs.variants import CONTENT_TYPES
+
+DEFAULT_WIDTHS = (320, 640, 1280)
+DEFAULT_FORMATS = ("webp",)
+
+# Encoder settings per format (Pillow save() keyword arguments)
+ENCODE_OPTIONS = {
+    "webp": {"quality": 80, "method": 4},
+    "avif": {"quality": 55, "speed": 6},
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def variant_widths() -> List[int]:
+    widths = os.environ.get("IMAGE_VARIANT_WIDTHS")
+    if not widths:
+        return list(DEFAULT_WIDTHS)
+    return sorted({int(w) for w in widths.split(",") if w.strip()})
+
+
+def variant_formats() -> List[str]:
+    """Configured formats the installed Pillow can encode."""
+    from PIL import features
+
+    formats = os.environ.get("IMAGE_VARIANT_FORMATS")
+    requested = [f.strip().lower() for f in formats.split(",")] if formats else list(DEFAULT_FORMATS)
+    return [fmt for fmt in requested if fmt in CONTENT_TYPES and features.check(fmt)]
+
+
+def encode_variants(data: bytes, widths: Sequence[int], formats: Sequence[str]) -> List[Tuple[int, str, bytes]]:
+    """
+    (width, format, bytes) for each width below the image's own (or just its
+    own width if it's smaller than all of them) in each format.
+
+    Runs in pool processes, so it takes and returns plain values.
+    """
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGB")
+
+    targets = [w for w in widths if w < image.width] or [image.width]
+    variants = []
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            out = io.BytesIO()
+            resized.save(out, format=fmt.upper(), **ENCODE_OPTIONS.get(fmt, {}))
+            variants.append((width, fmt, out.getvalue()))
+    return variants
+
+
+def _variant_pool() -> ProcessPoolExecutor:
+    """The worker process's encoding pool (created on first use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            processes = int(os.environ.get("IMAGE_VARIANT_PROCESSES", os.cpu_count() or 1))
+            # spawn: the worker has event-loop and upload threads that fork can't copy safely
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, processes),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+    return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor) -> None:
+    """Drop a pool whose process died (e.g. OOM), so the next batch starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+async def build_variants(images: Dict[str, bytes]) -> Dict[str, List[Tuple[int, str, bytes]]]:
+    """
+    Encode every image's variants on the process pool.
+
+    An image that fails to encode is logged and left out; its original is
+    still stored and served.
+    """
+    from temporalio import activity
+
+    formats = variant_formats()
+    if not images or not formats:
+        return {}
+    widths = variant_widths()
+
+    loop = asyncio.get_running_loop()
+    pool = _variant_pool()
+    seat_ids = list(images)
+    results = await asyncio.gather(
+        *(loop.run_in_executor(pool, encode_variants, images[seat_id], widths, formats) for seat_id in seat_ids),
+        return_exceptions=True,
+    )
+
+    if any(isinstance(result, BrokenProcessPool) for result in results):
+        _reset_pool(pool)
+
+    variants = {}
+    for seat_id, result in zip(seat_ids, results):
+        if isinstance(result, BaseException):
+            activity.logger.warning(f"Failed to encode variants of {seat_id}: {result}")
+        else:
+            variants[seat_id] = result
+    return variants
+
@@ -2,36 +2,51 @@
 Temporal activities that wrap Modal function calls.
 
 These activities provide the bridge between Temporal orchestration
-and Modal compute for Blender and AI generation.
+and Modal compute for Blender and AI generation. Large inputs and outputs
+travel as artifact refs (see artifacts.py), not base64.
+
+Modal functions are invoked with .remote.aio() and blocking storage I/O
+runs in threads, so one worker can keep many activities in flight.
 """
 
-import base64
-from typing import Dict, List, Optional, Tuple
+import asyncio
+from typing import Any, Dict, List, Optional
 from temporalio import activity
 
+from .artifacts import artifact_bytes, put_artifact
+
 # Modal app name (must match modal_app.py)
 MODAL_APP_NAME = "venue-seat-views"
 
 
 @activity.defn
-async def generate_seats_activity(sections: Dict[str, dict]) -> Tuple[List[dict], List[dict], List[dict]]:
+async def generate_seats_activity(
+    sections: Dict[str, dict],
+    custom_seats: Optional[List[str]] = None,
+) -> Dict[str, Any]:
     """
     Generate seat coordinates from section definitions.
 
+    The full bowl is generated on Modal; only the seat subsets that will be
+    rendered come back, so large venues don't blow the workflow payload limit.
+    Anchor seats are picked by save_seat_manifest_activity, which knows the
+    previous manifest.
+
     Args:
         sections: Dictionary mapping section_id to section config
+        custom_seats: Optional seat ids (e.g. "101_A_12") to resolve
 
     Returns:
-        Tuple of (all_seats, sample_seats, anchor_seats)
+        Dict with total_seats, tier_counts, sample_seats, custom_seats
     """
     import modal
 
     activity.heartbeat(f"Generating seats for {len(sections)} sections")
 
     generate_seats = modal.Function.from_name(MODAL_APP_NAME, "generate_seats")
-    result = generate_seats.remote(sections)
+    result = await generate_seats.remote.aio(sections, custom_seats)
 
-    activity.logger.info(f"Generated {len(result[0])} total seats, {len(result[2])} anchor seats")
+    activity.logger.info(f"Generated {result['total_seats']} total seats")
     return result
 
 
@@ -45,104 +60,192 @@ async def build_venue_model_activity(config: dict, sections: dict) -> Dict[str,
         sections: Section definitions
 
     Returns:
-        Dict with 'blend_file' (base64) and 'preview_image' (base64 or None)
+        Dict with 'blend_file' and 'preview_image' (None if not rendered) artifact refs
     """
     import modal
 
     activity.heartbeat("Building 3D venue model with Blender 4.2")
 
     build_venue = modal.Function.from_name(MODAL_APP_NAME, "build_venue_model")
-    result = build_venue.remote(config, sections)
+    result = await build_venue.remote.aio(config, sections)
 
     blend_bytes = result["blend_file"]
     preview_bytes = result.get("preview_image")
 
-    # Encode as base64 for workflow state persistence
-    blend_b64 = base64.b64encode(blend_bytes).decode('utf-8')
-    preview_b64 = base64.b64encode(preview_bytes).decode('utf-8') if preview_bytes else None
+    # Workflow state only holds refs; the bytes live in the artifact store
+    blend_ref = await asyncio.to_thread(put_artifact, blend_bytes)
+    preview_ref = await asyncio.to_thread(put_artifact, preview_bytes) if preview_bytes else None
 
     activity.logger.info(f"Built venue model: {len(blend_bytes)} bytes, preview: {len(preview_bytes) if preview_bytes else 0} bytes")
 
     return {
-        "blend_file": blend_b64,
-        "preview_image": preview_b64,
+        "blend_file": blend_ref,
+        "preview_image": preview_ref,
+    }
+
+
+def _depth_cache():
+    """
+    Depth cache backend from the DEPTH_CACHE env var:
+    "blob" (default, the blob store; "supabase" is an alias), "local"
+    (DEPTH_CACHE_DIR) or "off".
+    """
+    import os
+    from geometry.depth_cache import LocalDepthCache, ObjectStoreDepthCache
+    from blobs.store import blob_store
+
+    backend = os.environ.get("DEPTH_CACHE", "blob")
+    if backend == "local":
+        return LocalDepthCache(os.environ.get("DEPTH_CACHE_DIR", "/tmp/depth_cache"))
+
+    if backend in ("blob", "supabase"):
+        try:
+            return ObjectStoreDepthCache(blob_store())
+        except Exception as e:
+            activity.logger.warning(f"Depth cache unavailable: {e}")
+
+    return None
+
+
+async def _render_through_cache(
+    seats: List[dict],
+    geometry_hash: str,
+    render,
+    mirrors: Optional[Dict[str, List[List]]],
+    use_cache: bool,
+    batch_id: int,
+) -> Dict[str, Any]:
+    """
+    Serve seats from the depth cache, render only the misses with await
+    render(seats), store new renders, then derive mirrored seats.
+
+    Cache and artifact-store I/O runs in threads so the worker's event loop
+    stays free for other activities.
+    """
+    from geometry import expand_mirrored
+    from geometry.depth_cache import depth_cache_key
+
+    cache = _depth_cache() if use_cache else None
+    keys = {seat["id"]: depth_cache_key(geometry_hash, seat) for seat in seats}
+
+    depth_maps: Dict[str, bytes] = {}
+    if cache:
+        hits = await asyncio.to_thread(cache.get_many, list(keys.values()))
+        depth_maps = {seat_id: hits[key] for seat_id, key in keys.items() if key in hits}
+
+    misses = [seat for seat in seats if seat["id"] not in depth_maps]
+    activity.heartbeat(f"Batch {batch_id}: {len(depth_maps)} cached, rendering {len(misses)}")
+
+    if misses:
+        rendered = await render(misses)
+        depth_maps.update(rendered)
+        if cache:
+            try:
+                await asyncio.to_thread(
+                    cache.put_many,
+                    {keys[seat_id]: png_bytes for seat_id, png_bytes in rendered.items()},
+                )
+            except Exception as e:
+                activity.logger.warning(f"Failed to store depth maps in cache: {e}")
+
+    if mirrors:
+        depth_maps = await asyncio.to_thread(expand_mirrored, depth_maps, mirrors)
+
+    activity.logger.info(
+        f"Batch {batch_id}: {len(depth_maps)} depth maps "
+        f"({len(misses)} rendered, {len(seats) - len(misses)} cached)"
+    )
+
+    return {
+        # Refs only; mirrored seats with identical bytes share one artifact
+        "depth_maps": await asyncio.to_thread(
+            lambda: {seat_id: put_artifact(png_bytes) for seat_id, png_bytes in depth_maps.items()}
+        ),
+        "rendered": len(misses),
+        "cached": len(seats) - len(misses),
     }
 
 
 @activity.defn
 async def render_depth_maps_activity(
-    blend_file_b64: str,
+    blend_file_ref: str,
     seats: List[dict],
-    batch_id: int = 0
-) -> Dict[str, str]:
+    batch_id: int = 0,
+    mirrors: Optional[Dict[str, List[List]]] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
     """
     Render depth maps for a batch of seats.
 
+    Maps are cached by hash(.blend, camera pose, lens, resolution, encoding);
+    only cache misses are sent to Blender.
+
     Args:
-        blend_file_b64: Base64-encoded .blend file
+        blend_file_ref: Artifact ref of the .blend file
         seats: List of seat dictionaries to render
         batch_id: Batch identifier for logging
+        mirrors: Rendered seat_id -> [[mirrored seat_id, flip], ...] derived
+            from its depth map instead of rendered (see geometry.symmetry)
+        use_cache: Read and write the depth cache
 
     Returns:
-        Dictionary mapping seat_id to base64-encoded PNG bytes
+        Dict with 'depth_maps' (seat_id -> PNG artifact ref), 'rendered' and 'cached' counts
     """
     import modal
+    from geometry.depth_cache import blend_hash
 
     activity.heartbeat(f"Rendering depth maps batch {batch_id}: {len(seats)} seats")
 
-    # Decode blend file
-    blend_bytes = base64.b64decode(blend_file_b64)
-
+    blend_bytes = await asyncio.to_thread(artifact_bytes, blend_file_ref)
     render_depths = modal.Function.from_name(MODAL_APP_NAME, "render_depth_maps")
-    depth_maps = render_depths.remote(blend_bytes, seats)
-
-    # Encode results as base64
-    result = {}
-    for seat_id, png_bytes in depth_maps.items():
-        result[seat_id] = base64.b64encode(png_bytes).decode('utf-8')
-        activity.heartbeat(f"Rendered {seat_id}")
 
-    activity.logger.info(f"Rendered {len(result)} depth maps in batch {batch_id}")
-    return result
+    return await _render_through_cache(
+        seats, blend_hash(blend_bytes),
+        lambda misses: render_depths.remote.aio(blend_bytes, misses),
+        mirrors, use_cache, batch_id,
+    )
 
 
 @activity.defn
 async def generate_ai_image_activity(
-    depth_map_b64: str,
+    depth_map_ref: str,
     seat_id: str,
     prompt: str,
     model: str = "flux",
     strength: float = 0.75,
-    reference_image_b64: Optional[str] = None,
+    reference_image_ref: Optional[str] = None,
     ip_adapter_scale: float = 0.6
 ) -> Optional[str]:
     """
     Generate a single AI image from a depth map.
 
     Args:
-        depth_map_b64: Base64-encoded depth map PNG
+        depth_map_ref: Artifact ref of the depth map PNG
         seat_id: Seat identifier for logging
         prompt: Text prompt for generation
         model: Model to use (flux, sdxl, controlnet, ip_adapter)
         strength: Generation strength (0-1)
-        reference_image_b64: Optional base64-encoded reference image
+        reference_image_ref: Optional artifact ref (or base64) of a reference image
         ip_adapter_scale: Style influence strength (0-1)
 
     Returns:
-        Base64-encoded JPEG bytes, or None on failure
+        Artifact ref of the JPEG, or None on failure
+
+    Raises:
+        ApplicationError: type "RateLimited" when the provider throttles
     """
     import modal
 
     activity.heartbeat(f"Generating AI image for {seat_id} with {model}")
 
-    # Decode inputs
-    depth_bytes = base64.b64decode(depth_map_b64)
-    reference_bytes = base64.b64decode(reference_image_b64) if reference_image_b64 else None
+    # Fetch inputs from the artifact store
+    depth_bytes = await asyncio.to_thread(artifact_bytes, depth_map_ref)
+    reference_bytes = await asyncio.to_thread(artifact_bytes, reference_image_ref) if reference_image_ref else None
 
     generate_image = modal.Function.from_name(MODAL_APP_NAME, "generate_ai_image")
 
     try:
-        image_bytes = generate_image.remote(
+        image_bytes = await generate_image.remote.aio(
             depth_bytes,
             prompt,
             model,
@@ -153,11 +256,17 @@ async def generate_ai_image_activity(
 
         if image_bytes:
             activity.logger.info(f"Generated image for {seat_id}: {len(image_bytes)} bytes")
-            return base64.b64encode(image_bytes).decode('utf-8')
+            return await asyncio.to_thread(put_artifact, image_bytes)
 
         activity.logger.warning(f"No image returned for {seat_id}")
         return None
 
     except Exception as e:
+        from temporalio.exceptions import ApplicationError
+        from ..workflows.concurrency import RATE_LIMITED_ERROR, is_rate_limit_error
+
         activity.logger.error(f"Failed to generate image for {seat_id}: {e}")
+        # Throttles go straight back to the workflow's concurrency controller
+        if is_rate_limit_error(str(e)):
+            raise ApplicationError(f"Provider throttled {seat_id}: {e}", type=RATE_LIMITED_ERROR) from e
         raise
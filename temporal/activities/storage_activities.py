@@ -1,147 +1,244 @@
 """
 Temporal activities for file storage operations.
 
-These activities handle saving and loading files locally,
-providing durability checkpoints for the workflow.
+These activities save and load venue files through the blob store
+(see blobs/store.py), providing durability checkpoints for the workflow.
 """
 
-import base64
-import json
+import asyncio
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from temporalio import activity
 
+from blobs.manifest import DEPTH_MAP, FINAL_IMAGE, asset_entry, read_asset_manifest, list_folder
+from blobs.store import BlobStore, blob_store, supabase_client
+from blobs.variants import CONTENT_TYPES as VARIANT_CONTENT_TYPES, variant_path
+from .artifacts import artifact_bytes, put_artifact, storage_ref, storage_ref_path
+from .image_variants import build_variants
+from .uploads import Upload, record_assets, upload_files
+
 
 @activity.defn
-async def save_seats_json_activity(
-    venue_dir: str,
-    venue_id: str,
-    all_seats: List[dict],
-    anchor_seats: List[dict]
-) -> None:
+async def store_artifacts_activity(blobs: Dict[str, str]) -> Dict[str, str]:
     """
-    Save seat data to JSON files.
+    Move base64 payloads (e.g. reference images from the workflow input)
+    into the artifact store once, so later activities can pass refs.
 
     Args:
-        venue_dir: Path to venue directory
-        venue_id: Venue identifier
-        all_seats: Complete list of generated seats
-        anchor_seats: Subset of seats for rendering
+        blobs: Dictionary mapping name to base64-encoded bytes
+
+    Returns:
+        Dictionary mapping name to artifact ref
     """
-    venue_path = Path(venue_dir)
-    venue_path.mkdir(parents=True, exist_ok=True)
+    refs = await asyncio.to_thread(
+        lambda: {name: put_artifact(artifact_bytes(b64_data)) for name, b64_data in blobs.items()}
+    )
+    activity.logger.info(f"Stored {len(refs)} artifacts")
+    return refs
+
+
+def _previous_seat_manifest(store: BlobStore, venue_dir: str):
+    """The venue's stored seat manifest table (blob store first, then local), or None."""
+    from geometry import MANIFEST_FILENAME, read_seat_manifest
 
-    # Save all seats
-    seats_path = venue_path / "seats.json"
-    with open(seats_path, 'w') as f:
-        json.dump({"venue": venue_id, "seats": all_seats}, f, indent=2)
+    local_path = Path(venue_dir) / MANIFEST_FILENAME
+    try:
+        return read_seat_manifest(store.download(f"{Path(venue_dir).name}/{MANIFEST_FILENAME}"))
+    except KeyError:
+        pass
+    if local_path.exists():
+        return read_seat_manifest(local_path)
+    return None
 
-    # Save anchor seats
-    anchor_path = venue_path / "anchor_seats.json"
-    with open(anchor_path, 'w') as f:
-        json.dump(anchor_seats, f, indent=2)
 
-    activity.logger.info(f"Saved {len(all_seats)} seats and {len(anchor_seats)} anchors to {venue_dir}")
+def _save_seat_manifest(
+    store: BlobStore,
+    venue_dir: str,
+    venue_id: str,
+    sections: Dict[str, dict],
+    anchor_radius: Optional[float],
+    anchor_budget: Optional[int],
+    keep_anchors: bool,
+    planes: Optional[List[str]],
+) -> Tuple[Dict[str, Any], Dict[str, dict], str]:
+    """Blocking part of save_seat_manifest_activity: (result, asset entries, log summary)."""
+    from geometry import (
+        MANIFEST_FILENAME,
+        build_seat_manifest,
+        changed_seat_indices,
+        diff_sections,
+        generate_seat_arrays,
+        get_anchor_seats,
+        get_sample_seats,
+        manifest_section_hashes,
+        seat_manifest_to_bytes,
+        section_hashes,
+        write_seat_manifest,
+    )
+
+    local_path = Path(venue_dir) / MANIFEST_FILENAME
+    file_path = f"{Path(venue_dir).name}/{MANIFEST_FILENAME}"
+
+    previous = _previous_seat_manifest(store, venue_dir)
+    old_hashes = manifest_section_hashes(previous) if previous is not None else None
+
+    seats = generate_seat_arrays(sections)
+    new_hashes = section_hashes(sections)
+    diff = diff_sections(old_hashes, new_hashes)
+    changed = changed_seat_indices(seats, diff)
+
+    kept: List[int] = []
+    if keep_anchors and previous is not None:
+        unchanged = set(diff.unchanged)
+        previous = previous.filter(previous.column("anchor"))
+        kept = seats.locate_many(
+            f"{section}_{row}_{seat}"
+            for section, row, seat in zip(
+                previous.column("section").to_pylist(),
+                previous.column("row").to_pylist(),
+                previous.column("seat").to_pylist(),
+            )
+            if section in unchanged
+        ).tolist()
+    anchors = get_anchor_seats(
+        seats, radius=anchor_radius, budget=anchor_budget, fixed=kept, planes=planes or (),
+    )
+    new_anchors = sorted(set(anchors.tolist()) - set(kept))
+
+    manifest = build_seat_manifest(
+        seats,
+        anchor=anchors,
+        sample=get_sample_seats(seats),
+        changed=changed,
+        section_hashes=new_hashes,
+        metadata={"venue": venue_id},
+    )
+
+    manifest_path = write_seat_manifest(manifest, local_path)
+    result = {
+        "manifest_path": str(manifest_path),
+        "has_previous": old_hashes is not None,
+        "section_diff": diff.to_dict(),
+        "changed_seats": len(changed),
+        "anchor_seats": seats.to_dicts(anchors),
+        "new_anchor_ids": [seats.seat_id(i) for i in new_anchors],
+    }
+
+    manifest_bytes = seat_manifest_to_bytes(manifest)
+    content_type = "application/vnd.apache.arrow.file"
+    store.upload(
+        file_path,
+        manifest_bytes,
+        file_options={"content-type": content_type, "upsert": "true"}
+    )
+    result["manifest_url"] = store.get_public_url(file_path)
+    summary = (
+        f"Saved manifest with {len(seats)} seats to {manifest_path} "
+        f"({len(diff.dirty)} sections / {len(changed)} seats changed, "
+        f"{len(kept)} anchors kept / {len(new_anchors)} new)"
+    )
+    return result, {file_path: asset_entry(file_path, manifest_bytes, content_type)}, summary
 
 
 @activity.defn
-async def save_blend_file_activity(venue_dir: str, model_data: Dict[str, str]) -> Dict[str, str]:
+async def save_seat_manifest_activity(
+    venue_dir: str,
+    venue_id: str,
+    sections: Dict[str, dict],
+    anchor_radius: Optional[float] = None,
+    anchor_budget: Optional[int] = None,
+    keep_anchors: bool = False,
+    planes: Optional[List[str]] = None,
+) -> Dict[str, Any]:
     """
-    Save .blend file and preview image to Supabase Storage.
+    Pick the anchor seats and write the columnar seat manifest (seats.arrow)
+    for the whole bowl.
+
+    Seats are regenerated here from the section definitions (it takes
+    milliseconds) so the full bowl never travels through workflow history.
+    Anchor and sample sets are stored as boolean columns. Section content
+    hashes are compared with the previous manifest to flag changed seats.
+
+    With keep_anchors (incremental runs), the previous manifest's anchors in
+    unchanged sections stay anchors and sampling only adds the anchors needed
+    to cover what moved, so new_anchor_ids is exactly what still needs rendering.
+    With mirror planes, anchors are picked together with their mirror images.
 
     Args:
-        venue_dir: Path to venue directory (e.g., "venues/venue-uuid")
-        model_data: Dict with 'blend_file' and optional 'preview_image' (both base64)
+        venue_dir: Path to venue directory
+        venue_id: Venue identifier
+        sections: Section definitions used for seat generation
+        anchor_radius: Anchor coverage radius (see geometry.select_anchor_seats)
+        anchor_budget: Maximum number of anchor seats
+        keep_anchors: Keep the previous anchors of unchanged sections
+        planes: Mirror planes (geometry.mirror_planes()) the renders will use
 
     Returns:
-        Dict with URLs to saved files
+        Dict with 'manifest_path', 'manifest_url', 'has_previous',
+        'section_diff' (added/removed/changed/unchanged ids), 'changed_seats' count,
+        'anchor_seats' (seat dicts) and 'new_anchor_ids' (anchors not kept)
     """
-    import os
-    from supabase import create_client
+    store = blob_store()
+    # Seat generation, sampling and the manifest up/download block, so they run in a thread
+    result, entries, summary = await asyncio.to_thread(
+        _save_seat_manifest, store, venue_dir, venue_id, sections,
+        anchor_radius, anchor_budget, keep_anchors, planes,
+    )
+    await record_assets(store, Path(venue_dir).name, entries)
+
+    activity.logger.info(summary)
+    return result
 
-    venue_path = Path(venue_dir)
-    venue_id = venue_path.name
 
-    result = {}
+@activity.defn
+async def load_anchor_seats_activity(venue_dir: str) -> List[dict]:
+    """
+    Anchor seats recorded in the venue's stored seat manifest.
 
-    # Get Supabase client
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_KEY")
-    client = None
+    Args:
+        venue_dir: Path to venue directory
 
-    if supabase_url and supabase_key:
-        try:
-            client = create_client(supabase_url, supabase_key)
-        except Exception as e:
-            activity.logger.warning(f"Failed to create Supabase client: {e}")
+    Returns:
+        Seat dicts of the manifest's anchors (empty if there is no manifest)
+    """
+    from geometry import manifest_seats
 
-    # Upload blend file to Supabase
-    blend_b64 = model_data.get("blend_file")
-    if blend_b64:
-        blend_bytes = base64.b64decode(blend_b64)
+    manifest = await asyncio.to_thread(_previous_seat_manifest, blob_store(), venue_dir)
+    return manifest_seats(manifest, "anchor") if manifest is not None else []
 
-        if client:
-            try:
-                file_path = f"{venue_id}/venue_model.blend"
-                client.storage.from_("IMAGES").upload(
-                    file_path,
-                    blend_bytes,
-                    file_options={"content-type": "application/octet-stream", "upsert": "true"}
-                )
-                blend_url = client.storage.from_("IMAGES").get_public_url(file_path)
-                result["blend_url"] = blend_url
-                activity.logger.info(f"Uploaded blend file to Supabase: {file_path} ({len(blend_bytes)} bytes)")
-            except Exception as e:
-                activity.logger.warning(f"Failed to upload blend to Supabase: {e}")
-                # Fall back to local
-                venue_path.mkdir(parents=True, exist_ok=True)
-                blend_path = venue_path / "venue_model.blend"
-                with open(blend_path, 'wb') as f:
-                    f.write(blend_bytes)
-                result["blend_path"] = str(blend_path)
-        else:
-            # No Supabase, save locally
-            venue_path.mkdir(parents=True, exist_ok=True)
-            blend_path = venue_path / "venue_model.blend"
-            with open(blend_path, 'wb') as f:
-                f.write(blend_bytes)
-            result["blend_path"] = str(blend_path)
-            activity.logger.info(f"Saved blend file locally: {blend_path} ({len(blend_bytes)} bytes)")
-
-    # Upload preview image to Supabase
-    preview_b64 = model_data.get("preview_image")
-    if preview_b64:
-        preview_bytes = base64.b64decode(preview_b64)
-
-        if client:
-            try:
-                file_path = f"{venue_id}/preview.png"
-                client.storage.from_("IMAGES").upload(
-                    file_path,
-                    preview_bytes,
-                    file_options={"content-type": "image/png", "upsert": "true"}
-                )
-                preview_url = client.storage.from_("IMAGES").get_public_url(file_path)
-                result["preview_url"] = preview_url
-                activity.logger.info(f"Uploaded preview to Supabase: {file_path}")
-            except Exception as e:
-                activity.logger.warning(f"Failed to upload preview to Supabase: {e}")
-                # Fall back to local
-                preview_path = venue_path / "outputs" / "model_preview.png"
-                preview_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(preview_path, 'wb') as f:
-                    f.write(preview_bytes)
-                result["preview_path"] = str(preview_path)
-        else:
-            # No Supabase, save locally
-            preview_path = venue_path / "outputs" / "model_preview.png"
-            preview_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(preview_path, 'wb') as f:
-                f.write(preview_bytes)
-            result["preview_path"] = str(preview_path)
-            activity.logger.info(f"Saved preview locally: {preview_path}")
 
-    return result
+@activity.defn
+async def save_blend_file_activity(venue_dir: str, model_data: Dict[str, str]) -> Dict[str, str]:
+    """
+    Save .blend file and preview image to the blob store.
+
+    Args:
+        venue_dir: Path to venue directory (e.g., "venues/venue-uuid")
+        model_data: Dict with 'blend_file' and optional 'preview_image' (artifact refs)
+
+    Returns:
+        Dict with URLs to saved files
+    """
+    venue_id = Path(venue_dir).name
+
+    items = []
+    if model_data.get("blend_file"):
+        items.append(Upload(
+            key="blend",
+            storage_path=f"{venue_id}/venue_model.blend",
+            value=model_data["blend_file"],
+            content_type="application/octet-stream",
+        ))
+    if model_data.get("preview_image"):
+        items.append(Upload(
+            key="preview",
+            storage_path=f"{venue_id}/preview.png",
+            value=model_data["preview_image"],
+            content_type="image/png",
+        ))
+
+    uploads = await upload_files(items, venue_id=venue_id)
+    return {f"{upload.key}_url": upload.location for upload in uploads}
 
 
 @activity.defn
@@ -150,239 +247,234 @@ async def save_depth_maps_activity(
     depth_maps: Dict[str, str]
 ) -> Dict[str, str]:
     """
-    Save depth maps to Supabase Storage.
+    Save depth maps to the blob store.
 
     Args:
         venue_dir: Path to venue directory (e.g., "venues/venue-uuid")
-        depth_maps: Dictionary mapping seat_id to base64-encoded PNG
+        depth_maps: Dictionary mapping seat_id to PNG artifact ref
 
     Returns:
-        Dictionary mapping seat_id to Supabase URL
+        Dictionary mapping seat_id to public URL
     """
-    import os
-    from supabase import create_client
-
-    venue_path = Path(venue_dir)
-    venue_id = venue_path.name
+    venue_id = Path(venue_dir).name
 
-    # Get Supabase client
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_KEY")
-    client = None
-
-    if supabase_url and supabase_key:
-        try:
-            client = create_client(supabase_url, supabase_key)
-        except Exception as e:
-            activity.logger.warning(f"Failed to create Supabase client: {e}")
-
-    urls = {}
-    for seat_id, b64_data in depth_maps.items():
-        image_bytes = base64.b64decode(b64_data)
-
-        if client:
-            try:
-                file_path = f"{venue_id}/depth_maps/{seat_id}_depth.png"
-                client.storage.from_("IMAGES").upload(
-                    file_path,
-                    image_bytes,
-                    file_options={"content-type": "image/png", "upsert": "true"}
-                )
-                url = client.storage.from_("IMAGES").get_public_url(file_path)
-                urls[seat_id] = url
-            except Exception as e:
-                activity.logger.warning(f"Failed to upload depth map {seat_id}: {e}")
-                # Fall back to local
-                depth_dir = Path(venue_dir) / "outputs" / "depth_maps"
-                depth_dir.mkdir(parents=True, exist_ok=True)
-                path = depth_dir / f"{seat_id}_depth.png"
-                with open(path, 'wb') as f:
-                    f.write(image_bytes)
-                urls[seat_id] = str(path)
-        else:
-            # No Supabase, save locally
-            depth_dir = Path(venue_dir) / "outputs" / "depth_maps"
-            depth_dir.mkdir(parents=True, exist_ok=True)
-            path = depth_dir / f"{seat_id}_depth.png"
-            with open(path, 'wb') as f:
-                f.write(image_bytes)
-            urls[seat_id] = str(path)
-
-    activity.logger.info(f"Saved {len(urls)} depth maps to Supabase")
-    return urls
+    uploads = await upload_files([
+        Upload(
+            key=seat_id,
+            storage_path=f"{venue_id}/depth_maps/{seat_id}_depth.png",
+            value=depth_ref,
+            content_type="image/png",
+        )
+        for seat_id, depth_ref in depth_maps.items()
+    ], venue_id=venue_id)
+    return {upload.key: upload.location for upload in uploads}
 
 
 @activity.defn
 async def save_generated_images_activity(
     venue_dir: str,
-    images: Dict[str, str]
+    images: Dict[str, str],
+    seat_tiers: Optional[Dict[str, str]] = None,
 ) -> Dict[str, str]:
     """
-    Save generated images to Supabase Storage.
+    Save generated images and their responsive variants to the blob store,
+    and record them in the images table.
+
+    Each image is also stored as WebP (optionally AVIF) at several widths
+    (see image_variants.py) so galleries don't download the full JPEG.
 
     Args:
         venue_dir: Path to venue directory (e.g., "venues/venue-uuid")
-        images: Dictionary mapping seat_id to base64-encoded JPEG
+        images: Dictionary mapping seat_id to JPEG artifact ref
+        seat_tiers: Dictionary mapping seat_id to tier, for the images table
 
     Returns:
-        Dictionary mapping seat_id to Supabase URL
+        Dictionary mapping seat_id to public URL
     """
-    import os
-    from supabase import create_client
+    venue_id = Path(venue_dir).name
+
+    # Resolve each image once; the bytes feed both the upload and the encoder
+    seat_ids = list(images)
+    data = dict(zip(seat_ids, await asyncio.gather(
+        *(asyncio.to_thread(artifact_bytes, images[seat_id]) for seat_id in seat_ids)
+    )))
+    variants = await build_variants(data)
+
+    items = [
+        Upload(
+            key=seat_id,
+            storage_path=f"{venue_id}/final_images/{seat_id}_final.jpg",
+            content_type="image/jpeg",
+            data=data[seat_id],
+        )
+        for seat_id in seat_ids
+    ]
+    for seat_id, encoded in variants.items():
+        items.extend(
+            Upload(
+                key=f"{seat_id}/w{width}.{fmt}",
+                storage_path=variant_path(venue_id, seat_id, width, fmt),
+                content_type=VARIANT_CONTENT_TYPES[fmt],
+                data=variant_bytes,
+            )
+            for width, fmt, variant_bytes in encoded
+        )
+
+    urls = {upload.key: upload.location for upload in await upload_files(items, venue_id=venue_id)}
+
+    await asyncio.to_thread(_record_images, venue_id, [
+        {
+            "seat_id": seat_id,
+            "tier": (seat_tiers or {}).get(seat_id, "lower"),
+            "final_image_url": urls[seat_id],
+            "variants": [
+                {"url": urls[f"{seat_id}/w{width}.{fmt}"], "width": width, "format": fmt}
+                for width, fmt, _ in variants.get(seat_id, [])
+            ],
+        }
+        for seat_id in seat_ids
+    ])
+    return {seat_id: urls[seat_id] for seat_id in seat_ids}
+
+
+def _record_images(venue_id: str, images: List[dict]) -> None:
+    """
+    Upsert rows in the images table (skipped without Supabase; failures are logged).
 
-    venue_path = Path(venue_dir)
-    venue_id = venue_path.name
+    The API's nearest-view index (api/db/seat_views.py) is built from these
+    rows, falling back to a storage listing only when a venue has none.
+    """
+    client = supabase_client()
+    if client is None or not images:
+        return
+
+    rows = []
+    for image in images:
+        # Seat ids are "{section}_{row}_{seat}" (e.g. "101_A_12")
+        section, row, seat = image["seat_id"].rsplit("_", 2)
+        rows.append({
+            "venue_id": venue_id,
+            "section": section,
+            "row": row,
+            "seat": int(seat),
+            **image,
+        })
+    try:
+        client.table("images").upsert(rows, on_conflict="venue_id,seat_id").execute()
+    except Exception as e:
+        activity.logger.warning(f"Failed to record {len(rows)} images for {venue_id}: {e}")
 
-    # Get Supabase client
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_KEY")
-    client = None
 
-    if supabase_url and supabase_key:
-        try:
-            client = create_client(supabase_url, supabase_key)
-        except Exception as e:
-            activity.logger.warning(f"Failed to create Supabase client: {e}")
+def _existing_assets(store: BlobStore, venue_id: str, kind: str, folder: str, suffix: str) -> Dict[str, str]:
+    """
+    seat_id -> storage ref for a venue's files of one kind, without downloading them.
 
-    urls = {}
-    for seat_id, b64_data in images.items():
-        image_bytes = base64.b64decode(b64_data)
+    The asset manifest has every file and its sha256 in one read; venues
+    saved before it existed fall back to a paged listing (eTag as the hash).
+    """
+    result = {}
+    manifest = read_asset_manifest(store, venue_id)
+    if manifest is not None:
+        for path, entry in manifest.of_kind(kind).items():
+            seat_id = path.rsplit("/", 1)[-1].replace(suffix, "")
+            result[seat_id] = storage_ref(path, entry.get("sha256") or entry.get("etag"))
+        return result
 
-        if client:
-            try:
-                file_path = f"{venue_id}/final_images/{seat_id}_final.jpg"
-                client.storage.from_("IMAGES").upload(
-                    file_path,
-                    image_bytes,
-                    file_options={"content-type": "image/jpeg", "upsert": "true"}
-                )
-                url = client.storage.from_("IMAGES").get_public_url(file_path)
-                urls[seat_id] = url
-            except Exception as e:
-                activity.logger.warning(f"Failed to upload image {seat_id}: {e}")
-                # Fall back to local
-                images_dir = Path(venue_dir) / "outputs" / "final_images"
-                images_dir.mkdir(parents=True, exist_ok=True)
-                path = images_dir / f"{seat_id}_final.jpg"
-                with open(path, 'wb') as f:
-                    f.write(image_bytes)
-                urls[seat_id] = str(path)
-        else:
-            # No Supabase, save locally
-            images_dir = Path(venue_dir) / "outputs" / "final_images"
-            images_dir.mkdir(parents=True, exist_ok=True)
-            path = images_dir / f"{seat_id}_final.jpg"
-            with open(path, 'wb') as f:
-                f.write(image_bytes)
-            urls[seat_id] = str(path)
-
-    activity.logger.info(f"Saved {len(urls)} images to Supabase")
-    return urls
+    for f in list_folder(store, folder):
+        if f.get("name", "").endswith(suffix):
+            # Extract seat_id from filename (e.g., "103_Back_1_depth.png" -> "103_Back_1")
+            seat_id = f["name"].replace(suffix, "")
+            etag = ((f.get("metadata") or {}).get("eTag") or "").strip('"')
+            result[seat_id] = storage_ref(f"{folder}/{f['name']}", etag or None)
+    return result
 
 
 @activity.defn
 async def load_existing_images_activity(venue_dir: str) -> Dict[str, str]:
     """
-    Load existing generated images for resume capability.
+    Find existing generated images for resume capability.
 
     Args:
         venue_dir: Path to venue directory
 
     Returns:
-        Dictionary mapping seat_id to file path (not bytes, to save memory)
+        Dictionary mapping seat_id to a storage ref (not bytes, to save memory)
     """
-    images_dir = Path(venue_dir) / "outputs" / "final_images"
-    if not images_dir.exists():
+    venue_id = Path(venue_dir).name
+    try:
+        result = await asyncio.to_thread(
+            _existing_assets, blob_store(), venue_id, FINAL_IMAGE, f"{venue_id}/final_images", "_final.jpg"
+        )
+    except Exception as e:
+        activity.logger.warning(f"Failed to list existing images: {e}")
         return {}
 
-    result = {}
-    for path in images_dir.glob("*_final.jpg"):
-        seat_id = path.stem.replace("_final", "")
-        result[seat_id] = str(path)
-
-    activity.logger.info(f"Found {len(result)} existing images in {images_dir}")
+    activity.logger.info(f"Found {len(result)} existing images for {venue_id}")
     return result
 
 
 @activity.defn
 async def load_existing_blend_activity(venue_id: str) -> Optional[str]:
     """
-    Load existing .blend file from Supabase Storage.
+    Load existing .blend file from the blob store.
 
     Args:
         venue_id: Venue identifier
 
     Returns:
-        Base64-encoded blend file, or None if not found
+        Artifact ref of the blend file, or None if not found
     """
-    import os
-    from supabase import create_client
-
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_KEY")
-
-    if not supabase_url or not supabase_key:
-        activity.logger.warning("Supabase not configured, cannot load existing blend file")
-        return None
-
+    file_path = f"{venue_id}/venue_model.blend"
     try:
-        client = create_client(supabase_url, supabase_key)
-        file_path = f"{venue_id}/venue_model.blend"
+        blend_bytes = await asyncio.to_thread(blob_store().download, file_path)
+    except KeyError:
+        activity.logger.warning(f"No existing blend file at {file_path}")
+        return None
 
-        blend_bytes = client.storage.from_("IMAGES").download(file_path)
-        if blend_bytes:
-            activity.logger.info(f"Loaded existing blend file: {len(blend_bytes)} bytes")
-            return base64.b64encode(blend_bytes).decode('utf-8')
-    except Exception as e:
-        activity.logger.warning(f"Failed to load blend file from Supabase: {e}")
-
-    return None
+    activity.logger.info(f"Loaded existing blend file: {len(blend_bytes)} bytes")
+    return await asyncio.to_thread(put_artifact, blend_bytes)
 
 
 @activity.defn
-async def load_existing_depth_maps_activity(venue_id: str) -> Dict[str, str]:
+async def load_existing_depth_maps_activity(venue_id: str, lazy: bool = True) -> Dict[str, str]:
     """
-    Load existing depth maps from Supabase Storage.
+    Find existing depth maps in the blob store for resume.
+
+    By default nothing is downloaded: each seat maps to a storage ref (object
+    path plus its sha256, or eTag for files the asset manifest doesn't
+    hash) and the activity that needs the PNG fetches it, so resuming a
+    large venue moves a listing rather than every depth map.
 
     Args:
         venue_id: Venue identifier
+        lazy: False downloads every PNG into the artifact store up front
 
     Returns:
-        Dictionary mapping seat_id to base64-encoded PNG
+        Dictionary mapping seat_id to a storage ref (lazy) or PNG artifact ref
     """
-    import os
-    from supabase import create_client
-
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_KEY")
-
-    if not supabase_url or not supabase_key:
-        activity.logger.warning("Supabase not configured, cannot load existing depth maps")
-        return {}
-
     try:
-        client = create_client(supabase_url, supabase_key)
-        bucket = client.storage.from_("IMAGES")
-
-        # List depth maps
-        depth_files = bucket.list(f"{venue_id}/depth_maps")
-        result = {}
-
-        for f in depth_files:
-            if f.get("id") and f.get("name", "").endswith(".png"):
-                file_path = f"{venue_id}/depth_maps/{f['name']}"
-                try:
-                    depth_bytes = bucket.download(file_path)
-                    if depth_bytes:
-                        # Extract seat_id from filename (e.g., "103_Back_1_depth.png" -> "103_Back_1")
-                        seat_id = f["name"].replace("_depth.png", "")
-                        result[seat_id] = base64.b64encode(depth_bytes).decode('utf-8')
-                except Exception as e:
-                    activity.logger.warning(f"Failed to download {file_path}: {e}")
-
-        activity.logger.info(f"Loaded {len(result)} existing depth maps from Supabase")
-        return result
-
+        result = await asyncio.to_thread(
+            _existing_assets, blob_store(), venue_id, DEPTH_MAP, f"{venue_id}/depth_maps", "_depth.png"
+        )
     except Exception as e:
         activity.logger.warning(f"Failed to list depth maps: {e}")
         return {}
+
+    if not lazy:
+        def fetch(seat_id: str, ref: str):
+            try:
+                return seat_id, put_artifact(artifact_bytes(ref))
+            except Exception as e:
+                activity.logger.warning(f"Failed to download {storage_ref_path(ref)}: {e}")
+                return seat_id, None
+
+        fetched = await asyncio.gather(
+            *(asyncio.to_thread(fetch, seat_id, ref) for seat_id, ref in result.items())
+        )
+        result = {seat_id: ref for seat_id, ref in fetched if ref}
+
+    activity.logger.info(
+        f"Found {len(result)} existing depth maps"
+        f"{'' if lazy else ' (downloaded)'}"
+    )
+    return result
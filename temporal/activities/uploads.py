@@ -0,0 +1,142 @@
+"""
+Bulk uploads to the blob store for the storage activities.
+
+The worker process keeps one blob store (see blobs/store.py) instead of a
+client per activity call. Files are resolved (artifact fetch or base64
+decode) and uploaded on a bounded thread pool, and each file's latency is
+reported, so a 300-image batch costs seconds rather than 300 round trips
+in a row. Uploaded files are recorded in the venue's asset manifest (see
+blobs/manifest.py) with one update per batch.
+
+Parallelism comes from the STORAGE_UPLOAD_CONCURRENCY env var (default 16).
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from temporalio import activity
+
+from blobs.manifest import asset_entry, update_asset_manifest
+from blobs.store import BlobStore, blob_store
+from .artifacts import artifact_bytes
+
+DEFAULT_UPLOAD_CONCURRENCY = 16
+
+
+def upload_concurrency() -> int:
+    return max(1, int(os.environ.get("STORAGE_UPLOAD_CONCURRENCY", DEFAULT_UPLOAD_CONCURRENCY)))
+
+
+@dataclass
+class Upload:
+    """One file to store: its bytes (or an artifact ref / base64 string) and where it goes."""
+    key: str                            # e.g. seat_id
+    storage_path: str                   # Path in the blob store
+    content_type: str
+    value: Optional[str] = None         # Artifact ref or base64
+    data: Optional[bytes] = None        # Bytes already at hand (value is then ignored)
+
+
+@dataclass
+class UploadResult:
+    key: str
+    location: Optional[str] = None      # Public URL; None when the upload failed
+    size: int = 0
+    seconds: float = 0.0                # Resolve + upload time for this file
+    error: Optional[str] = None
+    manifest_entry: Optional[dict] = None  # Set when uploaded (size, sha256, ...)
+
+
+def _store_one(store: BlobStore, item: Upload) -> UploadResult:
+    start = time.perf_counter()
+    try:
+        data = item.data if item.data is not None else artifact_bytes(item.value)
+        store.upload(
+            item.storage_path,
+            data,
+            file_options={"content-type": item.content_type, "upsert": "true"}
+        )
+    except Exception as e:
+        return UploadResult(key=item.key, seconds=time.perf_counter() - start, error=str(e))
+
+    return UploadResult(
+        key=item.key,
+        location=store.get_public_url(item.storage_path),
+        size=len(data),
+        seconds=time.perf_counter() - start,
+        manifest_entry=asset_entry(item.storage_path, data, item.content_type),
+    )
+
+
+async def upload_files(
+    items: List[Upload],
+    concurrency: Optional[int] = None,
+    venue_id: Optional[str] = None,
+) -> List[UploadResult]:
+    """
+    Store files concurrently, at most `concurrency` at a time.
+
+    Logs a latency summary for the batch. With venue_id, uploaded files are
+    recorded in that venue's asset manifest. Results keep the order of items.
+
+    Raises RuntimeError if any upload failed (after recording the rest), so
+    the activity is retried; uploads upsert, so a retry is safe.
+    """
+    if not items:
+        return []
+
+    store = blob_store()
+    workers = min(concurrency or upload_concurrency(), len(items))
+
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="storage-upload") as pool:
+        results = await asyncio.gather(
+            *(loop.run_in_executor(pool, _store_one, store, item) for item in items)
+        )
+    wall = time.perf_counter() - start
+
+    failed = [result for result in results if result.error]
+    for result in failed:
+        activity.logger.warning(f"Failed to upload {result.key}: {result.error}")
+    activity.logger.info(upload_summary(results, wall, workers))
+
+    entries = {
+        item.storage_path: result.manifest_entry
+        for item, result in zip(items, results) if result.manifest_entry
+    }
+    if venue_id and entries:
+        await record_assets(store, venue_id, entries)
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(items)} uploads failed, e.g. {failed[0].key}: {failed[0].error}")
+    return list(results)
+
+
+async def record_assets(store: BlobStore, venue_id: str, entries: Dict[str, dict]) -> None:
+    """Add entries to the venue's asset manifest; a failure is logged, not raised."""
+    try:
+        manifest = await asyncio.to_thread(update_asset_manifest, store, venue_id, entries)
+        activity.logger.info(f"Asset manifest for {venue_id} at version {manifest.version}")
+    except Exception as e:
+        activity.logger.warning(f"Failed to update asset manifest for {venue_id}: {e}")
+
+
+def upload_summary(results: List[UploadResult], wall_seconds: float, workers: int) -> str:
+    """One-line batch report: count, bytes, wall time and per-file latency percentiles."""
+    latencies = sorted(result.seconds for result in results)
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+    failed = sum(1 for result in results if result.error)
+    total_mb = sum(result.size for result in results) / 1e6
+    return (
+        f"Stored {len(results) - failed} of {len(results)} files ("
+        f"{total_mb:.1f} MB) in {wall_seconds:.2f}s with {workers} workers; per file "
+        f"p50 {percentile(0.5) * 1000:.0f}ms, p95 {percentile(0.95) * 1000:.0f}ms, "
+        f"max {latencies[-1] * 1000:.0f}ms"
+    )
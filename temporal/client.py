@@ -8,9 +8,15 @@ import os
 from typing import Optional
 from temporalio.client import Client, TLSConfig
 
-# Default task queue for venue pipeline
+# Default task queue for venue pipeline (workflows and lightweight activities)
 TASK_QUEUE = "venue-pipeline-queue"
 
+# Activity task queues, one worker pool per resource class (see temporal/worker.py)
+LIGHTWEIGHT_TASK_QUEUE = TASK_QUEUE
+BLENDER_TASK_QUEUE = "venue-blender-queue"
+GENERATION_TASK_QUEUE = "venue-generation-queue"
+STORAGE_TASK_QUEUE = "venue-storage-queue"
+
 
 async def get_temporal_client() -> Client:
     """
@@ -62,6 +68,27 @@ async def get_temporal_client() -> Client:
     return client
 
 
+async def ensure_rate_limiter(client: Client) -> None:
+    """
+    Start the shared GenerationRateLimiterWorkflow unless it's already running.
+
+    Called by workers on startup and before pipelines start; idempotent.
+    """
+    from temporalio.exceptions import WorkflowAlreadyStartedError
+    from .workflows.rate_limiter import RATE_LIMITER_WORKFLOW_ID, GenerationRateLimiterWorkflow
+    from .workflows.types import RateLimiterInput
+
+    try:
+        await client.start_workflow(
+            GenerationRateLimiterWorkflow.run,
+            RateLimiterInput(),
+            id=RATE_LIMITER_WORKFLOW_ID,
+            task_queue=TASK_QUEUE,
+        )
+    except WorkflowAlreadyStartedError:
+        pass
+
+
 # Singleton pattern for reuse
 _client: Optional[Client] = None
 
@@ -1,30 +1,64 @@
 """
-Temporal worker for the venue pipeline.
+Temporal workers for the venue pipeline.
 
-Run this to start processing workflows:
+Activities are split by resource class, each on its own task queue with its
+own worker pool, so e.g. a storage backlog can't take the slots rendering
+needs:
+
+    lightweight  workflows + quick activities  (venue-pipeline-queue)
+    blender      model builds, depth renders   (venue-blender-queue)
+    generation   AI image generation           (venue-generation-queue)
+    storage      blob store uploads/downloads  (venue-storage-queue)
+
+Run every pool in one process:
     python -m temporal.worker
 
-Or with local dev server:
+Or scale pools separately (one process per pool, as many as needed):
+    python -m temporal.worker --pools generation
+    python -m temporal.worker --pools blender,storage
+
+With local dev server:
     TEMPORAL_LOCAL=true python -m temporal.worker
+
+Concurrency per pool and process (env vars):
+    TEMPORAL_<POOL>_MAX_CONCURRENT_ACTIVITIES  e.g. TEMPORAL_GENERATION_MAX_CONCURRENT_ACTIVITIES
+    TEMPORAL_MAX_CONCURRENT_WORKFLOW_TASKS     lightweight pool, default 50
+
+Processes running the storage pool also prune expired activity artifacts
+(ARTIFACT_TTL_HOURS, see activities/artifacts.py) every few hours.
 """
 
 import asyncio
 import logging
+import os
 import sys
-from pathlib import Path
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
 
+from temporalio.client import Client
 from temporalio.worker import Worker
 
-from .client import get_temporal_client, TASK_QUEUE
-from .workflows.venue_pipeline import VenuePipelineWorkflow
+from .client import (
+    BLENDER_TASK_QUEUE,
+    GENERATION_TASK_QUEUE,
+    LIGHTWEIGHT_TASK_QUEUE,
+    STORAGE_TASK_QUEUE,
+    ensure_rate_limiter,
+    get_temporal_client,
+)
+from .workflows.rate_limiter import GenerationRateLimiterWorkflow
+from .workflows.venue_pipeline import VenuePipelineWorkflow, VenueShardWorkflow
 from .activities.modal_activities import (
     generate_seats_activity,
     build_venue_model_activity,
     render_depth_maps_activity,
     generate_ai_image_activity,
 )
+from .activities.artifacts import prune_artifacts
 from .activities.storage_activities import (
-    save_seats_json_activity,
+    store_artifacts_activity,
+    save_seat_manifest_activity,
+    load_anchor_seats_activity,
     save_blend_file_activity,
     save_depth_maps_activity,
     save_generated_images_activity,
@@ -43,49 +77,156 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def run_worker():
-    """Run the Temporal worker for venue pipeline."""
-    logger.info("Connecting to Temporal...")
-    client = await get_temporal_client()
-    logger.info(f"Connected to Temporal namespace: {client.namespace}")
+@dataclass(frozen=True)
+class WorkerPool:
+    """One task queue and the activities (and workflows) its workers run."""
+    name: str
+    task_queue: str
+    activities: Sequence[Callable]
+    max_concurrent_activities: int
+    workflows: Sequence[type] = ()
 
-    # Create worker
-    worker = Worker(
-        client,
-        task_queue=TASK_QUEUE,
-        workflows=[VenuePipelineWorkflow],
+
+# Activities await Modal (.remote.aio) instead of blocking the event loop, so
+# the limits are about downstream capacity, not worker threads
+WORKER_POOLS: Dict[str, WorkerPool] = {
+    "lightweight": WorkerPool(
+        name="lightweight",
+        task_queue=LIGHTWEIGHT_TASK_QUEUE,
+        workflows=[VenuePipelineWorkflow, VenueShardWorkflow, GenerationRateLimiterWorkflow],
         activities=[
-            # Modal activities (cloud compute)
             generate_seats_activity,
+            store_artifacts_activity,
+            load_existing_images_activity,
+        ],
+        max_concurrent_activities=50,
+    ),
+    "blender": WorkerPool(
+        name="blender",
+        task_queue=BLENDER_TASK_QUEUE,
+        activities=[
             build_venue_model_activity,
             render_depth_maps_activity,
-            generate_ai_image_activity,
-            # Storage activities (Supabase I/O)
-            save_seats_json_activity,
+        ],
+        max_concurrent_activities=8,
+    ),
+    "generation": WorkerPool(
+        name="generation",
+        task_queue=GENERATION_TASK_QUEUE,
+        activities=[generate_ai_image_activity],
+        max_concurrent_activities=32,
+    ),
+    "storage": WorkerPool(
+        name="storage",
+        task_queue=STORAGE_TASK_QUEUE,
+        activities=[
+            save_seat_manifest_activity,
+            load_anchor_seats_activity,
             save_blend_file_activity,
             save_depth_maps_activity,
             save_generated_images_activity,
-            load_existing_images_activity,
             load_existing_blend_activity,
             load_existing_depth_maps_activity,
         ],
-    )
+        max_concurrent_activities=16,
+    ),
+}
+
+DEFAULT_MAX_CONCURRENT_WORKFLOW_TASKS = 50
+
+ARTIFACT_PRUNE_INTERVAL_SECONDS = 6 * 3600
+
+
+def pool_max_concurrent_activities(pool: WorkerPool) -> int:
+    """Pool size: TEMPORAL_<POOL>_MAX_CONCURRENT_ACTIVITIES env var or the pool default."""
+    env_var = f"TEMPORAL_{pool.name.upper()}_MAX_CONCURRENT_ACTIVITIES"
+    return int(os.environ.get(env_var, pool.max_concurrent_activities))
+
+
+def create_workers(client: Client, pools: Optional[List[str]] = None) -> List[Worker]:
+    """One Worker per pool (all pools by default)."""
+    workers = []
+    for name in pools or list(WORKER_POOLS):
+        pool = WORKER_POOLS[name]
+        max_activities = pool_max_concurrent_activities(pool)
+        options = {}
+        if pool.workflows:
+            options["max_concurrent_workflow_tasks"] = int(
+                os.environ.get("TEMPORAL_MAX_CONCURRENT_WORKFLOW_TASKS", DEFAULT_MAX_CONCURRENT_WORKFLOW_TASKS)
+            )
+        workers.append(Worker(
+            client,
+            task_queue=pool.task_queue,
+            workflows=list(pool.workflows),
+            activities=list(pool.activities),
+            max_concurrent_activities=max_activities,
+            **options,
+        ))
+        logger.info(
+            f"Pool {name}: task queue {pool.task_queue}, "
+            f"{len(pool.activities)} activities, {max_activities} concurrent"
+        )
+    return workers
+
+
+async def prune_artifacts_periodically(interval: float = ARTIFACT_PRUNE_INTERVAL_SECONDS):
+    """Delete expired artifacts every interval seconds, until cancelled."""
+    while True:
+        try:
+            removed = await asyncio.to_thread(prune_artifacts)
+            logger.info(f"Pruned {removed} expired artifacts")
+        except Exception as e:
+            logger.warning(f"Artifact pruning failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def start_artifact_pruning(pools: Optional[List[str]] = None) -> Optional[asyncio.Task]:
+    """Background pruning task if this process runs the storage pool (cancel it on shutdown)."""
+    if "storage" not in (pools or list(WORKER_POOLS)):
+        return None
+    return asyncio.create_task(prune_artifacts_periodically())
+
+
+async def run_worker(pools: Optional[List[str]] = None):
+    """Run the Temporal worker pools for venue pipeline."""
+    logger.info("Connecting to Temporal...")
+    client = await get_temporal_client()
+    logger.info(f"Connected to Temporal namespace: {client.namespace}")
+
+    workers = create_workers(client, pools)
+
+    # Shared rate limiter for AI generation across all pipelines
+    await ensure_rate_limiter(client)
 
-    logger.info(f"Starting worker on task queue: {TASK_QUEUE}")
     logger.info("Press Ctrl+C to stop")
+    pruning = start_artifact_pruning(pools)
 
     try:
-        await worker.run()
+        await asyncio.gather(*(worker.run() for worker in workers))
     except asyncio.CancelledError:
         logger.info("Worker shutdown requested")
     finally:
+        if pruning is not None:
+            pruning.cancel()
         logger.info("Worker stopped")
 
 
 def main():
     """Entry point for the worker."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Temporal workers for the venue pipeline")
+    parser.add_argument("--pools", default=",".join(WORKER_POOLS),
+                        help=f"Comma-separated pools to run (default: all of {', '.join(WORKER_POOLS)})")
+    args = parser.parse_args()
+
+    pools = [name.strip() for name in args.pools.split(",") if name.strip()]
+    unknown = [name for name in pools if name not in WORKER_POOLS]
+    if unknown:
+        parser.error(f"Unknown pools: {', '.join(unknown)}")
+
     try:
-        asyncio.run(run_worker())
+        asyncio.run(run_worker(pools))
     except KeyboardInterrupt:
         logger.info("Worker interrupted by user")
 
@@ -1,10 +1,13 @@
 """Temporal workflow definitions."""
 
-from .venue_pipeline import VenuePipelineWorkflow
+from .venue_pipeline import VenuePipelineWorkflow, VenueShardWorkflow
+from .rate_limiter import GenerationRateLimiterWorkflow
 from .types import VenuePipelineInput, PipelineProgress, PipelineResult, PipelineStage
 
 __all__ = [
     "VenuePipelineWorkflow",
+    "VenueShardWorkflow",
+    "GenerationRateLimiterWorkflow",
     "VenuePipelineInput",
     "PipelineProgress",
     "PipelineResult",
@@ -0,0 +1,108 @@
+"""
+Concurrency and rate control for rate-limited generation providers.
+
+AIMDController sizes one run's in-flight window: it raises the allowed
+number of calls additively while calls succeed (about +1 per window of
+successes, like TCP congestion avoidance) and halves it when the provider
+throttles, so throughput tracks the provider's real limit instead of a fixed
+batch size. TokenBucket caps the request rate shared by all runs (see
+rate_limiter.py).
+
+Pure Python and deterministic, so both can live in workflow state.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+# Error text that marks a provider rate limit (Replicate, OpenAI, HTTP 429)
+RATE_LIMIT_MARKERS = ("429", "rate limit", "too many requests", "throttled")
+
+# ApplicationError type raised by activities when the provider throttles
+RATE_LIMITED_ERROR = "RateLimited"
+
+
+def is_rate_limit_error(message: str) -> bool:
+    message = message.lower()
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+@dataclass
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    Attributes:
+        limit: Current (fractional) limit; `current` is the usable slot count
+        min_limit: Never go below this many in-flight calls
+        max_limit: Never go above this many in-flight calls
+        increase: Slots added per `current` successes
+        decrease: Factor applied to the limit on a throttle
+        epoch: Bumped on every decrease. Calls started in an older epoch
+            don't decrease again, so one throttling burst halves once.
+    """
+    limit: float = 2.0
+    min_limit: int = 1
+    max_limit: int = 16
+    increase: float = 1.0
+    decrease: float = 0.5
+    epoch: int = 0
+    successes: int = 0
+    throttles: int = 0
+
+    @classmethod
+    def fixed(cls, limit: int) -> "AIMDController":
+        """A controller pinned at `limit` (adaptation off)."""
+        return cls(limit=float(limit), min_limit=limit, max_limit=limit)
+
+    @property
+    def current(self) -> int:
+        return max(self.min_limit, min(self.max_limit, int(self.limit)))
+
+    def on_success(self) -> None:
+        self.successes += 1
+        self.limit = min(float(self.max_limit), self.limit + self.increase / max(self.limit, 1.0))
+
+    def on_throttle(self, started_epoch: int) -> bool:
+        """Record a throttle of a call started in `started_epoch`; True if the limit dropped."""
+        self.throttles += 1
+        if started_epoch != self.epoch:
+            return False
+        self.limit = max(float(self.min_limit), self.limit * self.decrease)
+        self.epoch += 1
+        return True
+
+
+@dataclass
+class TokenBucket:
+    """
+    Token bucket: `rate` tokens per second, holding at most `burst`. A rate
+of 0 never refills.
+
+    Times are plain seconds (e.g. workflow.now().timestamp()) so the bucket
+    stays deterministic inside a workflow.
+    """
+    rate: float
+    burst: float
+    tokens: float = 0.0
+    updated: float = 0.0
+
+    def refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def try_take(self, now: float) -> bool:
+        self.refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def seconds_until_token(self, now: float) -> Optional[float]:
+        """Seconds until try_take() can succeed; None if it never will (rate 0)."""
+        self.refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        if self.rate <= 0:
+            return None
+        return (1.0 - self.tokens) / self.rate
@@ -0,0 +1,212 @@
+"""
+Global rate limiter for AI generation calls.
+
+One long-lived GenerationRateLimiterWorkflow (id RATE_LIMITER_WORKFLOW_ID)
+is shared by every VenuePipelineWorkflow. Before each generation a pipeline
+signals request_permit(); the limiter answers with a "permit_granted" signal
+when the model's token bucket allows it. Budgets are per model (Replicate
+and OpenAI models have separate limits), so three venues running at once
+share one budget instead of tripling the provider load.
+
+Fair share: a model's pending requests are queued per venue and granted
+round-robin across venues, so a 2,000-seat stadium can't starve a 200-seat
+theatre that queued later. A pipeline that gives up waiting signals
+withdraw_permit() so its request doesn't spend a token later. A budget of
+0 per minute pauses the model until it's raised with set_budget().
+
+Local testing against the dev server:
+    temporal server start-dev
+    TEMPORAL_LOCAL=true python -m temporal.worker   # starts the limiter too
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from temporalio import workflow
+
+from .concurrency import TokenBucket
+from .types import ModelBudget, PermitRequest, RateLimiterInput
+
+RATE_LIMITER_WORKFLOW_ID = "generation-rate-limiter"
+
+# Signal name the limiter sends back to the requesting workflow
+PERMIT_GRANTED_SIGNAL = "permit_granted"
+
+# Requests per minute across all venues; "default" covers unlisted models
+DEFAULT_MODEL_BUDGETS: Dict[str, ModelBudget] = {
+    "flux": ModelBudget(per_minute=60, burst=6),
+    "flux-dev": ModelBudget(per_minute=60, burst=6),
+    "flux-schnell": ModelBudget(per_minute=120, burst=10),
+    "flux-controlnet": ModelBudget(per_minute=60, burst=6),
+    "sdxl": ModelBudget(per_minute=60, burst=6),
+    "controlnet": ModelBudget(per_minute=60, burst=6),
+    "ip_adapter": ModelBudget(per_minute=60, burst=6),
+    "dall-e-3": ModelBudget(per_minute=15, burst=2),
+    "default": ModelBudget(per_minute=30, burst=3),
+}
+
+# Keep history bounded: continue-as-new after this many grants
+CONTINUE_AS_NEW_AFTER_GRANTS = 500
+
+
+@workflow.defn
+class GenerationRateLimiterWorkflow:
+    """Token bucket per model with round-robin fair share between venues."""
+
+    def __init__(self):
+        self._budgets: Dict[str, ModelBudget] = dict(DEFAULT_MODEL_BUDGETS)
+        self._budget_overrides: Dict[str, ModelBudget] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        # model -> venue -> queued requests (dicts keep arrival order of venues)
+        self._pending: Dict[str, Dict[str, List[PermitRequest]]] = {}
+        # model -> venue granted last, for round-robin
+        self._last_venue: Dict[str, str] = {}
+        self._granted = 0
+        self._wake = False
+
+    @workflow.signal
+    def request_permit(self, request: PermitRequest):
+        """Queue a request for one generation call."""
+        self._pending.setdefault(request.model, {}).setdefault(request.venue_id, []).append(request)
+        self._wake = True
+
+    @workflow.signal
+    def withdraw_permit(self, request_id: str):
+        """Drop a queued request whose workflow stopped waiting for it."""
+        for model, venues in list(self._pending.items()):
+            for venue, requests in list(venues.items()):
+                venues[venue] = [r for r in requests if r.request_id != request_id]
+                if not venues[venue]:
+                    del venues[venue]
+            if not venues:
+                del self._pending[model]
+
+    @workflow.signal
+    def set_budget(self, model: str, budget: ModelBudget):
+        """Change a model's budget at runtime."""
+        self._budgets[model] = budget
+        self._budget_overrides[model] = budget
+        self._buckets.pop(model, None)
+        self._wake = True
+
+    @workflow.query
+    def get_state(self) -> Dict[str, dict]:
+        """Per model: budget, tokens left and queued requests per venue."""
+        return {
+            model: {
+                "per_minute": self._budget(model).per_minute,
+                "tokens": self._buckets[model].tokens if model in self._buckets else None,
+                "queued": {venue: len(requests) for venue, requests in venues.items()},
+            }
+            for model, venues in self._pending.items()
+        }
+
+    @workflow.run
+    async def run(self, input: RateLimiterInput) -> None:
+        self._budgets.update(input.budgets)
+        self._budget_overrides.update(input.budgets)
+        now = workflow.now().timestamp()
+        for model, tokens in input.tokens.items():
+            self._bucket(model, now).tokens = tokens
+        for request in input.pending:
+            self.request_permit(request)
+
+        while True:
+            # Cleared first so requests arriving while grants are sent aren't missed
+            self._wake = False
+            wait = await self._grant_available()
+
+            if self._granted >= CONTINUE_AS_NEW_AFTER_GRANTS or workflow.info().is_continue_as_new_suggested():
+                workflow.continue_as_new(self._snapshot())
+
+            try:
+                # Sleep until a token is due or a new request/budget arrives
+                await workflow.wait_condition(
+                    lambda: self._wake,
+                    timeout=timedelta(seconds=wait) if wait is not None else None,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def _budget(self, model: str) -> ModelBudget:
+        return self._budgets.get(model) or self._budgets["default"]
+
+    def _bucket(self, model: str, now: float) -> TokenBucket:
+        bucket = self._buckets.get(model)
+        if bucket is None:
+            budget = self._budget(model)
+            rate = max(0.0, budget.per_minute / 60.0)
+            bucket = TokenBucket(
+                rate=rate,
+                burst=float(budget.burst),
+                # A paused model (0/min) doesn't get its burst either
+                tokens=float(budget.burst) if rate > 0 else 0.0,
+                updated=now,
+            )
+            self._buckets[model] = bucket
+        return bucket
+
+    def _next_request(self, model: str) -> Optional[PermitRequest]:
+        """Pop the next request for a model, round-robin across venues."""
+        venues = self._pending.get(model)
+        if not venues:
+            return None
+        order = list(venues)
+        last = self._last_venue.get(model)
+        start = (order.index(last) + 1) % len(order) if last in venues else 0
+        venue = order[start]
+
+        request = venues[venue].pop(0)
+        if not venues[venue]:
+            del venues[venue]
+        if not venues:
+            del self._pending[model]
+        self._last_venue[model] = venue
+        return request
+
+    async def _grant_available(self) -> Optional[float]:
+        """Grant every request a token is available for; seconds until the next token is needed."""
+        now = workflow.now().timestamp()
+        grants: List[PermitRequest] = []
+        wait: Optional[float] = None
+
+        for model in list(self._pending):
+            bucket = self._bucket(model, now)
+            while model in self._pending and bucket.try_take(now):
+                grants.append(self._next_request(model))
+            if model in self._pending:
+                until = bucket.seconds_until_token(now)
+                # None: paused, woken by set_budget()
+                if until is not None:
+                    wait = until if wait is None else min(wait, until)
+
+        results = await asyncio.gather(
+            *(self._send_grant(request) for request in grants),
+            return_exceptions=True,
+        )
+        for request, result in zip(grants, results):
+            if isinstance(result, Exception):
+                # Requester is gone (finished, cancelled); give the token back
+                workflow.logger.info(f"Dropping permit for {request.workflow_id}: {result}")
+                bucket = self._bucket(request.model, now)
+                bucket.tokens = min(bucket.burst, bucket.tokens + 1.0)
+            else:
+                self._granted += 1
+        return wait
+
+    async def _send_grant(self, request: PermitRequest) -> None:
+        handle = workflow.get_external_workflow_handle(request.workflow_id)
+        await handle.signal(PERMIT_GRANTED_SIGNAL, request.request_id)
+
+    def _snapshot(self) -> RateLimiterInput:
+        return RateLimiterInput(
+            budgets=dict(self._budget_overrides),
+            tokens={model: bucket.tokens for model, bucket in self._buckets.items()},
+            pending=[
+                request
+                for venues in self._pending.values()
+                for requests in venues.values()
+                for request in requests
+            ],
+        )
@@ -29,6 +29,21 @@ class VenuePipelineInput:
     selected_section_ids: Optional[List[str]] = None
     custom_seats: Optional[List[str]] = None
 
+    # Anchor selection (farthest-point sampling); default radius if both unset
+    anchor_radius: Optional[float] = None   # max view error to nearest anchor
+    anchor_budget: Optional[int] = None     # max anchors to render
+
+    # Only render/generate seats in sections whose geometry changed since the
+    # last run (compared via section content hashes in the seat manifest)
+    incremental: bool = False
+
+    # Render one seat of each mirror-image pair and flip its depth map for the other
+    mirror_symmetry: bool = True
+
+    # Reuse depth maps whose geometry, camera pose, lens, resolution and
+    # encoding hash matches (see geometry.depth_cache); only misses render
+    use_depth_cache: bool = True
+
     # AI generation settings
     prompt: str = "Arena view, empty arena"
     model: str = "flux"  # flux, sdxl, controlnet, ip_adapter
@@ -45,19 +60,36 @@ class VenuePipelineInput:
     tier_ip_adapter_scales: Optional[Dict[str, float]] = None
 
     # Processing options
-    parallel_image_batch_size: int = 5
+    parallel_image_batch_size: int = 5  # Initial in-flight AI generations (sliding window)
+    adaptive_image_concurrency: bool = True  # AIMD: grow while the provider keeps up, halve on 429s
+    max_image_concurrency: int = 16     # Ceiling for the adaptive window
+    use_rate_limiter: bool = True       # Take a permit from the shared rate limiter per generation
     depth_batch_size: int = 10
+    depth_parallelism: int = 4          # Depth batches rendered concurrently
     stop_after_model: bool = False      # Stop after building 3D model
     stop_after_depths: bool = False     # Stop after rendering depth maps
     skip_ai_generation: bool = False    # Legacy alias for stop_after_depths
 
     # Resume options - skip steps if assets already exist
     skip_model_build: bool = False      # Use existing .blend file from storage
-    skip_depth_render: bool = False     # Use existing depth maps from storage
+    skip_depth_render: bool = False     # Use existing depth maps from storage (unvalidated; prefer use_depth_cache)
+
+    # Sharding for very large venues: above shard_threshold seats to render,
+    # depth rendering and generation run in VenueShardWorkflow children (one
+    # per tier split along section boundaries, or one per section)
+    shard_threshold: int = 500
+    shard_by: str = "tier"              # tier, section
+    shard_max_seats: int = 300          # Tier shards are split above this many seats
+    shard_parallelism: int = 4          # Shards running at once
+    shards_per_run: int = 20            # Continue-as-new after this many shards
+    shard_attempts: int = 3             # Runs of a failing shard before its seats count as failed
 
     # Storage path
     venue_dir: Optional[str] = None
 
+    # Set by the workflow itself when it continues-as-new mid-way through shards
+    resume_state: Optional["ShardedPipelineState"] = None
+
     def __post_init__(self):
         if self.venue_dir is None:
             self.venue_dir = f"venues/{self.venue_id}"
@@ -78,10 +110,15 @@ class PipelineProgress:
 
     # Results so far
     seats_generated: int = 0
+    depth_maps_planned: int = 0         # Anchor (or custom) seats, rendered or mirrored
     depth_maps_rendered: int = 0
     images_generated: int = 0
     failed_items: List[str] = field(default_factory=list)
 
+    # Adaptive generation concurrency (AIMD controller state)
+    generation_concurrency: int = 0
+    generation_throttles: int = 0
+
 
 @dataclass
 class PipelineResult:
@@ -106,11 +143,84 @@ class PipelineResult:
     total_cost: float = 0.0
     cost_breakdown: Dict[str, float] = field(default_factory=dict)
 
+    # Sharded runs: depth_map_paths/image_paths stay empty, each shard's
+    # paths are listed in a JSON artifact instead
+    shards: int = 0
+    path_listing_refs: List[str] = field(default_factory=list)
+
     # Timing
     duration_seconds: float = 0.0
     error_message: Optional[str] = None
 
 
+@dataclass
+class VenueShardInput:
+    """One shard of a sharded pipeline run."""
+    shard_id: str
+    pipeline: VenuePipelineInput        # Parent settings, reference images stripped
+    seats: List[dict]                   # Seats to render
+    mirrors: Dict[str, list] = field(default_factory=dict)  # seat_id -> [(derived seat_id, flip)]
+    seat_tiers: Dict[str, str] = field(default_factory=dict)
+    blend_file_ref: Optional[str] = None
+    reference_refs: Dict[str, str] = field(default_factory=dict)  # "default" / "tier:<tier>" -> artifact ref
+    reuse_existing_images: bool = True  # False when the shard's geometry changed
+
+
+@dataclass
+class VenueShardResult:
+    """What a shard reports back: counts and a ref, never per-seat data."""
+    shard_id: str
+    depth_maps_rendered: int = 0
+    images_generated: int = 0
+    failed_seats: List[str] = field(default_factory=list)
+    cost_breakdown: Dict[str, float] = field(default_factory=dict)
+    path_listing_ref: Optional[str] = None  # JSON {"depth_maps": {...}, "images": {...}}
+
+
+@dataclass
+class ShardedPipelineState:
+    """Progress a sharded pipeline carries across continue-as-new."""
+    started_at: float                   # POSIX timestamp of the first run
+    seats_generated: int = 0
+    anchor_seats_count: int = 0
+    dirty_sections: Optional[List[str]] = None
+    new_anchor_ids: Optional[List[str]] = None  # Incremental: anchors still to render
+    blend_file_ref: Optional[str] = None
+    reference_refs: Dict[str, str] = field(default_factory=dict)
+    completed_shards: List[str] = field(default_factory=list)    # Succeeded shards only
+    shard_failures: Dict[str, int] = field(default_factory=dict)  # shard_id -> failed attempts
+    depth_maps_rendered: int = 0
+    images_generated: int = 0
+    failed_seats: List[str] = field(default_factory=list)
+    cost_breakdown: Dict[str, float] = field(default_factory=dict)
+    actual_cost: float = 0.0
+    path_listing_refs: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ModelBudget:
+    """Shared request budget for one generation model (all venues together)."""
+    per_minute: float
+    burst: int = 1
+
+
+@dataclass
+class PermitRequest:
+    """A pipeline asking the rate limiter for one generation call."""
+    request_id: str
+    workflow_id: str                    # Where the grant signal goes
+    venue_id: str
+    model: str
+
+
+@dataclass
+class RateLimiterInput:
+    """Input (and continue-as-new state) of the generation rate limiter."""
+    budgets: Dict[str, ModelBudget] = field(default_factory=dict)  # model -> budget, overrides defaults
+    tokens: Dict[str, float] = field(default_factory=dict)         # model -> tokens left
+    pending: List[PermitRequest] = field(default_factory=list)
+
+
 # Cost estimates per operation (USD)
 COST_ESTIMATES = {
     "seats": 0.001,
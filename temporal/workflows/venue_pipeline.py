@@ -4,16 +4,32 @@ Main venue pipeline workflow.
 Orchestrates the complete pipeline:
 1. Generate seats from sections
 2. Build 3D venue model in Blender
-3. Render depth maps (batched)
-4. Generate AI images (parallel with concurrency control)
+3. Render depth maps (concurrent batches)
+4. Generate AI images (adaptive sliding window of in-flight generations), streamed
+   from stage 3: each depth batch is queued for generation as soon as it lands
+
+Very large venues run stages 3 + 4 in VenueShardWorkflow children (per tier
+or per section) and continue-as-new between groups of shards, so history
+size and worker memory stay flat as the venue grows.
 """
 
+import asyncio
+import base64
+import dataclasses
+import json
 from datetime import timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from temporalio import workflow
 from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError, ApplicationError
 
+from .concurrency import RATE_LIMITED_ERROR, AIMDController
+from .rate_limiter import RATE_LIMITER_WORKFLOW_ID, GenerationRateLimiterWorkflow
 from .types import (
+    PermitRequest,
+    ShardedPipelineState,
+    VenueShardInput,
+    VenueShardResult,
     VenuePipelineInput,
     PipelineResult,
     PipelineProgress,
@@ -30,7 +46,9 @@ with workflow.unsafe.imports_passed_through():
         generate_ai_image_activity,
     )
     from ..activities.storage_activities import (
-        save_seats_json_activity,
+        store_artifacts_activity,
+        save_seat_manifest_activity,
+        load_anchor_seats_activity,
         save_blend_file_activity,
         save_depth_maps_activity,
         save_generated_images_activity,
@@ -38,6 +56,13 @@ with workflow.unsafe.imports_passed_through():
         load_existing_blend_activity,
         load_existing_depth_maps_activity,
     )
+    from ..client import (
+        BLENDER_TASK_QUEUE,
+        GENERATION_TASK_QUEUE,
+        LIGHTWEIGHT_TASK_QUEUE,
+        STORAGE_TASK_QUEUE,
+    )
+    from geometry import mirror_planes, plan_mirrored_renders
 
 
 # Retry policies for different activity types
@@ -61,9 +86,114 @@ AI_GENERATION_RETRY = RetryPolicy(
     backoff_coefficient=2.0,
     maximum_attempts=5,
     maximum_interval=timedelta(minutes=5),
-    # Retry on rate limits (429) and transient errors
+    # Retry transient errors; rate limits (429) go back to the workflow's
+    # AIMD controller, which lowers concurrency before retrying
+    non_retryable_error_types=[RATE_LIMITED_ERROR],
 )
 
+# Backoff for seats retried by the workflow after a throttle
+THROTTLE_BACKOFF = timedelta(seconds=10)
+THROTTLE_MAX_BACKOFF = timedelta(minutes=5)
+THROTTLE_MAX_ATTEMPTS = 5
+
+# Longest wait for a shared rate-limiter permit before generating anyway
+PERMIT_TIMEOUT = timedelta(minutes=10)
+
+
+def _is_rate_limited(error: ActivityError) -> bool:
+    cause = error.cause
+    return isinstance(cause, ApplicationError) and cause.type == RATE_LIMITED_ERROR
+
+
+def _plan_shards(seats: List[dict], shard_by: str, max_seats: int) -> List[Tuple[str, List[dict]]]:
+    """
+    Split seats into shards along section boundaries.
+
+    shard_by="section" gives one shard per section. "tier" groups a tier's
+    sections and starts a new shard when the next section would take it past
+    max_seats. Shard ids only depend on the seats, so a resumed run can skip
+    the shards it already finished.
+    """
+    by_section: Dict[str, List[dict]] = {}
+    for seat in seats:
+        by_section.setdefault(seat["section"], []).append(seat)
+
+    if shard_by == "section":
+        return [(f"section-{section}", section_seats) for section, section_seats in by_section.items()]
+
+    by_tier: Dict[str, List[str]] = {}
+    for section, section_seats in by_section.items():
+        by_tier.setdefault(section_seats[0].get("tier", "lower"), []).append(section)
+
+    shards: List[Tuple[str, List[dict]]] = []
+    for tier, tier_sections in by_tier.items():
+        current: List[dict] = []
+        part = 0
+        for section in tier_sections:
+            if current and len(current) + len(by_section[section]) > max_seats:
+                shards.append((f"{tier}-{part}", current))
+                current = []
+                part += 1
+            current.extend(by_section[section])
+        if current:
+            shards.append((f"{tier}-{part}", current))
+    return shards
+
+
+async def _cancel_and_wait(task: Optional[asyncio.Task]) -> None:
+    """Cancel a task (if any) and wait until it has actually stopped."""
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except BaseException:
+        pass
+
+
+def _pending_shards(
+    shards: List[Tuple[str, List[dict]]],
+    state: ShardedPipelineState,
+    max_attempts: int,
+) -> List[Tuple[str, List[dict]]]:
+    """Shards that haven't succeeded yet and still have attempts left."""
+    done = set(state.completed_shards)
+    return [
+        shard for shard in shards
+        if shard[0] not in done and state.shard_failures.get(shard[0], 0) < max_attempts
+    ]
+
+
+def _record_shard_result(state: ShardedPipelineState, result: VenueShardResult) -> None:
+    """Add a finished shard's counts, costs and listing to the run state."""
+    state.completed_shards.append(result.shard_id)
+    state.depth_maps_rendered += result.depth_maps_rendered
+    state.images_generated += result.images_generated
+    state.failed_seats.extend(result.failed_seats)
+    for key, cost in result.cost_breakdown.items():
+        state.cost_breakdown[key] = state.cost_breakdown.get(key, 0) + cost
+        state.actual_cost += cost
+    if result.path_listing_ref:
+        state.path_listing_refs.append(result.path_listing_ref)
+
+
+def _record_shard_failure(
+    state: ShardedPipelineState,
+    shard_id: str,
+    seat_ids: List[str],
+    max_attempts: int,
+) -> bool:
+    """
+    Count a failed shard attempt. Returns True if the shard will be retried
+    (on the next continue-as-new run); once it is out of attempts its seats
+    are recorded as failed instead.
+    """
+    state.shard_failures[shard_id] = state.shard_failures.get(shard_id, 0) + 1
+    if state.shard_failures[shard_id] < max_attempts:
+        return True
+    state.failed_seats.extend(seat_ids)
+    return False
+
 
 @workflow.defn
 class VenuePipelineWorkflow:
@@ -81,6 +211,12 @@ class VenuePipelineWorkflow:
     def __init__(self):
         self._progress = PipelineProgress()
         self._should_cancel = False
+        # Reference image artifact refs: "default" and one per tier
+        self._reference_refs: Dict[str, str] = {}
+        # Rate-limiter permits being waited for, and those granted but not yet used
+        self._permits_waiting: Set[str] = set()
+        self._permits_granted: Set[str] = set()
+        self._permit_seq = 0
 
     @workflow.signal
     def cancel_pipeline(self):
@@ -88,6 +224,13 @@ class VenuePipelineWorkflow:
         self._should_cancel = True
         workflow.logger.info("Cancel signal received")
 
+    @workflow.signal
+    def permit_granted(self, request_id: str):
+        """Signal from GenerationRateLimiterWorkflow: one generation call may start."""
+        # A late grant for a request we stopped waiting for is dropped
+        if request_id in self._permits_waiting:
+            self._permits_granted.add(request_id)
+
     @workflow.query
     def get_progress(self) -> PipelineProgress:
         """Query current pipeline progress."""
@@ -101,14 +244,18 @@ class VenuePipelineWorkflow:
         venue_dir = input.venue_dir or f"venues/{input.venue_id}"
 
         # Track intermediate results
-        all_seats: List[dict] = []
+        sample_seats: List[dict] = []
         anchor_seats: List[dict] = []
-        all_depth_maps: Dict[str, str] = {}
+        all_depth_maps: Dict[str, str] = {}  # seat_id -> depth map artifact ref
         depth_paths: Dict[str, str] = {}
         image_paths: Dict[str, str] = {}
         seat_tier_map: Dict[str, str] = {}  # seat_id -> tier for tier-based reference selection
 
         try:
+            if input.resume_state is not None:
+                # Continued-as-new in the middle of a sharded run
+                return await self._resume_shards(input)
+
             # ===== STAGE 1: GENERATE SEATS =====
             self._update_progress(
                 PipelineStage.GENERATING_SEATS,
@@ -116,45 +263,61 @@ class VenuePipelineWorkflow:
                 message="Generating seat coordinates..."
             )
 
-            # Filter sections if specific ones selected
-            sections = input.sections
-            if input.selected_section_ids:
-                sections = {
-                    k: v for k, v in input.sections.items()
-                    if k in input.selected_section_ids
-                }
+            sections = self._selected_sections(input)
 
-            all_seats, sample_seats, anchor_seats = await workflow.execute_activity(
+            # Only the seat subsets we render come back; the full bowl stays on Modal
+            seat_result = await workflow.execute_activity(
                 generate_seats_activity,
-                sections,
+                args=[sections, input.custom_seats],
+                task_queue=LIGHTWEIGHT_TASK_QUEUE,
                 start_to_close_timeout=timedelta(minutes=2),
                 retry_policy=FAST_RETRY,
             )
+            sample_seats = seat_result["sample_seats"]
+            custom_seats = seat_result["custom_seats"]
 
             cost_breakdown["seats"] = COST_ESTIMATES["seats"]
             self._progress.actual_cost += COST_ESTIMATES["seats"]
-            self._progress.seats_generated = len(all_seats)
-
-            # Build seat_id -> tier mapping for tier-based reference selection
-            for seat in all_seats:
-                seat_id = seat.get("id")
-                tier = seat.get("tier", "lower")
-                if seat_id:
-                    seat_tier_map[seat_id] = tier
-
-            # Save seats to storage
-            await workflow.execute_activity(
-                save_seats_json_activity,
-                args=[venue_dir, input.venue_id, all_seats, anchor_seats],
-                start_to_close_timeout=timedelta(seconds=30),
+            self._progress.seats_generated = seat_result["total_seats"]
+
+            # Pick anchors and save the columnar seat manifest (also diffs
+            # sections); incremental runs keep the anchors of unchanged sections,
+            # and anchors come with their mirror images so those can be flipped
+            manifest_result = await workflow.execute_activity(
+                save_seat_manifest_activity,
+                args=[
+                    venue_dir, input.venue_id, sections,
+                    input.anchor_radius, input.anchor_budget, input.incremental,
+                    mirror_planes(input.config) if input.mirror_symmetry else [],
+                ],
+                task_queue=STORAGE_TASK_QUEUE,
+                start_to_close_timeout=timedelta(minutes=1),
                 retry_policy=FAST_RETRY,
             )
+            anchor_seats = manifest_result["anchor_seats"]
+
+            # Build seat_id -> tier mapping for tier-based reference selection
+            seat_tier_map = self._seat_tier_map(sample_seats + anchor_seats + custom_seats)
+
+            # Sections whose seats need new renders, and the anchors that were
+            # not rendered before (None = everything)
+            dirty_sections: Optional[Set[str]] = None
+            new_anchor_ids: Optional[List[str]] = None
+            if input.incremental and manifest_result["has_previous"]:
+                section_diff = manifest_result["section_diff"]
+                dirty_sections = set(section_diff["added"]) | set(section_diff["changed"])
+                new_anchor_ids = manifest_result["new_anchor_ids"]
+                workflow.logger.info(
+                    f"Incremental run: {len(dirty_sections)} changed sections, "
+                    f"{manifest_result['changed_seats']} changed seats, "
+                    f"{len(new_anchor_ids)} of {len(anchor_seats)} anchors to render"
+                )
 
             if self._should_cancel:
                 return self._make_cancelled_result(input, start_time, cost_breakdown)
 
             # ===== STAGE 2: BUILD 3D MODEL =====
-            blend_file_b64 = None
+            blend_file_ref = None
 
             if input.skip_model_build:
                 # Try to load existing blend file from storage
@@ -164,19 +327,20 @@ class VenuePipelineWorkflow:
                     message="Loading existing 3D model..."
                 )
 
-                blend_file_b64 = await workflow.execute_activity(
+                blend_file_ref = await workflow.execute_activity(
                     load_existing_blend_activity,
                     args=[input.venue_id],
+                    task_queue=STORAGE_TASK_QUEUE,
                     start_to_close_timeout=timedelta(minutes=2),
                     retry_policy=FAST_RETRY,
                 )
 
-                if blend_file_b64:
+                if blend_file_ref:
                     workflow.logger.info("Using existing blend file from storage")
                 else:
                     workflow.logger.warning("No existing blend file found, building new one")
 
-            if not blend_file_b64:
+            if not blend_file_ref:
                 # Build new model
                 self._update_progress(
                     PipelineStage.BUILDING_MODEL,
@@ -187,13 +351,14 @@ class VenuePipelineWorkflow:
                 model_result = await workflow.execute_activity(
                     build_venue_model_activity,
                     args=[input.config, sections],
+                    task_queue=BLENDER_TASK_QUEUE,
                     start_to_close_timeout=timedelta(minutes=15),
                     retry_policy=BLENDER_RETRY,
-                    # No heartbeat_timeout - Modal calls are blocking and can't heartbeat during execution
+                    # No heartbeat_timeout - activities do not heartbeat while awaiting Modal
                 )
 
                 # Extract blend file for depth rendering
-                blend_file_b64 = model_result["blend_file"]
+                blend_file_ref = model_result["blend_file"]
 
                 cost_breakdown["model_build"] = COST_ESTIMATES["blender_build"]
                 self._progress.actual_cost += COST_ESTIMATES["blender_build"]
@@ -202,6 +367,7 @@ class VenuePipelineWorkflow:
                 await workflow.execute_activity(
                     save_blend_file_activity,
                     args=[venue_dir, model_result],
+                    task_queue=STORAGE_TASK_QUEUE,
                     start_to_close_timeout=timedelta(minutes=2),
                     retry_policy=FAST_RETRY,
                 )
@@ -218,89 +384,109 @@ class VenuePipelineWorkflow:
                 )
                 return self._make_result(
                     input, start_time, cost_breakdown,
-                    all_seats, anchor_seats, {}, {},
+                    anchor_seats, {}, {},
                 )
 
-            # ===== STAGE 3: RENDER DEPTH MAPS =====
-            if input.skip_depth_render:
-                # Try to load existing depth maps from storage
-                self._update_progress(
-                    PipelineStage.RENDERING_DEPTHS,
-                    step=3,
-                    message="Loading existing depth maps..."
+            # ===== STAGE 3 + 4: RENDER DEPTH MAPS, STREAMING INTO AI GENERATION =====
+            # Each depth batch is saved and queued for generation as soon as it
+            # lands, so rendering and the generation provider run concurrently
+            generate_images = not (input.stop_after_depths or input.skip_ai_generation)
+            seats_to_render, mirrors = self._plan_renders(input, anchor_seats, custom_seats, new_anchor_ids)
+
+            # Very large venues: stages 3 + 4 run in per-shard child workflows
+            # that report back counts and refs only
+            if not input.skip_depth_render and len(seats_to_render) > input.shard_threshold:
+                state = ShardedPipelineState(
+                    started_at=start_time.timestamp(),
+                    seats_generated=self._progress.seats_generated,
+                    anchor_seats_count=len(anchor_seats),
+                    dirty_sections=sorted(dirty_sections) if dirty_sections is not None else None,
+                    new_anchor_ids=new_anchor_ids,
+                    blend_file_ref=blend_file_ref,
+                    reference_refs=await self._store_reference_images(input) if generate_images else {},
+                    cost_breakdown=cost_breakdown,
+                    actual_cost=self._progress.actual_cost,
                 )
-
-                all_depth_maps = await workflow.execute_activity(
-                    load_existing_depth_maps_activity,
-                    args=[input.venue_id],
-                    start_to_close_timeout=timedelta(minutes=5),
+                return await self._run_shards(input, sections, seats_to_render, mirrors, seat_tier_map, state)
+
+            existing_images: Dict[str, str] = {}
+            if generate_images:
+                # Check for existing images to skip
+                existing_images = await workflow.execute_activity(
+                    load_existing_images_activity,
+                    venue_dir,
+                    task_queue=LIGHTWEIGHT_TASK_QUEUE,
+                    start_to_close_timeout=timedelta(seconds=30),
                     retry_policy=FAST_RETRY,
                 )
 
-                if all_depth_maps:
-                    workflow.logger.info(f"Loaded {len(all_depth_maps)} existing depth maps")
-                    self._progress.depth_maps_rendered = len(all_depth_maps)
-                    # Set depth_paths for the result (already in Supabase)
-                    for seat_id in all_depth_maps:
-                        depth_paths[seat_id] = f"supabase://{input.venue_id}/depth_maps/{seat_id}_depth.png"
-                else:
-                    workflow.logger.warning("No existing depth maps found, rendering new ones")
-
-            if not all_depth_maps:
-                # Render new depth maps
-                self._update_progress(
-                    PipelineStage.RENDERING_DEPTHS,
-                    step=3,
-                    message="Rendering depth maps..."
-                )
-
-                # Determine which seats to render
-                seats_to_render = anchor_seats
-                if input.custom_seats:
-                    # Use custom seats instead
-                    seats_to_render = [
-                        s for s in all_seats if s.get("id") in input.custom_seats
-                    ]
-
-                # Batch depth map rendering
-                depth_batch_size = input.depth_batch_size
+                # Images of seats whose geometry changed are stale
+                if dirty_sections is not None:
+                    existing_images = {
+                        seat_id: path for seat_id, path in existing_images.items()
+                        if seat_id.rsplit("_", 2)[0] not in dirty_sections
+                    }
+
+                self._reference_refs = await self._store_reference_images(input)
+
+            # Depth batches -> generation consumer; None marks the end of the stream
+            depth_batch_queue: asyncio.Queue = asyncio.Queue()
+            generation_task = None
+            if generate_images:
+                generation_task = asyncio.create_task(self._generate_images_streaming(
+                    input, depth_batch_queue, existing_images, cost_breakdown, seat_tier_map
+                ))
+
+            try:
+                if input.skip_depth_render:
+                    # Try to load existing depth maps from storage
+                    self._update_progress(
+                        PipelineStage.RENDERING_DEPTHS,
+                        step=3,
+                        message="Loading existing depth maps..."
+                    )
 
-                for batch_idx in range(0, len(seats_to_render), depth_batch_size):
-                    if self._should_cancel:
-                        break
+                    all_depth_maps = await workflow.execute_activity(
+                        load_existing_depth_maps_activity,
+                        args=[input.venue_id],
+                        task_queue=STORAGE_TASK_QUEUE,
+                        start_to_close_timeout=timedelta(minutes=5),
+                        retry_policy=FAST_RETRY,
+                    )
 
-                    batch = seats_to_render[batch_idx:batch_idx + depth_batch_size]
-                    batch_num = batch_idx // depth_batch_size + 1
-                    total_batches = (len(seats_to_render) + depth_batch_size - 1) // depth_batch_size
+                    if all_depth_maps:
+                        workflow.logger.info(f"Loaded {len(all_depth_maps)} existing depth maps")
+                        self._progress.depth_maps_rendered = len(all_depth_maps)
+                        # Set depth_paths for the result (already in Supabase)
+                        for seat_id in all_depth_maps:
+                            depth_paths[seat_id] = f"supabase://{input.venue_id}/depth_maps/{seat_id}_depth.png"
+                        depth_batch_queue.put_nowait(all_depth_maps)
+                    else:
+                        workflow.logger.warning("No existing depth maps found, rendering new ones")
 
+                if not all_depth_maps:
+                    # Render new depth maps
                     self._update_progress(
-                        message=f"Rendering depth maps: batch {batch_num}/{total_batches}"
+                        PipelineStage.RENDERING_DEPTHS,
+                        step=3,
+                        message="Rendering depth maps..."
                     )
-
-                    batch_depths = await workflow.execute_activity(
-                        render_depth_maps_activity,
-                        args=[blend_file_b64, batch, batch_idx],
-                        start_to_close_timeout=timedelta(minutes=20),
-                        retry_policy=BLENDER_RETRY,
-                        # No heartbeat_timeout - Modal calls are blocking
+                    await self._render_and_save_depths(
+                        input, blend_file_ref, seats_to_render, mirrors,
+                        all_depth_maps, depth_paths, cost_breakdown,
+                        depth_batch_queue if generation_task is not None else None,
                     )
-
-                    all_depth_maps.update(batch_depths)
-                    cost = len(batch) * COST_ESTIMATES["depth_render_per_seat"]
-                    cost_breakdown["depth_rendering"] = cost_breakdown.get("depth_rendering", 0) + cost
-                    self._progress.actual_cost += cost
-                    self._progress.depth_maps_rendered = len(all_depth_maps)
-
-                # Save depth maps
-                depth_paths = await workflow.execute_activity(
-                    save_depth_maps_activity,
-                    args=[venue_dir, all_depth_maps],
-                    start_to_close_timeout=timedelta(minutes=5),
-                    retry_policy=FAST_RETRY,
-                )
+            except BaseException:
+                # Don't leave generation running (or waiting on the queue) behind a failed depth stage
+                await _cancel_and_wait(generation_task)
+                raise
+            finally:
+                depth_batch_queue.put_nowait(None)
 
             # Check if we should stop after depth maps
-            if self._should_cancel or input.stop_after_depths or input.skip_ai_generation:
+            if generation_task is None or self._should_cancel:
+                if generation_task is not None:
+                    image_paths = await generation_task
                 self._update_progress(
                     PipelineStage.COMPLETED,
                     step=3,
@@ -308,28 +494,16 @@ class VenuePipelineWorkflow:
                 )
                 return self._make_result(
                     input, start_time, cost_breakdown,
-                    all_seats, anchor_seats, depth_paths, {},
+                    anchor_seats, depth_paths, image_paths,
                 )
 
-            # ===== STAGE 4: GENERATE AI IMAGES (PARALLEL) =====
+            # Rendering is done; the rest of generation drains the queue
             self._update_progress(
                 PipelineStage.GENERATING_IMAGES,
                 step=4,
                 message="Generating AI images..."
             )
-
-            # Check for existing images to skip
-            existing_images = await workflow.execute_activity(
-                load_existing_images_activity,
-                venue_dir,
-                start_to_close_timeout=timedelta(seconds=30),
-                retry_policy=FAST_RETRY,
-            )
-
-            # Generate images in parallel batches
-            image_paths = await self._generate_images_parallel(
-                input, all_depth_maps, existing_images, cost_breakdown, seat_tier_map
-            )
+            image_paths = await generation_task
 
             # ===== COMPLETE =====
             self._update_progress(
@@ -340,9 +514,11 @@ class VenuePipelineWorkflow:
 
             return self._make_result(
                 input, start_time, cost_breakdown,
-                all_seats, anchor_seats, depth_paths, image_paths,
+                anchor_seats, depth_paths, image_paths,
             )
 
+        except workflow.ContinueAsNewError:
+            raise
         except Exception as e:
             workflow.logger.error(f"Pipeline failed: {e}")
             self._update_progress(
@@ -365,16 +541,347 @@ class VenuePipelineWorkflow:
                 error_message=str(e),
             )
 
-    async def _generate_images_parallel(
+    def _selected_sections(self, input: VenuePipelineInput) -> Dict[str, dict]:
+        """Sections to process (all, or the selected ones)."""
+        if not input.selected_section_ids:
+            return input.sections
+        return {
+            k: v for k, v in input.sections.items()
+            if k in input.selected_section_ids
+        }
+
+    def _seat_tier_map(self, seats: List[dict]) -> Dict[str, str]:
+        """seat_id -> tier, for tier-based reference selection."""
+        return {seat["id"]: seat.get("tier", "lower") for seat in seats if seat.get("id")}
+
+    def _plan_renders(
+        self,
+        input: VenuePipelineInput,
+        anchor_seats: List[dict],
+        custom_seats: List[dict],
+        new_anchor_ids: Optional[List[str]],
+    ) -> Tuple[List[dict], Dict[str, list]]:
+        """Seats that need a depth render, and the mirror-image seats derived from them."""
+        seats_to_render = anchor_seats
+        if input.custom_seats:
+            # Use custom seats instead
+            seats_to_render = custom_seats
+        elif new_anchor_ids is not None:
+            # Incremental: anchors kept from the previous manifest are already rendered
+            render_ids = set(new_anchor_ids)
+            seats_to_render = [s for s in anchor_seats if s["id"] in render_ids]
+
+        # Mirror-image seats are derived by flipping their partner's depth map
+        mirrors: Dict[str, list] = {}
+        if input.mirror_symmetry:
+            mirror_plan = plan_mirrored_renders(seats_to_render, mirror_planes(input.config))
+            if mirror_plan.mirrors:
+                workflow.logger.info(
+                    f"Mirror symmetry: rendering {len(mirror_plan.render)} of "
+                    f"{len(seats_to_render)} seats"
+                )
+                seats_to_render = mirror_plan.render
+                mirrors = mirror_plan.mirrors
+
+        self._progress.depth_maps_planned = len(seats_to_render) + sum(len(t) for t in mirrors.values())
+        return seats_to_render, mirrors
+
+    async def _store_reference_images(self, input: VenuePipelineInput) -> Dict[str, str]:
+        """
+        Put the input's reference images in the artifact store once; every
+        generation call then carries a ref instead of the image.
+        """
+        reference_blobs = {
+            f"tier:{tier}": b64 for tier, b64 in (input.tier_reference_images or {}).items()
+        }
+        if input.reference_image_b64:
+            reference_blobs["default"] = input.reference_image_b64
+        if not reference_blobs:
+            return {}
+        return await workflow.execute_activity(
+            store_artifacts_activity,
+            reference_blobs,
+            task_queue=LIGHTWEIGHT_TASK_QUEUE,
+            start_to_close_timeout=timedelta(minutes=1),
+            retry_policy=FAST_RETRY,
+        )
+
+    async def _render_and_save_depths(
+        self,
+        input: VenuePipelineInput,
+        blend_file_ref: str,
+        seats_to_render: List[dict],
+        mirrors: Dict[str, list],
+        all_depth_maps: Dict[str, str],
+        depth_paths: Dict[str, str],
+        cost_breakdown: Dict[str, float],
+        depth_batch_queue: Optional[asyncio.Queue] = None,
+    ) -> None:
+        """
+        Render depth batches, saving each one (and queueing it for generation
+        if a queue is given) as soon as it lands instead of once at the end.
+        """
+        venue_dir = input.venue_dir or f"venues/{input.venue_id}"
+        depth_saves: List[asyncio.Task] = []
+
+        async def save_depth_batch(batch_depth_maps: Dict[str, str]):
+            batch_paths = await workflow.execute_activity(
+                save_depth_maps_activity,
+                args=[venue_dir, batch_depth_maps],
+                task_queue=STORAGE_TASK_QUEUE,
+                start_to_close_timeout=timedelta(minutes=5),
+                retry_policy=FAST_RETRY,
+            )
+            depth_paths.update(batch_paths)
+
+        def on_depth_batch(batch_depth_maps: Dict[str, str]):
+            depth_saves.append(asyncio.create_task(save_depth_batch(batch_depth_maps)))
+            if depth_batch_queue is not None:
+                depth_batch_queue.put_nowait(batch_depth_maps)
+
+        # Depth batches run concurrently, up to depth_parallelism at a time
+        await self._render_depth_batches(
+            input, blend_file_ref, seats_to_render, mirrors,
+            all_depth_maps, cost_breakdown, on_depth_batch,
+        )
+        await asyncio.gather(*depth_saves)
+
+    async def _run_shards(
+        self,
+        input: VenuePipelineInput,
+        sections: Dict[str, dict],
+        seats_to_render: List[dict],
+        mirrors: Dict[str, list],
+        seat_tier_map: Dict[str, str],
+        state: ShardedPipelineState,
+    ) -> PipelineResult:
+        """
+        Run stages 3 + 4 as VenueShardWorkflow children, up to
+        input.shard_parallelism at a time.
+
+        Shards report counts and a path-listing ref only. After
+        input.shards_per_run shards (or sooner if Temporal suggests it) the
+        workflow continues-as-new with the accumulated state; finished
+        shards are skipped on the next run. A failed shard is run again on
+        the next run, up to input.shard_attempts times.
+        """
+        shards = _plan_shards(seats_to_render, input.shard_by, max(1, input.shard_max_seats))
+        max_attempts = max(1, input.shard_attempts)
+        this_run = _pending_shards(shards, state, max_attempts)[:max(1, input.shards_per_run)]
+
+        # Progress so far (earlier runs included)
+        self._progress.seats_generated = state.seats_generated
+        self._sync_shard_progress(state)
+        self._update_progress(
+            PipelineStage.RENDERING_DEPTHS,
+            step=3,
+            message=f"Shards: {len(state.completed_shards)}/{len(shards)} done, starting {len(this_run)}"
+        )
+
+        # Shards get artifact refs for the reference images, not the images
+        shard_pipeline = dataclasses.replace(
+            input,
+            sections=sections,
+            selected_section_ids=None,
+            reference_image_b64=None,
+            tier_reference_images=None,
+            resume_state=None,
+        )
+        workflow_id = workflow.info().workflow_id
+        semaphore = asyncio.Semaphore(max(1, input.shard_parallelism))
+        running: Dict[str, workflow.ChildWorkflowHandle] = {}
+
+        async def run_shard(shard_id: str, seats: List[dict]):
+            async with semaphore:
+                if self._should_cancel or workflow.info().is_continue_as_new_suggested():
+                    return
+
+                attempt = state.shard_failures.get(shard_id, 0)
+                shard_mirrors = {s["id"]: mirrors[s["id"]] for s in seats if s["id"] in mirrors}
+                seat_ids = [s["id"] for s in seats] + [
+                    derived for targets in shard_mirrors.values() for derived, _ in targets
+                ]
+                handle = await workflow.start_child_workflow(
+                    VenueShardWorkflow.run,
+                    VenueShardInput(
+                        shard_id=shard_id,
+                        pipeline=shard_pipeline,
+                        seats=seats,
+                        mirrors=shard_mirrors,
+                        seat_tiers={sid: seat_tier_map[sid] for sid in seat_ids if sid in seat_tier_map},
+                        blend_file_ref=state.blend_file_ref,
+                        reference_refs=state.reference_refs,
+                        # Incremental runs only shard changed sections, whose images are stale
+                        reuse_existing_images=state.dirty_sections is None,
+                    ),
+                    # Retries get their own id, so each attempt's history is kept
+                    id=f"{workflow_id}-shard-{shard_id}" + (f"-{attempt + 1}" if attempt else ""),
+                    task_queue=LIGHTWEIGHT_TASK_QUEUE,
+                )
+                running[shard_id] = handle
+                try:
+                    result = await handle
+                except Exception as e:
+                    retry = _record_shard_failure(state, shard_id, seat_ids, max_attempts)
+                    workflow.logger.warning(
+                        f"Shard {shard_id} failed (attempt {state.shard_failures[shard_id]}"
+                        f"/{max_attempts}{', will retry' if retry else ''}): {e}"
+                    )
+                    self._sync_shard_progress(state)
+                    return
+                finally:
+                    running.pop(shard_id, None)
+
+            _record_shard_result(state, result)
+            self._sync_shard_progress(state)
+            self._update_progress(message=f"Shards: {len(state.completed_shards)}/{len(shards)} done")
+
+        async def forward_cancel():
+            await workflow.wait_condition(lambda: self._should_cancel)
+            for handle in list(running.values()):
+                await handle.signal(VenueShardWorkflow.cancel_pipeline)
+
+        canceller = asyncio.create_task(forward_cancel())
+        try:
+            await asyncio.gather(*(run_shard(shard_id, seats) for shard_id, seats in this_run))
+        finally:
+            canceller.cancel()
+
+        if self._should_cancel:
+            return self._make_sharded_result(input, state, len(shards), "Cancelled by user")
+
+        if _pending_shards(shards, state, max_attempts):
+            workflow.logger.info(
+                f"{len(state.completed_shards)}/{len(shards)} shards done, continuing as new"
+            )
+            workflow.continue_as_new(dataclasses.replace(
+                input,
+                reference_image_b64=None,
+                tier_reference_images=None,
+                resume_state=state,
+            ))
+
+        self._update_progress(
+            PipelineStage.COMPLETED,
+            step=4 if not (input.stop_after_depths or input.skip_ai_generation) else 3,
+            message=f"Pipeline complete! ({len(shards)} shards)"
+        )
+        return self._make_sharded_result(input, state, len(shards))
+
+    async def _resume_shards(self, input: VenuePipelineInput) -> PipelineResult:
+        """Pick a sharded run back up after continue-as-new."""
+        state = input.resume_state
+        sections = self._selected_sections(input)
+
+        # Seat generation is deterministic and the anchors are in the saved
+        # seat manifest, so the shard plan is derived again instead of being
+        # carried across runs
+        seat_result = await workflow.execute_activity(
+            generate_seats_activity,
+            args=[sections, input.custom_seats],
+            task_queue=LIGHTWEIGHT_TASK_QUEUE,
+            start_to_close_timeout=timedelta(minutes=2),
+            retry_policy=FAST_RETRY,
+        )
+        anchor_seats = await workflow.execute_activity(
+            load_anchor_seats_activity,
+            input.venue_dir or f"venues/{input.venue_id}",
+            task_queue=STORAGE_TASK_QUEUE,
+            start_to_close_timeout=timedelta(minutes=1),
+            retry_policy=FAST_RETRY,
+        )
+        custom_seats = seat_result["custom_seats"]
+
+        seats_to_render, mirrors = self._plan_renders(input, anchor_seats, custom_seats, state.new_anchor_ids)
+        return await self._run_shards(
+            input, sections, seats_to_render, mirrors,
+            self._seat_tier_map(anchor_seats + custom_seats), state,
+        )
+
+    def _sync_shard_progress(self, state: ShardedPipelineState):
+        self._progress.depth_maps_rendered = state.depth_maps_rendered
+        self._progress.images_generated = state.images_generated
+        self._progress.failed_items = state.failed_seats
+        self._progress.actual_cost = state.actual_cost
+
+    async def _render_depth_batches(
+        self,
+        input: VenuePipelineInput,
+        blend_file_ref: str,
+        seats_to_render: List[dict],
+        mirrors: Dict[str, list],
+        all_depth_maps: Dict[str, str],
+        cost_breakdown: Dict[str, float],
+        on_batch: Optional[Callable[[Dict[str, str]], None]] = None,
+    ) -> None:
+        """
+        Dispatch depth batches concurrently, capped at input.depth_parallelism.
+
+        on_batch(depth_maps) is called as each batch completes, so downstream
+        stages can start before the last batch has rendered.
+        """
+        depth_batch_size = input.depth_batch_size
+        batch_starts = list(range(0, len(seats_to_render), depth_batch_size))
+        total_batches = len(batch_starts)
+        semaphore = asyncio.Semaphore(max(1, input.depth_parallelism))
+        completed = 0
+
+        async def render_batch(batch_idx: int):
+            nonlocal completed
+            async with semaphore:
+                if self._should_cancel:
+                    return
+
+                batch = seats_to_render[batch_idx:batch_idx + depth_batch_size]
+                batch_mirrors = {s["id"]: mirrors[s["id"]] for s in batch if s["id"] in mirrors}
+
+                batch_result = await workflow.execute_activity(
+                    render_depth_maps_activity,
+                    args=[blend_file_ref, batch, batch_idx, batch_mirrors, input.use_depth_cache],
+                    task_queue=BLENDER_TASK_QUEUE,
+                    start_to_close_timeout=timedelta(minutes=20),
+                    retry_policy=BLENDER_RETRY,
+                    # No heartbeat_timeout - activities do not heartbeat while awaiting Modal
+                )
+
+            all_depth_maps.update(batch_result["depth_maps"])
+            # Cache hits cost nothing
+            cost = batch_result["rendered"] * COST_ESTIMATES["depth_render_per_seat"]
+            cost_breakdown["depth_rendering"] = cost_breakdown.get("depth_rendering", 0) + cost
+            self._progress.actual_cost += cost
+            self._progress.depth_maps_rendered = len(all_depth_maps)
+
+            completed += 1
+            self._update_progress(
+                message=f"Rendering depth maps: {completed}/{total_batches} batches done"
+            )
+            if on_batch is not None:
+                on_batch(batch_result["depth_maps"])
+
+        self._update_progress(
+            message=f"Rendering depth maps: {total_batches} batches, {input.depth_parallelism} at a time"
+        )
+        await asyncio.gather(*(render_batch(batch_idx) for batch_idx in batch_starts))
+
+    async def _generate_images_streaming(
         self,
         input: VenuePipelineInput,
-        depth_maps: Dict[str, str],
+        depth_batch_queue: asyncio.Queue,
         existing_images: Dict[str, str],
         cost_breakdown: Dict[str, float],
         seat_tier_map: Optional[Dict[str, str]] = None,
     ) -> Dict[str, str]:
-        """Generate AI images in parallel with concurrency control."""
-
+        """
+        Generate AI images for depth batches as they arrive on the queue.
+
+        Runs alongside depth rendering; a None entry ends the stream. A slot
+        is refilled as soon as any generation finishes - there is no batch
+        barrier, so one slow seat doesn't idle the others. The number of slots
+        is set by an AIMD controller shared by every seat of the run: it grows
+        while the provider keeps up and halves when it throttles (throttled
+        seats back off and retry). Finished images are saved in groups of
+        parallel_image_batch_size while generation goes on.
+        """
         # Get cost per image based on model
         model_costs = {
             "flux": COST_ESTIMATES["flux_per_image"],
@@ -384,98 +891,237 @@ class VenuePipelineWorkflow:
         }
         cost_per_image = model_costs.get(input.model, 0.02)
 
+        # Log tier reference info if available
+        tiers_with_refs = [name[len("tier:"):] for name in self._reference_refs if name.startswith("tier:")]
+        if tiers_with_refs:
+            workflow.logger.info(f"Using tier-specific reference images for tiers: {tiers_with_refs}")
+
         # Start with existing images
         generated = dict(existing_images)
+        save_group_size = max(1, input.parallel_image_batch_size)
+        in_flight: Set[asyncio.Task] = set()
+        unsaved: Dict[str, str] = {}
+        saves: List[asyncio.Task] = []
+        queued = 0
+        finished = 0
+
+        # In-flight limit adapts to the provider: +1 per window of successes,
+        # halved on throttles. Starts at parallel_image_batch_size.
+        if input.adaptive_image_concurrency:
+            controller = AIMDController(
+                limit=float(save_group_size),
+                max_limit=max(save_group_size, input.max_image_concurrency),
+            )
+        else:
+            controller = AIMDController.fixed(save_group_size)
+        active = 0
+        concurrency_gauge = workflow.metric_meter().create_gauge(
+            "venue_pipeline_generation_concurrency",
+            "Allowed in-flight AI generations (AIMD controller)",
+        )
 
-        # Filter to seats that need generation
-        seat_ids = [sid for sid in depth_maps.keys() if sid not in existing_images]
-
-        if not seat_ids:
-            workflow.logger.info("All images already exist, skipping generation")
-            return generated
-
-        workflow.logger.info(f"Generating {len(seat_ids)} images ({len(existing_images)} already exist)")
+        def publish_concurrency():
+            self._progress.generation_concurrency = controller.current
+            self._progress.generation_throttles = controller.throttles
+            concurrency_gauge.set(controller.current, {"model": input.model})
+
+        async def acquire_slot() -> int:
+            nonlocal active
+            await workflow.wait_condition(lambda: active < controller.current)
+            active += 1
+            return controller.epoch
+
+        def release_slot():
+            nonlocal active
+            active -= 1
+
+        async def save_images(images: Dict[str, str]):
+            batch_paths = await workflow.execute_activity(
+                save_generated_images_activity,
+                args=[
+                    input.venue_dir or f"venues/{input.venue_id}",
+                    images,
+                    {seat_id: (seat_tier_map or {}).get(seat_id, "lower") for seat_id in images},
+                ],
+                task_queue=STORAGE_TASK_QUEUE,
+                # Includes encoding the WebP/AVIF variants
+                start_to_close_timeout=timedelta(minutes=5),
+                retry_policy=FAST_RETRY,
+            )
+            generated.update(batch_paths)
+
+        def flush_saves():
+            if unsaved:
+                saves.append(asyncio.create_task(save_images(dict(unsaved))))
+                unsaved.clear()
+
+        async def generate(seat_id: str, depth_ref: str, epoch: int):
+            nonlocal finished
+            result = None
+            # Launched holding a slot; cleared while backing off without one
+            holding = True
+            try:
+                for attempt in range(1, THROTTLE_MAX_ATTEMPTS + 1):
+                    try:
+                        result = await self._generate_image(input, seat_id, depth_ref, seat_tier_map)
+                        controller.on_success()
+                        break
+                    except ActivityError as e:
+                        if not _is_rate_limited(e) or attempt == THROTTLE_MAX_ATTEMPTS:
+                            raise
+                        if controller.on_throttle(epoch):
+                            workflow.logger.info(
+                                f"Provider throttled; generation concurrency -> {controller.current}"
+                            )
+                        publish_concurrency()
+                        # Give the slot back while backing off, then queue for a new one
+                        release_slot()
+                        holding = False
+                        await asyncio.sleep(
+                            min(THROTTLE_BACKOFF.total_seconds() * 2 ** (attempt - 1), THROTTLE_MAX_BACKOFF.total_seconds())
+                        )
+                        epoch = await acquire_slot()
+                        holding = True
+
+                if result:
+                    unsaved[seat_id] = result
+                    self._progress.images_generated += 1
+                    cost_breakdown["image_generation"] = cost_breakdown.get("image_generation", 0) + cost_per_image
+                    self._progress.actual_cost += cost_per_image
+                    if len(unsaved) >= save_group_size:
+                        flush_saves()
+                else:
+                    self._progress.failed_items.append(seat_id)
+                    workflow.logger.warning(f"No image returned for {seat_id}")
+            except Exception as e:
+                workflow.logger.warning(f"Failed to generate image for {seat_id}: {e}")
+                self._progress.failed_items.append(seat_id)
+            finally:
+                finished += 1
+                if holding:
+                    release_slot()
+                publish_concurrency()
+                self._update_progress(
+                    message=(
+                        f"Generating images: {finished}/{queued} done, "
+                        f"{active} in flight (limit {controller.current})"
+                    )
+                )
 
-        # Log tier reference info if available
-        if input.tier_reference_images:
-            tiers_with_refs = list(input.tier_reference_images.keys())
-            workflow.logger.info(f"Using tier-specific reference images for tiers: {tiers_with_refs}")
+        publish_concurrency()
+        while True:
+            depth_maps = await depth_batch_queue.get()
+            if depth_maps is None:
+                break
 
-        batch_size = input.parallel_image_batch_size
+            # Filter to seats that need generation
+            seat_ids = [sid for sid in depth_maps if sid not in existing_images]
+            queued += len(seat_ids)
+            workflow.logger.info(
+                f"Queued {len(seat_ids)} images ({len(depth_maps) - len(seat_ids)} already exist)"
+            )
 
-        for batch_start in range(0, len(seat_ids), batch_size):
-            if self._should_cancel:
-                break
+            for seat_id in seat_ids:
+                # Wait for a free slot; cancellation stops new launches only
+                epoch = await acquire_slot()
+                if self._should_cancel:
+                    release_slot()
+                    break
+                task = asyncio.create_task(generate(seat_id, depth_maps[seat_id], epoch))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+
+        await asyncio.gather(*in_flight)
+        flush_saves()
+        await asyncio.gather(*saves)
+        return generated
 
-            batch_ids = seat_ids[batch_start:batch_start + batch_size]
-            batch_num = batch_start // batch_size + 1
-            total_batches = (len(seat_ids) + batch_size - 1) // batch_size
+    async def _generate_image(
+        self,
+        input: VenuePipelineInput,
+        seat_id: str,
+        depth_ref: str,
+        seat_tier_map: Optional[Dict[str, str]] = None,
+    ) -> Optional[str]:
+        """Run one generation activity; returns the image artifact ref or None."""
+        if input.use_rate_limiter:
+            await self._acquire_generation_permit(input)
+
+        # Select reference image and IP-adapter scale based on seat's tier
+        reference_ref = self._reference_refs.get("default")
+        ip_scale = input.ip_adapter_scale
+
+        # Check for tier-specific reference
+        if seat_tier_map:
+            seat_tier = seat_tier_map.get(seat_id, "lower")
+            if f"tier:{seat_tier}" in self._reference_refs:
+                reference_ref = self._reference_refs[f"tier:{seat_tier}"]
+                # Use tier-specific IP-adapter scale if available
+                if input.tier_ip_adapter_scales and seat_tier in input.tier_ip_adapter_scales:
+                    ip_scale = input.tier_ip_adapter_scales[seat_tier]
+
+        return await workflow.execute_activity(
+            generate_ai_image_activity,
+            args=[
+                depth_ref,
+                seat_id,
+                input.prompt,
+                input.model,
+                input.strength,
+                reference_ref,
+                ip_scale,
+            ],
+            task_queue=GENERATION_TASK_QUEUE,
+            start_to_close_timeout=timedelta(minutes=10),
+            retry_policy=AI_GENERATION_RETRY,
+            # No heartbeat_timeout - activities do not heartbeat while awaiting Modal
+        )
 
-            self._update_progress(
-                message=f"Generating images: batch {batch_num}/{total_batches} ({batch_start + 1}-{min(batch_start + batch_size, len(seat_ids))} of {len(seat_ids)})"
-            )
+    async def _acquire_generation_permit(self, input: VenuePipelineInput) -> None:
+        """
+        Wait for a permit from the shared GenerationRateLimiterWorkflow.
 
-            # Launch parallel activities for this batch
-            tasks = []
-            for seat_id in batch_ids:
-                # Select reference image and IP-adapter scale based on seat's tier
-                reference_b64 = input.reference_image_b64
-                ip_scale = input.ip_adapter_scale
-
-                # Check for tier-specific reference
-                if seat_tier_map and input.tier_reference_images:
-                    seat_tier = seat_tier_map.get(seat_id, "lower")
-                    if seat_tier in input.tier_reference_images:
-                        reference_b64 = input.tier_reference_images[seat_tier]
-                        # Use tier-specific IP-adapter scale if available
-                        if input.tier_ip_adapter_scales and seat_tier in input.tier_ip_adapter_scales:
-                            ip_scale = input.tier_ip_adapter_scales[seat_tier]
-
-                task = workflow.execute_activity(
-                    generate_ai_image_activity,
-                    args=[
-                        depth_maps[seat_id],
-                        seat_id,
-                        input.prompt,
-                        input.model,
-                        input.strength,
-                        reference_b64,
-                        ip_scale,
-                    ],
-                    start_to_close_timeout=timedelta(minutes=10),
-                    retry_policy=AI_GENERATION_RETRY,
-                    # No heartbeat_timeout - Modal calls are blocking
-                )
-                tasks.append((seat_id, task))
+        Fails open: if the limiter isn't running or doesn't answer within
+        PERMIT_TIMEOUT, generation goes ahead (AIMD still reacts to 429s) and
+        the request is withdrawn so it doesn't spend a token later.
+        """
+        self._permit_seq += 1
+        info = workflow.info()
+        request_id = f"{info.workflow_id}:{self._permit_seq}"
 
-            # Await all tasks in batch and save results
-            batch_images = {}
-            for seat_id, task in tasks:
-                try:
-                    result = await task
-                    if result:
-                        batch_images[seat_id] = result
-                        self._progress.images_generated += 1
-                        cost_breakdown["image_generation"] = cost_breakdown.get("image_generation", 0) + cost_per_image
-                        self._progress.actual_cost += cost_per_image
-                    else:
-                        self._progress.failed_items.append(seat_id)
-                        workflow.logger.warning(f"No image returned for {seat_id}")
-                except Exception as e:
-                    workflow.logger.warning(f"Failed to generate image for {seat_id}: {e}")
-                    self._progress.failed_items.append(seat_id)
+        limiter = workflow.get_external_workflow_handle(RATE_LIMITER_WORKFLOW_ID)
+        self._permits_waiting.add(request_id)
+        try:
+            await self._wait_for_permit(limiter, request_id, info.workflow_id, input)
+        finally:
+            self._permits_waiting.discard(request_id)
+            self._permits_granted.discard(request_id)
 
-            # Save batch to storage
-            if batch_images:
-                batch_paths = await workflow.execute_activity(
-                    save_generated_images_activity,
-                    args=[input.venue_dir or f"venues/{input.venue_id}", batch_images],
-                    start_to_close_timeout=timedelta(minutes=2),
-                    retry_policy=FAST_RETRY,
-                )
-                generated.update(batch_paths)
+    async def _wait_for_permit(self, limiter, request_id: str, workflow_id: str, input: VenuePipelineInput) -> None:
+        try:
+            await limiter.signal(
+                GenerationRateLimiterWorkflow.request_permit,
+                PermitRequest(
+                    request_id=request_id,
+                    workflow_id=workflow_id,
+                    venue_id=input.venue_id,
+                    model=input.model,
+                ),
+            )
+        except Exception as e:
+            workflow.logger.warning(f"Rate limiter unavailable, generating without a permit: {e}")
+            return
 
-        return generated
+        try:
+            await workflow.wait_condition(
+                lambda: request_id in self._permits_granted, timeout=PERMIT_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            workflow.logger.warning(f"No rate-limiter permit after {PERMIT_TIMEOUT}, generating anyway")
+            try:
+                await limiter.signal(GenerationRateLimiterWorkflow.withdraw_permit, request_id)
+            except Exception as e:
+                workflow.logger.warning(f"Could not withdraw permit request {request_id}: {e}")
 
     def _update_progress(
         self,
@@ -499,7 +1145,6 @@ class VenuePipelineWorkflow:
         input: VenuePipelineInput,
         start_time,
         cost_breakdown: Dict[str, float],
-        all_seats: List[dict],
         anchor_seats: List[dict],
         depth_paths: Dict[str, str],
         image_paths: Dict[str, str],
@@ -508,7 +1153,7 @@ class VenuePipelineWorkflow:
         return PipelineResult(
             venue_id=input.venue_id,
             success=True,
-            all_seats_count=len(all_seats),
+            all_seats_count=self._progress.seats_generated,
             anchor_seats_count=len(anchor_seats),
             depth_maps_rendered=len(depth_paths),
             depth_map_paths=list(depth_paths.values()),
@@ -520,6 +1165,30 @@ class VenuePipelineWorkflow:
             duration_seconds=(workflow.now() - start_time).total_seconds(),
         )
 
+    def _make_sharded_result(
+        self,
+        input: VenuePipelineInput,
+        state: ShardedPipelineState,
+        shards: int,
+        error_message: Optional[str] = None,
+    ) -> PipelineResult:
+        """Create the result of a sharded run; paths are in the shards' listings."""
+        return PipelineResult(
+            venue_id=input.venue_id,
+            success=error_message is None,
+            all_seats_count=state.seats_generated,
+            anchor_seats_count=state.anchor_seats_count,
+            depth_maps_rendered=state.depth_maps_rendered,
+            images_generated=state.images_generated,
+            failed_seats=state.failed_seats,
+            total_cost=state.actual_cost,
+            cost_breakdown=state.cost_breakdown,
+            shards=shards,
+            path_listing_refs=state.path_listing_refs,
+            duration_seconds=workflow.now().timestamp() - state.started_at,
+            error_message=error_message,
+        )
+
     def _make_cancelled_result(
         self,
         input: VenuePipelineInput,
@@ -542,3 +1211,91 @@ class VenuePipelineWorkflow:
             duration_seconds=(workflow.now() - start_time).total_seconds(),
             error_message="Cancelled by user",
         )
+
+
+@workflow.defn
+class VenueShardWorkflow(VenuePipelineWorkflow):
+    """
+    Stages 3 + 4 for one shard of a large venue.
+
+    Started by VenuePipelineWorkflow._run_shards. Shares the pipeline's stage
+    helpers, signals and progress query; depth and image paths go to a JSON
+    artifact so only counts and a ref return to the parent.
+    """
+
+    @workflow.run
+    async def run(self, shard: VenueShardInput) -> VenueShardResult:
+        input = shard.pipeline
+        self._reference_refs = dict(shard.reference_refs)
+        cost_breakdown: Dict[str, float] = {}
+        all_depth_maps: Dict[str, str] = {}
+        depth_paths: Dict[str, str] = {}
+        image_paths: Dict[str, str] = {}
+        generate_images = not (input.stop_after_depths or input.skip_ai_generation)
+
+        existing_images: Dict[str, str] = {}
+        if generate_images and shard.reuse_existing_images:
+            seat_ids = {s["id"] for s in shard.seats}
+            seat_ids.update(derived for targets in shard.mirrors.values() for derived, _ in targets)
+            existing_images = await workflow.execute_activity(
+                load_existing_images_activity,
+                input.venue_dir,
+                task_queue=LIGHTWEIGHT_TASK_QUEUE,
+                start_to_close_timeout=timedelta(seconds=30),
+                retry_policy=FAST_RETRY,
+            )
+            existing_images = {k: v for k, v in existing_images.items() if k in seat_ids}
+
+        self._update_progress(
+            PipelineStage.RENDERING_DEPTHS,
+            step=3,
+            current_item=shard.shard_id,
+            message=f"Shard {shard.shard_id}: rendering {len(shard.seats)} seats..."
+        )
+
+        depth_batch_queue: asyncio.Queue = asyncio.Queue()
+        generation_task = None
+        if generate_images:
+            generation_task = asyncio.create_task(self._generate_images_streaming(
+                input, depth_batch_queue, existing_images, cost_breakdown, shard.seat_tiers
+            ))
+
+        try:
+            await self._render_and_save_depths(
+                input, shard.blend_file_ref, shard.seats, shard.mirrors,
+                all_depth_maps, depth_paths, cost_breakdown,
+                depth_batch_queue if generation_task is not None else None,
+            )
+        except BaseException:
+            # Same as the pipeline: a failed depth stage stops the shard's generation
+            await _cancel_and_wait(generation_task)
+            raise
+        finally:
+            depth_batch_queue.put_nowait(None)
+
+        if generation_task is not None:
+            self._update_progress(
+                PipelineStage.GENERATING_IMAGES,
+                step=4,
+                message=f"Shard {shard.shard_id}: generating AI images..."
+            )
+            image_paths = await generation_task
+
+        listing = json.dumps({"depth_maps": depth_paths, "images": image_paths})
+        refs = await workflow.execute_activity(
+            store_artifacts_activity,
+            {"paths": base64.b64encode(listing.encode()).decode()},
+            task_queue=LIGHTWEIGHT_TASK_QUEUE,
+            start_to_close_timeout=timedelta(minutes=1),
+            retry_policy=FAST_RETRY,
+        )
+
+        self._update_progress(PipelineStage.COMPLETED, message=f"Shard {shard.shard_id} complete")
+        return VenueShardResult(
+            shard_id=shard.shard_id,
+            depth_maps_rendered=len(all_depth_maps),
+            images_generated=len(image_paths),
+            failed_seats=self._progress.failed_items,
+            cost_breakdown=cost_breakdown,
+            path_listing_ref=refs["paths"],
+        )
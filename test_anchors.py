@@ -0,0 +1,71 @@
+"""Anchor selection (farthest-point sampling) tests (pytest, no services needed)."""
+
+import numpy as np
+import pytest
+
+from geometry import farthest_point_sampling, generate_seat_arrays, get_anchor_seats, select_anchor_seats, view_features
+
+SECTIONS = {
+    f"1{i:02d}": {"tier": "lower", "angle": i * 15.0, "rows": 12, "seats_per_row": 10}
+    for i in range(24)
+}
+
+
+def _coverage(points, selected):
+    """Largest distance from any point to its nearest selected point."""
+    d = np.linalg.norm(points[:, None, :] - points[selected][None, :, :], axis=2)
+    return d.min(axis=1).max()
+
+
+def test_radius_bounds_every_seats_view_error():
+    seats = generate_seat_arrays(SECTIONS)
+    points = view_features(seats.x, seats.y, seats.z, seats.look_angle)
+
+    anchors, achieved = select_anchor_seats(seats, radius=8.0)
+
+    assert achieved <= 8.0
+    assert _coverage(points, anchors) == pytest.approx(achieved)
+    assert len(anchors) < len(seats) // 4
+
+
+def test_budget_caps_anchor_count():
+    seats = generate_seat_arrays(SECTIONS)
+
+    anchors, achieved = select_anchor_seats(seats, budget=10)
+    fewer, worse = select_anchor_seats(seats, budget=5)
+
+    assert len(anchors) == 10 and len(set(anchors.tolist())) == 10
+    assert worse >= achieved
+    # Greedy order: a smaller budget is a prefix of a larger one
+    assert fewer.tolist() == anchors[:5].tolist()
+
+
+def test_anchor_seats_are_sorted_and_deterministic():
+    seats = generate_seat_arrays(SECTIONS)
+
+    first = get_anchor_seats(seats, budget=12)
+    assert first.tolist() == sorted(first.tolist())
+    assert np.array_equal(first, get_anchor_seats(seats, budget=12))
+
+
+def test_sampling_edge_cases():
+    points = np.array([[0.0, 0.0], [10.0, 0.0], [0.0, 10.0]])
+
+    assert farthest_point_sampling(np.empty((0, 2)), radius=1.0)[0].size == 0
+    assert len(farthest_point_sampling(points, radius=100.0)[0]) == 1
+    assert len(farthest_point_sampling(points, budget=10)[0]) == 3
+    with pytest.raises(ValueError):
+        farthest_point_sampling(points)
+
+
+def test_fixed_anchors_are_kept_and_only_gaps_are_filled():
+    seats = generate_seat_arrays(SECTIONS)
+    full = get_anchor_seats(seats, radius=8.0)
+
+    kept = full[::2]
+    anchors, achieved = select_anchor_seats(seats, radius=8.0, fixed=kept)
+
+    assert anchors[:len(kept)].tolist() == kept.tolist()
+    assert achieved <= 8.0
+    # Nothing to add when the fixed anchors already cover every seat
+    assert get_anchor_seats(seats, radius=8.0, fixed=full).tolist() == full.tolist()
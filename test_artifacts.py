@@ -0,0 +1,133 @@
+"""Claim-check artifact store tests (pytest, no services needed)."""
+
+import base64
+import os
+import time
+from datetime import timedelta
+
+import pytest
+
+from blobs.store import LocalBlobStore, set_blob_store
+from temporal.activities import artifacts
+from temporal.activities.artifacts import (
+    BlobArtifactStore,
+    LocalArtifactStore,
+    artifact_bytes,
+    storage_ref,
+    storage_ref_path,
+)
+
+
+@pytest.fixture
+def blobs(tmp_path):
+    store = LocalBlobStore(tmp_path / "blobs")
+    set_blob_store(store)
+    yield store
+    set_blob_store(None)
+
+
+@pytest.fixture
+def local_artifacts(tmp_path, monkeypatch):
+    store = LocalArtifactStore(tmp_path / "artifacts")
+    monkeypatch.setattr(artifacts, "_store", store)
+    return store
+
+
+class CountingStore(LocalArtifactStore):
+    """LocalArtifactStore that counts reads and writes."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.reads = 0
+        self.writes = 0
+
+    def _read(self, key):
+        self.reads += 1
+        return super()._read(key)
+
+    def _write(self, key, data):
+        self.writes += 1
+        super()._write(key, data)
+
+
+@pytest.mark.parametrize("backend", ["local", "blob"])
+def test_put_get_round_trip_shares_identical_bytes(backend, tmp_path, blobs):
+    def new_store():
+        return LocalArtifactStore(tmp_path / "artifacts") if backend == "local" else BlobArtifactStore(blobs)
+
+    store = new_store()
+    ref = store.put(b"depth")
+
+    assert ref == f"artifact://{artifacts.artifact_key(b'depth')}"
+    assert store.put(b"depth") == ref
+    assert store.get(ref) == b"depth"
+    # Another worker's store reads it back from the backend
+    assert new_store().get(ref) == b"depth"
+    with pytest.raises(KeyError):
+        store.get("artifact://" + "0" * 64)
+
+
+def test_memory_cache_keeps_recent_artifacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "_MEMORY_CACHE_SIZE", 2)
+    store = CountingStore(tmp_path)
+    refs = [store.put(bytes([i])) for i in range(3)]
+
+    # The first put was evicted, the last two are served from memory
+    assert [store.get(ref) for ref in refs[1:]] == [b"\x01", b"\x02"]
+    assert store.reads == 0
+    assert store.get(refs[0]) == b"\x00"
+    assert store.reads == 1
+
+    # Re-putting recently written bytes skips the write
+    store.put(b"\x02")
+    assert store.writes == 3
+
+
+def test_storage_refs_download_lazily(blobs, local_artifacts):
+    blobs.upload("v1/depth_maps/101_A_1_depth.png", b"png", {"upsert": "true"})
+    ref = storage_ref("v1/depth_maps/101_A_1_depth.png", "abc123")
+
+    assert ref == "storage://v1/depth_maps/101_A_1_depth.png#abc123"
+    assert storage_ref_path(ref) == "v1/depth_maps/101_A_1_depth.png"
+    assert artifact_bytes(ref) == b"png"
+    with pytest.raises(KeyError):
+        artifact_bytes(storage_ref("v1/depth_maps/missing.png"))
+
+
+def test_artifact_bytes_resolves_refs_and_legacy_base64(local_artifacts):
+    assert artifact_bytes(artifacts.put_artifact(b"blend")) == b"blend"
+    assert artifact_bytes(base64.b64encode(b"legacy").decode()) == b"legacy"
+
+
+def test_prune_removes_only_expired_artifacts(tmp_path, blobs):
+    local = LocalArtifactStore(tmp_path / "artifacts")
+    old_ref, new_ref = local.put(b"old"), local.put(b"new")
+    old_path = local._path(old_ref[len("artifact://"):])
+    stale = time.time() - 2 * 86400
+    os.utime(old_path, (stale, stale))
+
+    assert local.prune(timedelta(hours=24)) == 1
+    assert not old_path.exists()
+    assert local.get(new_ref) == b"new"
+
+    remote = BlobArtifactStore(blobs)
+    ref = remote.put(b"blend")
+    assert remote.prune(timedelta(hours=24)) == 0
+    assert remote.prune(timedelta(0)) == 1
+    with pytest.raises(KeyError):
+        BlobArtifactStore(blobs).get(ref)
+    # The local blob store's unreferenced bytes went too
+    assert not list((blobs.root / "objects").glob("*/*"))
+
+
+def test_put_refreshes_an_existing_artifacts_age(tmp_path):
+    store = LocalArtifactStore(tmp_path)
+    ref = store.put(b"blend")
+    path = store._path(ref[len("artifact://"):])
+    stale = time.time() - 2 * 86400
+    os.utime(path, (stale, stale))
+
+    # Another process (empty memory cache) reuses the bytes
+    LocalArtifactStore(tmp_path).put(b"blend")
+
+    assert store.prune(timedelta(hours=24)) == 0
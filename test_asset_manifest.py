@@ -0,0 +1,183 @@
+"""Asset manifest and local blob store tests (pytest, no services needed)."""
+
+import threading
+
+import pytest
+
+from blobs.manifest import (
+    FINAL_IMAGE,
+    AssetManifest,
+    asset_entry,
+    head_path,
+    load_asset_manifest,
+    read_asset_manifest,
+    update_asset_manifest,
+    version_path,
+    _publish_head,
+)
+from blobs.store import BlobExistsError, LocalBlobStore, SupabaseBlobStore, blob_store, set_blob_store, supabase_client
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalBlobStore(tmp_path / "blobs")
+
+
+@pytest.fixture
+def fresh_blob_store(monkeypatch):
+    for name in ("BLOB_STORE", "SUPABASE_URL", "SUPABASE_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    set_blob_store(None)
+    supabase_client.cache_clear()
+    yield
+    set_blob_store(None)
+    supabase_client.cache_clear()
+
+
+def _put_image(store, venue_id, name, data=b"jpeg"):
+    path = f"{venue_id}/final_images/{name}"
+    store.upload(path, data, {"content-type": "image/jpeg", "upsert": "true"})
+    return path
+
+
+def test_local_store_dedups_identical_bytes(store):
+    store.upload("v1/a.png", b"same", {"upsert": "true"})
+    store.upload("v1/b.png", b"same", {"upsert": "true"})
+
+    assert store.download("v1/a.png") == store.download("v1/b.png") == b"same"
+    assert len(list((store.root / "objects").glob("*/*"))) == 1
+
+
+def test_local_store_create_only_conflicts(store):
+    store.upload("v1/x.json", b"1", {"upsert": "false"})
+    with pytest.raises(BlobExistsError):
+        store.upload("v1/x.json", b"2", {"upsert": "false"})
+    assert store.download("v1/x.json") == b"1"
+
+
+class FailingBucket:
+    """Supabase bucket stand-in whose downloads raise the given error."""
+
+    def __init__(self, error):
+        self.error = error
+
+    def download(self, path):
+        raise self.error
+
+
+def test_supabase_store_only_maps_not_found_to_key_error():
+    not_found = Exception({"statusCode": 400, "error": "not_found", "message": "Object not found"})
+    with pytest.raises(KeyError):
+        SupabaseBlobStore(FailingBucket(not_found)).download("v1/missing.png")
+
+    outage = ConnectionError("connection reset by peer")
+    with pytest.raises(ConnectionError):
+        SupabaseBlobStore(FailingBucket(outage)).download("v1/a.png")
+
+
+def test_local_store_lists_pages_in_order(store):
+    for i in range(5):
+        store.upload(f"v1/depth_maps/{i}_depth.png", bytes([i]), {"upsert": "true"})
+
+    first = store.list("v1/depth_maps", {"limit": 2, "offset": 0})
+    rest = store.list("v1/depth_maps", {"limit": 10, "offset": 2})
+    newest = store.list("v1/depth_maps", {"limit": 1, "sortBy": {"column": "name", "order": "desc"}})
+
+    assert [f["name"] for f in first + rest] == [f"{i}_depth.png" for i in range(5)]
+    assert newest[0]["name"] == "4_depth.png"
+
+
+def test_local_store_must_be_asked_for(fresh_blob_store, monkeypatch, tmp_path):
+    with pytest.raises(ValueError):
+        blob_store()
+
+    monkeypatch.setenv("BLOB_STORE", "local")
+    monkeypatch.setenv("BLOB_DIR", str(tmp_path))
+    assert isinstance(blob_store(), LocalBlobStore)
+
+
+def test_first_write_backfills_existing_files(store):
+    legacy = [_put_image(store, "v1", f"{i}_final.jpg", bytes([i])) for i in range(3)]
+    new_path = _put_image(store, "v1", "new_final.jpg")
+
+    update_asset_manifest(store, "v1", put={new_path: asset_entry(new_path, b"jpeg", "image/jpeg")})
+
+    manifest = read_asset_manifest(store, "v1")
+    assert set(manifest.of_kind(FINAL_IMAGE)) == {*legacy, new_path}
+    assert manifest.version == 1
+
+
+def test_backfill_with_failed_listing_writes_nothing(store):
+    _put_image(store, "v1", "old_final.jpg")
+
+    class FlakyStore(LocalBlobStore):
+        def list(self, path, options=None):
+            if path.endswith("final_images"):
+                raise ConnectionError("listing timed out")
+            return super().list(path, options)
+
+    flaky = FlakyStore(store.root)
+    with pytest.raises(RuntimeError):
+        update_asset_manifest(flaky, "v1", put={"v1/preview.png": asset_entry("v1/preview.png", b"png")})
+
+    assert read_asset_manifest(store, "v1") is None
+    assert store.list("v1/assets") == []
+
+
+def test_load_never_writes(store):
+    _put_image(store, "v1", "old_final.jpg")
+
+    assert load_asset_manifest(store, "typo-venue").assets == {}
+    assert load_asset_manifest(store, "v1").count(FINAL_IMAGE) == 1
+
+    assert store.list("typo-venue") == []
+    assert read_asset_manifest(store, "v1") is None
+
+
+def test_concurrent_writers_keep_every_entry(store):
+    def write(i):
+        path = f"v1/final_images/{i}_final.jpg"
+        update_asset_manifest(store, "v1", put={path: asset_entry(path, bytes([i]))})
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    manifest = read_asset_manifest(store, "v1")
+    assert manifest.version == 20
+    assert manifest.count(FINAL_IMAGE) == 20
+
+
+def test_stale_writer_does_not_overwrite_newer_head(store):
+    update_asset_manifest(store, "v1", put={"v1/preview.png": asset_entry("v1/preview.png", b"1")})
+    stale = read_asset_manifest(store, "v1")
+    update_asset_manifest(store, "v1", put={"v1/venue_model.blend": asset_entry("v1/venue_model.blend", b"2")})
+
+    _publish_head(store, "v1", stale)
+
+    assert read_asset_manifest(store, "v1").version == 2
+
+
+def test_head_is_repaired_when_a_newer_version_lands_during_publish(store):
+    update_asset_manifest(store, "v1", put={"v1/preview.png": asset_entry("v1/preview.png", b"1")})
+    mine = read_asset_manifest(store, "v1")
+    mine.version = 2
+    store.upload(version_path("v1", 2), mine.to_bytes(), {"upsert": "false"})
+
+    class RacingStore(LocalBlobStore):
+        """A newer writer creates and publishes v3 right before our head write."""
+        raced = False
+
+        def upload(self, path, data, file_options=None):
+            if path == head_path("v1") and not self.raced:
+                self.raced = True
+                newer = AssetManifest(venue_id="v1", version=3, assets={"v1/x.png": {}})
+                super().upload(version_path("v1", 3), newer.to_bytes(), {"upsert": "false"})
+                super().upload(head_path("v1"), newer.to_bytes(), {"upsert": "true"})
+            super().upload(path, data, file_options)
+
+    _publish_head(RacingStore(store.root), "v1", mine)
+
+    assert read_asset_manifest(store, "v1").version == 3
@@ -0,0 +1,130 @@
+"""AIMD controller, token bucket and rate limiter queue tests (pytest, no Temporal server needed)."""
+
+import asyncio
+
+from temporal.workflows.concurrency import AIMDController, TokenBucket, is_rate_limit_error
+from temporal.workflows.rate_limiter import GenerationRateLimiterWorkflow
+from temporal.workflows.types import ModelBudget, PermitRequest
+from temporal.workflows.venue_pipeline import _cancel_and_wait
+
+
+def _request(request_id, venue_id="v1", model="flux"):
+    return PermitRequest(request_id=request_id, workflow_id=f"wf-{venue_id}", venue_id=venue_id, model=model)
+
+
+def test_aimd_grows_by_about_one_per_window():
+    controller = AIMDController(limit=4.0, max_limit=16)
+    for _ in range(4):
+        controller.on_success()
+
+    assert controller.current == 4
+    assert 4.9 < controller.limit <= 5.0
+
+
+def test_aimd_halves_once_per_epoch():
+    controller = AIMDController(limit=8.0, max_limit=16)
+    epoch = controller.epoch
+
+    assert controller.on_throttle(epoch)
+    # Other calls started in the same epoch throttle too, but don't halve again
+    assert not controller.on_throttle(epoch)
+    assert controller.current == 4
+    assert controller.throttles == 2
+
+
+def test_aimd_respects_bounds():
+    controller = AIMDController(limit=1.0, min_limit=1, max_limit=2)
+    controller.on_throttle(controller.epoch)
+    assert controller.current == 1
+
+    for _ in range(20):
+        controller.on_success()
+    assert controller.current == 2
+
+
+def test_fixed_controller_never_moves():
+    controller = AIMDController.fixed(3)
+    controller.on_throttle(controller.epoch)
+    controller.on_success()
+    assert controller.current == 3
+
+
+def test_rate_limit_errors_are_recognised():
+    assert is_rate_limit_error("HTTP 429 Too Many Requests")
+    assert not is_rate_limit_error("invalid prompt")
+
+
+def test_token_bucket_refills_up_to_burst():
+    bucket = TokenBucket(rate=1.0, burst=2.0, tokens=2.0, updated=0.0)
+
+    assert bucket.try_take(0.0) and bucket.try_take(0.0)
+    assert not bucket.try_take(0.0)
+    assert bucket.seconds_until_token(0.0) == 1.0
+
+    bucket.refill(100.0)
+    assert bucket.tokens == 2.0
+
+
+def test_token_bucket_with_zero_rate_never_refills():
+    bucket = TokenBucket(rate=0.0, burst=3.0, tokens=0.0, updated=0.0)
+
+    assert not bucket.try_take(1000.0)
+    assert bucket.seconds_until_token(1000.0) is None
+
+
+def test_limiter_pauses_model_with_zero_budget():
+    limiter = GenerationRateLimiterWorkflow()
+    limiter.set_budget("flux", ModelBudget(per_minute=0, burst=5))
+
+    bucket = limiter._bucket("flux", 0.0)
+    assert not bucket.try_take(0.0)
+    assert bucket.seconds_until_token(60.0) is None
+
+
+def test_limiter_round_robins_across_venues():
+    limiter = GenerationRateLimiterWorkflow()
+    for request in (_request("a1", "big"), _request("a2", "big"), _request("b1", "small")):
+        limiter.request_permit(request)
+
+    order = [limiter._next_request("flux").request_id for _ in range(3)]
+
+    assert order == ["a1", "b1", "a2"]
+    assert limiter._next_request("flux") is None
+
+
+def test_withdrawn_request_is_never_granted():
+    limiter = GenerationRateLimiterWorkflow()
+    limiter.request_permit(_request("a1"))
+    limiter.request_permit(_request("a2"))
+
+    limiter.withdraw_permit("a1")
+    assert limiter._next_request("flux").request_id == "a2"
+
+    limiter.withdraw_permit("a2")  # Already granted: nothing queued to drop
+    limiter.withdraw_permit("unknown")
+    assert limiter._pending == {}
+
+
+def test_pipeline_drops_grants_nobody_waits_for():
+    from temporal.workflows.venue_pipeline import VenuePipelineWorkflow
+
+    pipeline = VenuePipelineWorkflow()
+    pipeline._permits_waiting.add("wf:1")
+
+    pipeline.permit_granted("wf:1")
+    pipeline.permit_granted("wf:0")  # Timed out and withdrawn earlier
+
+    assert pipeline._permits_granted == {"wf:1"}
+
+
+def test_generation_waiting_on_the_queue_is_stopped():
+    async def scenario():
+        queue: asyncio.Queue = asyncio.Queue()
+        consumer = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+
+        await _cancel_and_wait(consumer)
+        await _cancel_and_wait(None)
+        return consumer
+
+    assert asyncio.run(scenario()).cancelled()
@@ -0,0 +1,72 @@
+"""Content-addressed depth-map cache tests (pytest, no services needed)."""
+
+import threading
+from dataclasses import replace
+
+from geometry.depth_cache import DEFAULT_CAMERA, LocalDepthCache, ObjectStoreDepthCache, blend_hash, depth_cache_key
+
+BLEND = b"BLENDER-v400 venue"
+SEAT = {"id": "101_A_1", "x": 1.23456, "y": 18.5, "z": 2.0}
+
+
+class MemoryBucket:
+    """download/upload like a storage bucket, in memory."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def download(self, path):
+        return self.objects[path]
+
+    def upload(self, path, data, file_options=None):
+        self.objects[path] = data
+
+
+def test_key_covers_geometry_pose_and_camera():
+    geometry = blend_hash(BLEND)
+    key = depth_cache_key(geometry, SEAT)
+
+    # Same pose under another seat id (e.g. a mirrored seat) hits the same entry
+    assert depth_cache_key(geometry, {**SEAT, "id": "102_A_1", "x": 1.2346}) == key
+
+    assert depth_cache_key(geometry, {**SEAT, "z": 2.5}) != key
+    assert depth_cache_key(geometry, SEAT, camera=replace(DEFAULT_CAMERA, lens=24.0)) != key
+    assert depth_cache_key(blend_hash(BLEND + b" rebuilt"), SEAT) != key
+
+
+def test_local_cache_round_trip(tmp_path):
+    cache = LocalDepthCache(tmp_path)
+    key = depth_cache_key(blend_hash(BLEND), SEAT)
+
+    assert cache.get(key) is None
+    cache.put_many({key: b"png"})
+
+    assert cache.get(key) == b"png"
+    assert cache.get_many([key, "0" * 64]) == {key: b"png"}
+
+
+def test_concurrent_puts_of_one_key_leave_a_whole_file(tmp_path):
+    cache = LocalDepthCache(tmp_path)
+    key = "ab" + "0" * 62
+    data = b"x" * 1_000_000
+
+    threads = [threading.Thread(target=cache.put, args=(key, data)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert cache.get(key) == data
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_object_store_cache_round_trip():
+    bucket = MemoryBucket()
+    cache = ObjectStoreDepthCache(bucket)
+    key = depth_cache_key(blend_hash(BLEND), SEAT)
+
+    assert cache.get(key) is None
+    cache.put(key, b"png")
+
+    assert cache.get(key) == b"png"
+    assert list(bucket.objects) == [f"depth_cache/{key[:2]}/{key}.png"]
@@ -0,0 +1,47 @@
+"""Section-level change detection tests (pytest, no services needed)."""
+
+from geometry import changed_seat_ids, diff_sections, generate_seat_arrays, section_hash, section_hashes
+
+SECTIONS = {
+    "101": {"angle": 0.0, "rows": 2, "seats_per_row": 2},
+    "102": {"angle": 15.0, "rows": 2, "seats_per_row": 2},
+    "103": {"angle": 30.0, "rows": 2, "seats_per_row": 2},
+}
+
+
+def test_hash_ignores_defaults_float_noise_and_other_fields():
+    section = {"angle": 15.0, "rows": 10}
+
+    assert section_hash(section) == section_hash({**section, "inner_radius": 18.0, "row_depth": None})
+    assert section_hash(section) == section_hash({"angle": 15.0000000001, "rows": 10})
+    assert section_hash(section) == section_hash({**section, "name": "Lower 102", "tier": "club"})
+    assert section_hash(section) != section_hash({"angle": 15.0, "rows": 11})
+
+
+def test_diff_classifies_sections():
+    old = section_hashes(SECTIONS)
+    new = section_hashes({
+        "101": SECTIONS["101"],
+        "102": {**SECTIONS["102"], "rows": 3},
+        "104": {"angle": 45.0},
+    })
+
+    diff = diff_sections(old, new)
+
+    assert diff.to_dict() == {"added": ["104"], "removed": ["103"], "changed": ["102"], "unchanged": ["101"]}
+    assert diff.dirty == ["104", "102"]
+
+
+def test_first_run_marks_everything_added():
+    diff = diff_sections(None, section_hashes(SECTIONS))
+    assert diff.added == list(SECTIONS) and not diff.changed
+
+
+def test_changed_seats_are_those_of_dirty_sections():
+    sections = {**SECTIONS, "102": {**SECTIONS["102"], "rows": 3}}
+    seats = generate_seat_arrays(sections)
+
+    diff = diff_sections(section_hashes(SECTIONS), section_hashes(sections))
+
+    assert changed_seat_ids(seats, diff) == ["102_A_1", "102_A_2", "102_B_1", "102_B_2", "102_C_1", "102_C_2"]
+    assert changed_seat_ids(seats, diff_sections(section_hashes(sections), section_hashes(sections))) == []
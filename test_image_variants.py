@@ -0,0 +1,146 @@
+"""Responsive image variant and images table tests (pytest, no services needed)."""
+
+import asyncio
+import io
+
+import pytest
+from PIL import Image, features
+from temporalio.testing import ActivityEnvironment
+
+from blobs.store import LocalBlobStore, set_blob_store
+from blobs.variants import variant_path
+from temporal.activities import artifacts, image_variants, storage_activities
+from temporal.activities.artifacts import LocalArtifactStore, put_artifact
+from temporal.activities.image_variants import build_variants, encode_variants, variant_formats, variant_widths
+from temporal.activities.storage_activities import _record_images, save_generated_images_activity
+
+
+def _jpeg(width, height):
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (90, 120, 200)).save(out, format="JPEG")
+    return out.getvalue()
+
+
+class FakeTable:
+    def __init__(self, client):
+        self.client = client
+
+    def upsert(self, rows, on_conflict=None):
+        self.client.upserts.append((rows, on_conflict))
+        return self
+
+    def execute(self):
+        return None
+
+
+class FakeSupabase:
+    """Records images table upserts."""
+
+    def __init__(self):
+        self.upserts = []
+
+    def table(self, name):
+        assert name == "images"
+        return FakeTable(self)
+
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+    client = FakeSupabase()
+    monkeypatch.setattr(storage_activities, "supabase_client", lambda: client)
+    return client
+
+
+def test_widths_and_formats_from_env(monkeypatch):
+    monkeypatch.delenv("IMAGE_VARIANT_WIDTHS", raising=False)
+    monkeypatch.delenv("IMAGE_VARIANT_FORMATS", raising=False)
+    assert variant_widths() == [320, 640, 1280]
+    assert variant_formats() == ["webp"]
+
+    monkeypatch.setenv("IMAGE_VARIANT_WIDTHS", "640, 320,640")
+    monkeypatch.setenv("IMAGE_VARIANT_FORMATS", "WebP,avif,gif")
+    assert variant_widths() == [320, 640]
+    assert variant_formats() == (["webp", "avif"] if features.check("avif") else ["webp"])
+
+
+def test_variants_never_upscale():
+    variants = encode_variants(_jpeg(1000, 500), [320, 640, 1280], ["webp"])
+
+    assert [(width, fmt) for width, fmt, _ in variants] == [(320, "webp"), (640, "webp")]
+    for width, _, data in variants:
+        image = Image.open(io.BytesIO(data))
+        assert (image.format, image.size) == ("WEBP", (width, width // 2))
+
+    # Smaller than every width: one variant at its own size
+    assert [(w, f) for w, f, _ in encode_variants(_jpeg(200, 100), [320, 640], ["webp"])] == [(200, "webp")]
+
+
+def test_images_that_fail_to_encode_are_left_out(monkeypatch):
+    monkeypatch.setenv("IMAGE_VARIANT_WIDTHS", "320")
+    monkeypatch.setenv("IMAGE_VARIANT_FORMATS", "webp")
+    monkeypatch.setenv("IMAGE_VARIANT_PROCESSES", "1")
+
+    variants = asyncio.run(ActivityEnvironment().run(
+        build_variants, {"101_A_1": _jpeg(640, 480), "101_A_2": b"not an image"},
+    ))
+
+    assert list(variants) == ["101_A_1"]
+    assert [(width, fmt) for width, fmt, _ in variants["101_A_1"]] == [(320, "webp")]
+
+
+def test_record_images_row_shape(fake_supabase):
+    variants = [{"url": "https://cdn/v1/image_variants/101_A_12_w320.webp", "width": 320, "format": "webp"}]
+    _record_images("v1", [{
+        "seat_id": "101_A_12",
+        "tier": "lower",
+        "final_image_url": "https://cdn/v1/final_images/101_A_12_final.jpg",
+        "variants": variants,
+    }])
+
+    [(rows, on_conflict)] = fake_supabase.upserts
+    assert on_conflict == "venue_id,seat_id"
+    # The nearest-view index (api/db/seat_views.py) reads these columns
+    assert rows == [{
+        "venue_id": "v1",
+        "section": "101",
+        "row": "A",
+        "seat": 12,
+        "seat_id": "101_A_12",
+        "tier": "lower",
+        "final_image_url": "https://cdn/v1/final_images/101_A_12_final.jpg",
+        "variants": variants,
+    }]
+
+
+def test_saved_images_record_their_variant_urls(tmp_path, monkeypatch, fake_supabase):
+    monkeypatch.setenv("IMAGE_VARIANT_WIDTHS", "320,640")
+    monkeypatch.setenv("IMAGE_VARIANT_FORMATS", "webp")
+    monkeypatch.setenv("IMAGE_VARIANT_PROCESSES", "1")
+    monkeypatch.setattr(artifacts, "_store", LocalArtifactStore(tmp_path / "artifacts"))
+    store = LocalBlobStore(tmp_path / "blobs")
+    set_blob_store(store)
+    try:
+        urls = asyncio.run(ActivityEnvironment().run(
+            save_generated_images_activity,
+            str(tmp_path / "venues" / "v1"),
+            {"101_A_1": put_artifact(_jpeg(800, 600))},
+            {"101_A_1": "upper"},
+        ))
+    finally:
+        set_blob_store(None)
+
+    [(rows, _)] = fake_supabase.upserts
+    [row] = rows
+    assert row["tier"] == "upper" and row["final_image_url"] == urls["101_A_1"]
+    assert row["variants"] == [
+        {"url": store.get_public_url(variant_path("v1", "101_A_1", width, "webp")), "width": width, "format": "webp"}
+        for width in (320, 640)
+    ]
+    assert Image.open(io.BytesIO(store.download(variant_path("v1", "101_A_1", 640, "webp")))).size == (640, 480)
+
+
+def teardown_module():
+    # Don't leave the spawned encoder processes running after the tests
+    if image_variants._pool is not None:
+        image_variants._pool.shutdown()
+        image_variants._pool = None
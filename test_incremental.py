@@ -0,0 +1,59 @@
+"""Incremental re-render planning tests (pytest, no services needed)."""
+
+import asyncio
+
+import pytest
+from temporalio.testing import ActivityEnvironment
+
+from blobs.store import LocalBlobStore, set_blob_store
+from geometry import MANIFEST_FILENAME, manifest_seats, read_seat_manifest
+from temporal.activities.storage_activities import load_anchor_seats_activity, save_seat_manifest_activity
+from temporal.workflows.types import VenuePipelineInput
+from temporal.workflows.venue_pipeline import VenuePipelineWorkflow
+
+SECTIONS = {
+    f"1{i:02d}": {"tier": "lower", "angle": i * 15.0, "rows": 12, "seats_per_row": 10}
+    for i in range(24)
+}
+
+
+@pytest.fixture
+def local_blob_store(tmp_path):
+    set_blob_store(LocalBlobStore(tmp_path / "blobs"))
+    yield
+    set_blob_store(None)
+
+
+def _save_manifest(venue_dir, sections):
+    return asyncio.run(ActivityEnvironment().run(
+        save_seat_manifest_activity, venue_dir, "v1", sections, 8.0, None, True,
+    ))
+
+
+def test_one_moved_section_only_renders_new_anchors(tmp_path, local_blob_store):
+    venue_dir = str(tmp_path / "venues" / "v1")
+    first = _save_manifest(venue_dir, SECTIONS)
+    # Section 106 holds anchors, so moving it by a degree needs new renders
+    moved = {**SECTIONS, "106": {**SECTIONS["106"], "angle": SECTIONS["106"]["angle"] + 1.0}}
+    second = _save_manifest(venue_dir, moved)
+
+    before = {seat["id"] for seat in first["anchor_seats"]}
+    after = {seat["id"] for seat in second["anchor_seats"]}
+    assert set(first["new_anchor_ids"]) == before
+    assert second["section_diff"]["changed"] == ["106"]
+
+    # Anchors of unchanged sections are kept; only the rest is rendered
+    rendered, _ = VenuePipelineWorkflow()._plan_renders(
+        VenuePipelineInput(venue_id="v1", config={}, sections=moved, incremental=True, mirror_symmetry=False),
+        second["anchor_seats"], [], second["new_anchor_ids"],
+    )
+    rendered_ids = {seat["id"] for seat in rendered}
+    assert rendered_ids == set(second["new_anchor_ids"])
+    assert after - rendered_ids == {seat_id for seat_id in before if not seat_id.startswith("106_")}
+    assert 0 < len(rendered_ids) < len(after) // 4
+
+    # The stored manifest names exactly the kept + rendered anchors
+    stored = read_seat_manifest(tmp_path / "venues" / "v1" / MANIFEST_FILENAME)
+    assert {seat["id"] for seat in manifest_seats(stored, "anchor")} == after
+    loaded = asyncio.run(ActivityEnvironment().run(load_anchor_seats_activity, venue_dir))
+    assert {seat["id"] for seat in loaded} == after
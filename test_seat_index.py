@@ -0,0 +1,51 @@
+"""Hierarchical tier/section/row seat index tests (pytest, no services needed)."""
+
+import numpy as np
+
+from geometry import generate_seat_arrays
+
+# Tiers interleaved and sections out of id order, to exercise the grouping
+SECTIONS = {
+    "202": {"tier": "upper", "rows": 2, "seats_per_row": 3},
+    "101": {"tier": "lower", "rows": 3, "seats_per_row": 4},
+    "201": {"tier": "upper", "rows": 1, "seats_per_row": 5},
+    "102": {"tier": "lower", "rows": 1, "seats_per_row": 4},
+}
+
+
+def test_tier_lookups_match_a_scan():
+    seats = generate_seat_arrays(SECTIONS)
+    index = seats.index
+
+    for t, tier in enumerate(seats.tiers):
+        assert sorted(index.tier_seats(tier).tolist()) == np.flatnonzero(seats.tier_idx == t).tolist()
+    assert [seats.section_ids[s] for s in index.tier_sections("upper")] == ["201", "202"]
+    assert [seats.section_ids[s] for s in index.tier_sections("lower")] == ["101", "102"]
+    assert index.tier_seats("club").size == 0
+
+
+def test_section_and_row_slices():
+    seats = generate_seat_arrays(SECTIONS)
+    index = seats.index
+
+    section = index.section_slice("101")
+    assert {seats.seat_id(i).split("_")[0] for i in range(section.start, section.stop)} == {"101"}
+    assert section.stop - section.start == 12
+
+    row = index.row_slice("101", 2)
+    assert [seats.seat_id(i) for i in range(row.start, row.stop)] == ["101_C_1", "101_C_2", "101_C_3", "101_C_4"]
+
+    assert index.section_slice("999") is None
+    assert index.row_slice("101", 3) is None
+    assert index.row_slice("102", 1) is None
+    assert index.row_slice("102", -1) is None
+
+
+def test_seat_lookup_is_closed_form():
+    seats = generate_seat_arrays(SECTIONS)
+
+    for i in range(len(seats)):
+        section_id = seats.section_ids[seats.section_idx[i]]
+        assert seats.index.seat(section_id, int(seats.row[i]), int(seats.seat[i])) == i
+    assert seats.index.seat("202", 0, 0) is None
+    assert seats.index.seat("202", 0, 4) is None
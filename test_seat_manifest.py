@@ -0,0 +1,57 @@
+"""Columnar seat manifest tests (pytest, no services needed)."""
+
+import numpy as np
+
+from geometry import (
+    build_seat_manifest,
+    generate_seat_arrays,
+    manifest_metadata,
+    manifest_section_hashes,
+    manifest_seats,
+    read_seat_manifest,
+    seat_arrays_from_manifest,
+    seat_manifest_to_bytes,
+    section_hashes,
+    write_seat_manifest,
+)
+
+SECTIONS = {
+    "101": {"tier": "lower", "angle": 0.0, "rows": 3, "seats_per_row": 4},
+    "201": {"tier": "upper", "angle": 90.0, "inner_radius": 30.0, "rows": 28, "seats_per_row": 2},
+}
+
+
+def test_manifest_round_trips_through_file_and_bytes(tmp_path):
+    seats = generate_seat_arrays(SECTIONS)
+    table = build_seat_manifest(seats, anchor=[0, 5], section_hashes=section_hashes(SECTIONS), metadata={"venue": "v1"})
+
+    from_file = read_seat_manifest(write_seat_manifest(table, tmp_path / "seats.arrow"))
+    from_bytes = read_seat_manifest(seat_manifest_to_bytes(table))
+
+    for loaded in (from_file, from_bytes):
+        assert loaded.num_rows == len(seats)
+        assert manifest_metadata(loaded)["venue"] == "v1"
+        assert manifest_section_hashes(loaded) == section_hashes(SECTIONS)
+
+
+def test_seat_arrays_survive_the_manifest():
+    seats = generate_seat_arrays(SECTIONS)
+    rebuilt = seat_arrays_from_manifest(read_seat_manifest(seat_manifest_to_bytes(build_seat_manifest(seats))))
+
+    assert rebuilt.section_ids == seats.section_ids
+    assert rebuilt.tiers == seats.tiers
+    assert [rebuilt.seat_id(i) for i in range(len(rebuilt))] == [seats.seat_id(i) for i in range(len(seats))]
+    assert np.array_equal(rebuilt.section_offsets, seats.section_offsets)
+    # Positions are stored as float32
+    assert np.allclose(rebuilt.x, seats.x, atol=1e-4)
+    assert rebuilt.locate("201_BB_2") == seats.locate("201_BB_2")
+
+
+def test_flag_columns_select_seats():
+    seats = generate_seat_arrays(SECTIONS)
+    table = build_seat_manifest(seats, anchor=[0, 5], sample=[5], changed=[])
+
+    assert [seat["id"] for seat in manifest_seats(table, "anchor")] == ["101_A_1", "101_B_2"]
+    assert [seat["id"] for seat in manifest_seats(table, "anchor", "sample")] == ["101_B_2"]
+    assert manifest_seats(table, "changed") == []
+    assert len(manifest_seats(build_seat_manifest(seats), "changed")) == len(seats)
@@ -0,0 +1,84 @@
+"""Vectorized seat generation tests (pytest, no services needed)."""
+
+import numpy as np
+import pytest
+
+from geometry import calculate_seat_positions, generate_seat_arrays, get_sample_seats, row_label, row_number
+
+SECTIONS = {
+    "101": {"tier": "lower", "angle": 0.0, "inner_radius": 18.0, "rows": 3, "seats_per_row": 4},
+    "102": {"tier": "lower", "angle": 15.0, "inner_radius": 18.0, "rows": 2, "seats_per_row": 5},
+    "201": {"tier": "upper", "angle": 90.0, "inner_radius": 30.0, "rows": 30, "seats_per_row": 1},
+}
+
+
+def test_row_labels_round_trip():
+    assert [row_label(n) for n in (0, 25, 26, 27)] == ["A", "Z", "AA", "BB"]
+    assert all(row_number(row_label(n)) == n for n in range(100))
+    with pytest.raises(ValueError):
+        row_number("AB")
+
+
+def test_every_seat_is_generated_in_section_row_seat_order():
+    seats = generate_seat_arrays(SECTIONS)
+
+    assert len(seats) == 3 * 4 + 2 * 5 + 30
+    assert seats.tier_counts() == {"lower": 22, "upper": 30}
+    assert [seats.seat_id(i) for i in range(5)] == ["101_A_1", "101_A_2", "101_A_3", "101_A_4", "101_B_1"]
+    assert seats.seat_id(len(seats) - 1) == "201_DD_1"
+
+
+def test_positions_match_the_per_seat_formula():
+    seats = generate_seat_arrays(SECTIONS)
+
+    for i in (0, 7, 15, len(seats) - 1):
+        section = SECTIONS[seats.section_ids[seats.section_idx[i]]]
+        x, y, z, look_angle = calculate_seat_positions(
+            section["angle"], section["inner_radius"], int(seats.row[i]), int(seats.seat[i]) - 1,
+            section["seats_per_row"], 0.85, 0.4, 2.0,
+        )
+        assert np.allclose([seats.x[i], seats.y[i], seats.z[i], seats.look_angle[i]], [x, y, z, look_angle])
+
+
+def test_single_seat_rows_sit_at_the_section_center():
+    seats = generate_seat_arrays({"201": SECTIONS["201"]})
+
+    assert np.allclose(seats.x, seats.x[0] * (seats.y / seats.y[0]))
+    assert np.allclose(seats.look_angle, -90.0)
+
+
+def test_locate_inverts_seat_id():
+    seats = generate_seat_arrays({**SECTIONS, "club_a": {"rows": 2, "seats_per_row": 2}})
+
+    for i in range(len(seats)):
+        assert seats.locate(seats.seat_id(i)) == i
+    assert seats.locate("club_a_B_2") == len(seats) - 1
+    assert seats.locate("101_A_99") is None
+    assert seats.locate("nope") is None
+
+
+def test_to_dicts_only_builds_requested_seats():
+    seats = generate_seat_arrays(SECTIONS)
+
+    [seat] = seats.to_dicts([5])
+    assert seat["id"] == "101_B_2"
+    assert (seat["section"], seat["row"], seat["seat"], seat["tier"]) == ("101", "B", 2, "lower")
+
+
+def test_sample_seats_are_front_middle_back_centers():
+    seats = generate_seat_arrays(SECTIONS)
+
+    ids = [seats.seat_id(i) for i in get_sample_seats(seats)]
+    # 102 has 2 rows, so no separate middle row; 201's center of a 1-seat row is seat 1
+    assert ids == ["101_A_3", "101_B_3", "101_C_3", "102_A_3", "102_B_3", "201_A_1", "201_P_1", "201_DD_1"]
+
+
+def test_explicit_zero_counts_are_kept():
+    seats = generate_seat_arrays({
+        "101": {"rows": 2, "seats_per_row": 0},
+        "102": {"rows": 0, "seats_per_row": 3},
+        "103": {"rows": 1, "seats_per_row": None},
+    })
+
+    assert len(seats) == 20
+    assert {seats.section_ids[i] for i in seats.section_idx} == {"103"}
@@ -0,0 +1,71 @@
+"""Shard planning and sharded-run bookkeeping tests (pytest, no Temporal server needed)."""
+
+from temporalio.converter import DataConverter
+
+from temporal.workflows.types import ShardedPipelineState, VenuePipelineInput, VenueShardResult
+from temporal.workflows.venue_pipeline import (
+    _pending_shards,
+    _plan_shards,
+    _record_shard_failure,
+    _record_shard_result,
+)
+
+
+def _seats(section, count, tier="lower"):
+    return [{"id": f"{section}_A_{n}", "section": section, "tier": tier} for n in range(1, count + 1)]
+
+
+SEATS = _seats("101", 4) + _seats("102", 3) + _seats("103", 2) + _seats("201", 5, tier="upper")
+
+
+def test_section_shards_follow_sections():
+    shards = _plan_shards(SEATS, "section", 100)
+
+    assert [shard_id for shard_id, _ in shards] == ["section-101", "section-102", "section-103", "section-201"]
+    assert [len(seats) for _, seats in shards] == [4, 3, 2, 5]
+
+
+def test_tier_shards_split_on_section_boundaries():
+    shards = _plan_shards(SEATS, "tier", 7)
+
+    assert [(shard_id, len(seats)) for shard_id, seats in shards] == [("lower-0", 7), ("lower-1", 2), ("upper-0", 5)]
+    # A section bigger than max_seats still gets a shard of its own
+    assert [len(seats) for _, seats in _plan_shards(SEATS, "tier", 1)] == [4, 3, 2, 5]
+    # Ids only depend on the seats, so a resumed run plans the same shards
+    assert _plan_shards(list(SEATS), "tier", 7) == shards
+
+
+def test_failed_shards_are_retried_then_given_up():
+    shards = _plan_shards(SEATS, "section", 100)
+    state = ShardedPipelineState(started_at=0.0)
+
+    _record_shard_result(state, VenueShardResult(
+        shard_id="section-101", depth_maps_rendered=4, images_generated=3,
+        failed_seats=["101_A_4"], cost_breakdown={"depth_maps": 0.08}, path_listing_ref="ref-101",
+    ))
+    assert _record_shard_failure(state, "section-102", ["102_A_1"], max_attempts=2)
+
+    # The failed shard is not completed and is picked up again
+    assert state.completed_shards == ["section-101"]
+    assert [shard_id for shard_id, _ in _pending_shards(shards, state, 2)] == ["section-102", "section-103", "section-201"]
+    assert state.failed_seats == ["101_A_4"]
+
+    # Out of attempts: its seats fail and nothing is left to run for it
+    assert not _record_shard_failure(state, "section-102", ["102_A_1"], max_attempts=2)
+    assert [shard_id for shard_id, _ in _pending_shards(shards, state, 2)] == ["section-103", "section-201"]
+    assert state.failed_seats == ["101_A_4", "102_A_1"]
+    assert state.completed_shards == ["section-101"]
+    assert (state.depth_maps_rendered, state.images_generated, state.actual_cost) == (4, 3, 0.08)
+    assert state.path_listing_refs == ["ref-101"]
+
+
+def test_state_survives_continue_as_new():
+    state = ShardedPipelineState(started_at=1.0, completed_shards=["lower-0"], new_anchor_ids=["101_A_1"])
+    _record_shard_failure(state, "upper-0", ["201_A_1"], max_attempts=3)
+    converter = DataConverter.default.payload_converter
+
+    [payload] = converter.to_payloads([VenuePipelineInput(venue_id="v1", config={}, sections={}, resume_state=state)])
+    [restored] = converter.from_payloads([payload], [VenuePipelineInput])
+
+    assert restored.resume_state == state
+    assert _pending_shards(_plan_shards(SEATS, "tier", 7), restored.resume_state, 3) == _plan_shards(SEATS, "tier", 7)[1:]
@@ -0,0 +1,51 @@
+"""Nearest rendered view index tests (pytest, no services needed)."""
+
+import numpy as np
+
+from geometry import generate_seat_arrays
+from geometry.spatial import RenderedViewIndex, view_features
+
+SECTIONS = {
+    "101": {"angle": 0.0, "rows": 10, "seats_per_row": 10},
+    "102": {"angle": 15.0, "rows": 10, "seats_per_row": 10},
+    "110": {"angle": 180.0, "rows": 10, "seats_per_row": 10},
+}
+
+
+def test_rendered_seat_matches_itself():
+    seats = generate_seat_arrays(SECTIONS)
+    index = RenderedViewIndex(seats, rendered_ids=["101_E_5"], payloads=[{"url": "a.jpg"}])
+
+    match = index.nearest("101_E_5")
+    assert (match.seat_id, match.distance, match.payload) == ("101_E_5", 0.0, {"url": "a.jpg"})
+
+
+def test_nearest_agrees_with_brute_force():
+    seats = generate_seat_arrays(SECTIONS)
+    rendered = [seats.seat_id(i) for i in range(0, len(seats), 17)]
+    index = RenderedViewIndex(seats, rendered_ids=rendered)
+
+    points = view_features(seats.x, seats.y, seats.z, seats.look_angle)
+    rendered_points = points[seats.locate_many(rendered)]
+    for i in range(0, len(seats), 7):
+        expected = rendered[int(np.argmin(np.linalg.norm(rendered_points - points[i], axis=1)))]
+        assert index.nearest(seats.seat_id(i)).seat_id == expected
+
+
+def test_opposite_side_of_the_bowl_is_not_a_match():
+    seats = generate_seat_arrays(SECTIONS)
+    index = RenderedViewIndex(seats, rendered_ids=["102_A_1", "110_A_1"])
+
+    assert index.nearest("101_A_10").seat_id == "102_A_1"
+    assert index.nearest("110_J_10").seat_id == "110_A_1"
+
+
+def test_unknown_and_stale_ids():
+    seats = generate_seat_arrays(SECTIONS)
+
+    assert RenderedViewIndex(seats, rendered_ids=[]).nearest("101_A_1") is None
+
+    index = RenderedViewIndex(seats, rendered_ids=["999_A_1", "101_A_1"], payloads=["stale", "ok"])
+    assert len(index) == 1
+    assert index.nearest("101_B_2").payload == "ok"
+    assert index.nearest("999_A_1") is None
@@ -0,0 +1,115 @@
+"""Mirror-symmetry render planning tests (pytest, no services needed)."""
+
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from geometry import (
+    expand_mirrored,
+    flip_depth_png,
+    generate_seat_arrays,
+    get_anchor_seats,
+    mirror_partners,
+    mirror_planes,
+    plan_mirrored_renders,
+    select_anchor_seats,
+)
+
+# A full bowl: 24 sections of 15 degrees, symmetric about both axes
+SECTIONS = {f"1{i:02d}": {"angle": i * 15.0, "rows": 3, "seats_per_row": 4} for i in range(24)}
+
+
+def _png(pixels) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(np.array(pixels, dtype=np.uint8)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_mirror_planes_follow_the_scene():
+    assert mirror_planes(None) == ["x", "y"]
+    assert mirror_planes({"surface_config": {"surface_type": "stage"}}) == ["x"]
+    assert mirror_planes({"landmarks": {"jumbotron": {"position": [0, 5, 20]}}}) == ["x"]
+    assert mirror_planes({"landmarks": {"jumbotron": {"position": [3, 5, 20]}}}) == []
+
+
+def test_symmetric_bowl_renders_a_quarter():
+    seats = generate_seat_arrays(SECTIONS).to_dicts()
+
+    plan = plan_mirrored_renders(seats, ["x", "y"])
+
+    assert len(plan.render) == len(seats) // 4
+    assert len(plan.render) + plan.derived_count == len(seats)
+    # Every seat is rendered or derived exactly once
+    derived = [target for targets in plan.mirrors.values() for target, _ in targets]
+    assert sorted([s["id"] for s in plan.render] + derived) == sorted(s["id"] for s in seats)
+
+
+def test_half_turn_is_not_flipped():
+    seats = generate_seat_arrays(SECTIONS).to_dicts()
+    by_id = {s["id"]: s for s in seats}
+
+    plan = plan_mirrored_renders(seats, ["x", "y"])
+
+    for source_id, targets in plan.mirrors.items():
+        source = by_id[source_id]
+        for target_id, flip in targets:
+            target = by_id[target_id]
+            half_turn = np.isclose(target["x"], -source["x"], atol=0.05) and np.isclose(target["y"], -source["y"], atol=0.05)
+            assert flip != half_turn
+
+
+def test_no_planes_renders_everything():
+    seats = generate_seat_arrays(SECTIONS).to_dicts()
+    plan = plan_mirrored_renders(seats, [])
+    assert len(plan.render) == len(seats) and plan.derived_count == 0
+
+
+def test_expand_flips_derived_depth_maps():
+    png = _png([[0, 50, 100], [150, 200, 250]])
+
+    expanded = expand_mirrored({"a": png, "c": png}, {"a": [("b", True), ("d", False)], "missing": [("e", True)]})
+
+    assert set(expanded) == {"a", "b", "c", "d"}
+    assert expanded["d"] == png
+    assert np.array(Image.open(io.BytesIO(expanded["b"]))).tolist() == [[100, 50, 0], [250, 200, 150]]
+    twice = flip_depth_png(flip_depth_png(png))
+    assert np.array_equal(np.array(Image.open(io.BytesIO(twice))), np.array(Image.open(io.BytesIO(png))))
+
+
+def test_mirror_partners_are_mirror_images():
+    seats = generate_seat_arrays(SECTIONS)
+    points = np.column_stack([seats.x, seats.y, seats.z])
+
+    partners = mirror_partners(seats.x, seats.y, seats.z, ["x", "y"])
+
+    assert partners.shape == (len(seats), 3) and (partners >= 0).all()
+    for t, signs in enumerate([(-1, 1, 1), (1, -1, 1), (-1, -1, 1)]):
+        assert np.allclose(points[partners[:, t]], points * signs, atol=0.05)
+    assert (mirror_partners(seats.x, seats.y, seats.z, ["x"]) == partners[:, :1]).all()
+    assert mirror_partners(seats.x, seats.y, seats.z, []).shape == (len(seats), 0)
+
+
+def test_anchors_of_a_real_bowl_come_with_their_mirror_images():
+    # PNC Arena's sections are only symmetric under the half turn
+    venue = Path(__file__).parent / "temporal" / "venues" / "pnc_arena"
+    seats = generate_seat_arrays(json.loads((venue / "sections.json").read_text()))
+    planes = mirror_planes(json.loads((venue / "config.json").read_text()))
+
+    for radius in (6.0, 12.0):
+        anchors = seats.to_dicts(get_anchor_seats(seats, radius=radius, planes=planes))
+        plan = plan_mirrored_renders(anchors, planes)
+
+        assert len(plan.render) == len(anchors) // 2
+        assert len(plan.render) + plan.derived_count == len(anchors)
+
+
+def test_symmetric_bowl_anchors_render_a_quarter():
+    seats = generate_seat_arrays({f"1{i:02d}": {"angle": i * 15.0, "rows": 12, "seats_per_row": 10} for i in range(24)})
+
+    anchors, achieved = select_anchor_seats(seats, radius=8.0, planes=["x", "y"])
+
+    assert achieved <= 8.0
+    assert len(plan_mirrored_renders(seats.to_dicts(anchors), ["x", "y"]).render) == len(anchors) // 4
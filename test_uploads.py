@@ -0,0 +1,90 @@
+"""Concurrent blob store upload tests (pytest, no services needed)."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from temporalio.testing import ActivityEnvironment
+
+from blobs.store import BlobStore, set_blob_store
+from temporal.activities.uploads import Upload, UploadResult, upload_concurrency, upload_files, upload_summary
+
+
+class SlowStore(BlobStore):
+    """Uploads take a while; records how many ran at once."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.objects = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def upload(self, path, data, file_options=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.02)
+            if path in self.fail:
+                raise ConnectionError("connection reset")
+            self.objects[path] = data
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def get_public_url(self, path):
+        return f"https://cdn/{path}"
+
+
+@pytest.fixture
+def slow_store():
+    store = SlowStore()
+    set_blob_store(store)
+    yield store
+    set_blob_store(None)
+
+
+def _uploads(n):
+    return [Upload(key=f"s{i}", storage_path=f"v1/{i}.png", content_type="image/png", data=bytes([i])) for i in range(n)]
+
+
+def test_concurrency_comes_from_env(monkeypatch):
+    monkeypatch.delenv("STORAGE_UPLOAD_CONCURRENCY", raising=False)
+    assert upload_concurrency() == 16
+
+    monkeypatch.setenv("STORAGE_UPLOAD_CONCURRENCY", "4")
+    assert upload_concurrency() == 4
+
+    monkeypatch.setenv("STORAGE_UPLOAD_CONCURRENCY", "0")
+    assert upload_concurrency() == 1
+
+
+def test_uploads_run_concurrently_up_to_the_limit(monkeypatch, slow_store):
+    monkeypatch.setenv("STORAGE_UPLOAD_CONCURRENCY", "3")
+
+    results = asyncio.run(ActivityEnvironment().run(upload_files, _uploads(12)))
+
+    assert [r.key for r in results] == [f"s{i}" for i in range(12)]
+    assert [r.location for r in results] == [f"https://cdn/v1/{i}.png" for i in range(12)]
+    assert slow_store.max_in_flight == 3
+
+
+def test_failed_upload_raises_after_the_rest_are_stored(slow_store):
+    slow_store.fail = {"v1/2.png"}
+
+    with pytest.raises(RuntimeError, match="1 of 4 uploads failed, e.g. s2"):
+        asyncio.run(ActivityEnvironment().run(upload_files, _uploads(4), 4))
+    assert sorted(slow_store.objects) == ["v1/0.png", "v1/1.png", "v1/3.png"]
+
+
+def test_summary_reports_latency_percentiles():
+    results = [UploadResult(key=str(i), size=10_000, seconds=(i + 1) / 1000) for i in range(100)]
+    results[-1].error = "timeout"
+
+    assert upload_summary(results, 1.5, 8) == (
+        "Stored 99 of 100 files (1.0 MB) in 1.50s with 8 workers; per file "
+        "p50 51ms, p95 96ms, max 100ms"
+    )
+    assert upload_summary(results[:1], 0.01, 1).endswith("p50 1ms, p95 1ms, max 1ms")
@@ -853,7 +853,7 @@ export default function VenueDetailPage() {
         >
           <div className="space-y-4">
             <p className="text-sm text-gray-500">
-              Select which sections to render depth maps for. Each section generates 3 depth maps (Front, Middle, Back row).
+              Select which sections to render depth maps for. Depth maps are rendered for anchor seats, picked so every seat has a nearby view.
             </p>
 
             {/* Section Selector */}
@@ -876,7 +876,7 @@ export default function VenueDetailPage() {
                     <button onClick={() => setSectionsForDepths(new Set())} className="px-3 py-1 text-sm bg-gray-100 text-gray-600 rounded-lg hover:bg-gray-200">
                       Clear
                     </button>
-                    <span className="ml-auto text-sm text-gray-500">{sectionsForDepths.size * 3} depth maps</span>
+                    <span className="ml-auto text-sm text-gray-500">One depth map per anchor seat</span>
                   </div>
                   <div className="max-h-48 overflow-y-auto space-y-2">
                     {tiers.map((tier) => {
@@ -940,7 +940,8 @@ export default function VenueDetailPage() {
                 <div className="flex items-center gap-3">
                   <Loader2 className="w-5 h-5 animate-spin text-purple-500" />
                   <span className="text-purple-700 dark:text-purple-300">
-                    Rendering depth maps... {pipelineProgress?.depth_maps_rendered || 0} / {sectionsForDepths.size * 3}
+                    Rendering depth maps... {pipelineProgress?.depth_maps_rendered || 0}
+                    {pipelineProgress?.depth_maps_planned ? ` / ${pipelineProgress.depth_maps_planned}` : ''}
                   </span>
                 </div>
               </div>
@@ -951,7 +952,7 @@ export default function VenueDetailPage() {
                 className="w-full px-4 py-3 bg-purple-600 text-white rounded-lg hover:bg-purple-700 disabled:opacity-50 font-medium flex items-center justify-center gap-2"
               >
                 <Eye className="w-5 h-5" />
-                Render {sectionsForDepths.size * 3} Depth Maps
+                Render Depth Maps
               </button>
             )}
           </div>
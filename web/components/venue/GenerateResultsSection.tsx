@@ -401,6 +401,9 @@ function FilterPill({
   );
 }
 
+// Rendered width of a gallery card, for choosing a srcset candidate
+const GALLERY_IMAGE_SIZES = '(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw';
+
 // Image Card Component
 function ImageCard({
   venueId,
@@ -444,14 +447,24 @@ function ImageCard({
             />
           </div>
         ) : (
-          <img
-            src={imageUrl}
-            alt={`Section ${image.section}, Row ${image.row}`}
-            className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-500"
-            onError={(e) => {
-              (e.target as HTMLImageElement).src = '/placeholder.png';
-            }}
-          />
+          <picture className="block w-full h-full">
+            {/* Resized variants; the browser picks a format and width, the JPEG is the fallback */}
+            {image.srcset?.avif && (
+              <source type="image/avif" srcSet={image.srcset.avif} sizes={GALLERY_IMAGE_SIZES} />
+            )}
+            {image.srcset?.webp && (
+              <source type="image/webp" srcSet={image.srcset.webp} sizes={GALLERY_IMAGE_SIZES} />
+            )}
+            <img
+              src={imageUrl}
+              alt={`Section ${image.section}, Row ${image.row}`}
+              loading="lazy"
+              className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-500"
+              onError={(e) => {
+                (e.target as HTMLImageElement).src = '/placeholder.png';
+              }}
+            />
+          </picture>
         )}
 
         {/* Hover Overlay */}
@@ -134,10 +134,12 @@ export function SelectConfigureSection({
   const sectionList = Object.values(sections);
   const sectionCount = Object.keys(sections).length;
   const selectedCount = selectedSections.size;
-  const imageCount = selectedCount * 3; // 3 seats per section (Front, Middle, Back)
 
   // For Step 3, use actual depth map count if available (can only generate images for existing depth maps)
   const availableDepthMaps = depthMaps.length || existingAssets?.depth_map_count || 0;
+  // Anchor seats are picked by view coverage when the pipeline runs, so the
+  // view count comes from the pipeline (0 until it has planned its renders)
+  const imageCount = progress?.depth_maps_planned || availableDepthMaps;
   const generatableImageCount = availableDepthMaps > 0 ? availableDepthMaps : imageCount;
 
   // Group sections by tier
@@ -386,7 +388,7 @@ export function SelectConfigureSection({
                 {sectionCount} sections ready
               </div>
               <div className="text-sm text-blue-600 dark:text-blue-400">
-                3 views per section: Front, Middle, Back Row
+                Views from anchor seats picked so every seat has a nearby view
               </div>
             </div>
           </div>
@@ -537,7 +539,7 @@ export function SelectConfigureSection({
                             Clear
                           </button>
                           <span className="ml-auto text-sm text-gray-500">
-                            {selectedCount * 3} depth maps will be rendered
+                            One depth map per anchor seat in the selected sections
                           </span>
                         </div>
 
@@ -741,7 +743,9 @@ export function SelectConfigureSection({
                         )}
                         {step.id === 'depths' && (
                           <span className="text-purple-600 dark:text-purple-400">
-                            {progress?.depth_maps_rendered || 0} of {imageCount} depth maps
+                            {imageCount
+                              ? `${progress?.depth_maps_rendered || 0} of ${imageCount} depth maps`
+                              : 'Picking anchor seats...'}
                           </span>
                         )}
                         {step.id === 'images' && (
@@ -763,11 +767,13 @@ export function SelectConfigureSection({
                       <>
                         <span className="text-gray-400">
                           {step.id === 'model' && 'Creates 3D arena geometry'}
-                          {step.id === 'depths' && `${imageCount} depth maps to render`}
+                          {step.id === 'depths' && (imageCount
+                            ? `${imageCount} depth maps to render`
+                            : 'One depth map per anchor seat')}
                           {step.id === 'images' && (
                             availableDepthMaps > 0
                               ? `${availableDepthMaps} images to generate (from depth maps)`
-                              : `${imageCount} images to generate`
+                              : 'One image per anchor seat'
                           )}
                         </span>
                         <span className="text-gray-400">0%</span>
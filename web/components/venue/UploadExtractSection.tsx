@@ -373,7 +373,7 @@ export function UploadExtractSection({
           <div className="text-sm text-gray-600">
             <span className="font-medium">{selectedSections.size}</span> of {sections.length} sections selected
             <span className="ml-2 text-gray-400">
-              ({selectedSections.size * 3} images will be generated)
+              (one image per anchor seat)
             </span>
           </div>
           <div className="flex gap-3">
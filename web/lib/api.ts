@@ -41,8 +41,11 @@ export interface PipelineProgress {
   total_steps: number;
   message: string;
   seats_generated: number;
+  depth_maps_planned: number;
   depth_maps_rendered: number;
   images_generated: number;
+  generation_concurrency: number;
+  generation_throttles: number;
   actual_cost: number;
   failed_items: string[];
 }
@@ -55,6 +58,9 @@ export interface SeatImage {
   tier: string;
   depth_map_url?: string;
   final_image_url?: string;
+  thumbnail_url?: string;
+  variants?: { url: string; width: number; format: string }[];
+  srcset?: Record<string, string>;  // format ("webp", "avif") -> "url 320w, url 640w, ..."
 }
 
 // Event Type Types